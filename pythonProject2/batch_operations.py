@@ -4,6 +4,7 @@ This module contains functions for submitting and checking batch jobs using Open
 Uses the unified prompts from single_step_processor.py
 """
 
+import io
 import os
 import json
 import logging
@@ -12,6 +13,12 @@ from typing import List, Tuple, Dict, Optional
 import concurrent.futures
 import threading
 
+# orjson is optional; fall back to the standard json module when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from resume_utils import openai, DEFAULT_MODEL, get_resume_batch, get_model_params
 from single_step_processor import create_unified_prompt, parse_unified_response
 from date_processor import process_resume_with_enhanced_dates
@@ -21,6 +28,20 @@ from skills_detector import get_taxonomy_context
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
+JSONL_WRITE_BUFFER = 1 << 20  # 1 MB write buffer for batch input files
+
+def dump_jsonl_line(record: Dict) -> bytes:
+    """Serialize one record as a newline-terminated JSONL line (UTF-8 bytes)"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+def load_jsonl_line(line: bytes) -> Dict:
+    """Parse one JSONL line (UTF-8 bytes) into a record"""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
 def create_batch_input_file_with_taxonomy(resume_batch: List[Tuple[int, str]],
                                           filename_prefix: str = "batch_input",
                                           workers: int = 10) -> str:
@@ -87,9 +108,9 @@ def create_batch_input_file_with_taxonomy(resume_batch: List[Tuple[int, str]],
                 logging.error(f"Error processing resume {resume_data[0]}: {str(e)}")
 
     # Write all requests to file
-    with open(batch_file, 'w') as f:
+    with open(batch_file, 'wb', buffering=JSONL_WRITE_BUFFER) as f:
         for request in requests:
-            f.write(json.dumps(request) + '\n')
+            f.write(dump_jsonl_line(request))
 
     logging.info(f"Created enhanced batch input file: {batch_file} with {len(requests)} requests")
     return batch_file
@@ -111,7 +132,7 @@ def create_batch_input_file(resume_batch: List[Tuple[int, str]], filename_prefix
     # Get model-specific parameters
     model_params = get_model_params(DEFAULT_MODEL)
 
-    with open(batch_file, 'w') as f:
+    with open(batch_file, 'wb', buffering=JSONL_WRITE_BUFFER) as f:
         for userid, resume_text in resume_batch:
             # Use the EXACT same prompt as single unified processing
             messages = create_unified_prompt(resume_text, userid=userid)
@@ -132,7 +153,7 @@ def create_batch_input_file(resume_batch: List[Tuple[int, str]], filename_prefix
                 "url": "/v1/chat/completions",
                 "body": body
             }
-            f.write(json.dumps(request) + '\n')
+            f.write(dump_jsonl_line(request))
 
     logging.info(f"Created batch input file: {batch_file} with {len(resume_batch)} requests")
     return batch_file
@@ -225,10 +246,11 @@ def download_batch_results(file_id: str) -> Optional[List[Dict]]:
         file_response = openai.files.content(file_id)
         content = file_response.read()
 
+        # Parse line by line straight from the downloaded bytes
         results = []
-        for line in content.decode('utf-8').strip().split('\n'):
-            if line:
-                results.append(json.loads(line))
+        for line in io.BytesIO(content):
+            if line.strip():
+                results.append(load_jsonl_line(line))
 
         logging.info(f"Downloaded {len(results)} results from batch")
         return results
@@ -5,11 +5,13 @@ Database Connection Infrastructure
 Provides database connection functionality with improved retry mechanisms.
 """
 
+import json
 import logging
 import pyodbc
 import sys
 import os
 import time
+import queue
 import platform
 from datetime import datetime
 import traceback
@@ -31,6 +33,13 @@ DEFAULT_PASSWORD = 'ltechmatlen'
 # Max retry configuration
 MAX_RETRIES = 5
 RETRY_BASE_DELAY = 1.0  # Base delay in seconds for exponential backoff
+BULK_UPDATE_CHUNK_SIZE = 999  # Records per executemany chunk in update_candidate_records_bulk (keeps the IN (...) check under the 2100-parameter limit)
+BULK_MERGE_WITH_OPENJSON = os.getenv("BULK_MERGE_WITH_OPENJSON", "1").lower() in ('1', 'true', 'yes')  # Write bulk chunks with one MERGE over OPENJSON (SQL Server 2016+)
+CONNECTION_POOL_SIZE = 8  # Idle connections kept for reuse by get_pooled_connection
+POOL_IDLE_CHECK_SECONDS = 30  # Pooled connections idle longer than this are checked before reuse
+
+# Idle (connection, released_at) pairs; LIFO so the warmest connection is reused first
+_connection_pool = queue.LifoQueue(maxsize=CONNECTION_POOL_SIZE)
 
 def get_best_driver():
     """
@@ -239,6 +248,61 @@ def create_pyodbc_connection(server=DEFAULT_SERVER, database=DEFAULT_DATABASE,
     # Should not reach here, but just in case
     return None, False, "Failed to connect after exhausting all retry attempts."
 
+def get_pooled_connection(retries=MAX_RETRIES):
+    """
+    Get a connection from the pool of idle connections, opening a new one if none is available
+    
+    Connections that sat idle for longer than POOL_IDLE_CHECK_SECONDS are checked with
+    a quick SELECT 1 first; broken ones are dropped.
+    
+    Args:
+        retries: Number of connection retry attempts when a new connection is needed
+        
+    Returns:
+        tuple: (connection, success_flag, message), same as create_pyodbc_connection
+    """
+    while True:
+        try:
+            conn, released_at = _connection_pool.get_nowait()
+        except queue.Empty:
+            return create_pyodbc_connection(retries=retries)
+        
+        if time.time() - released_at < POOL_IDLE_CHECK_SECONDS:
+            return conn, True, "Reused pooled connection"
+        
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return conn, True, "Reused pooled connection"
+        except Exception as e:
+            logger.info(f"Dropping stale pooled connection: {str(e)}")
+            release_connection(conn, reusable=False)
+
+def release_connection(conn, reusable=True):
+    """
+    Return a connection to the pool for reuse, or close it
+    
+    Args:
+        conn: pyodbc connection (None is ignored)
+        reusable: False if the connection may be broken and should be closed
+    """
+    if conn is None:
+        return
+    
+    if reusable:
+        try:
+            _connection_pool.put_nowait((conn, time.time()))
+            return
+        except queue.Full:
+            pass
+    
+    try:
+        conn.close()
+    except Exception:
+        pass
+
 def execute_query_with_retry(conn, query, params=None, retries=MAX_RETRIES):
     """
     Execute a SQL query with retry logic for transient errors
@@ -320,19 +384,99 @@ def execute_query_with_retry(conn, query, params=None, retries=MAX_RETRIES):
     # Should not reach here, but just in case
     return False, None, "Failed to execute query after exhausting all retry attempts."
 
-def update_candidate_record(userid, parsed_data, max_retries=3):
-    """
-    Update the aicandidate table with parsed resume data with enhanced error handling and retry logic.
+# Field-specific length limits based on actual database schema
+CANDIDATE_FIELD_LIMITS = {
+    # nvarchar(max) fields - no limit
+    'Summary': None,
+    'Certifications': None,
+    'ProjectTypes': None,
+    'Specialty': None,
+    'resume': None,
+    'markdownresume': None,
     
-    Args:
-        userid: User ID to update
-        parsed_data: Dictionary of field values to update
-        max_retries: Maximum number of update attempts
-        
-    Returns:
-        tuple: (success_flag, message)
-    """
-    # Process parsed_data to ensure valid format
+    # Limited length fields
+    'PrimaryTitle': 255,
+    'SecondaryTitle': 255,
+    'TertiaryTitle': 255,
+    'Address': 255,
+    'City': 100,
+    'State': 50,
+    'Bachelors': 255,
+    'Masters': 255,
+    'Phone1': 50,
+    'Phone2': 50,
+    'Email': 255,
+    'Email2': 255,
+    'FirstName': 100,
+    'MiddleName': 100,
+    'LastName': 100,
+    'LinkedIn': 255,
+    'Linkedin': 255,  # Case variation
+    'MostRecentCompany': 255,
+    'SecondMostRecentCompany': 255,
+    'ThirdMostRecentCompany': 255,
+    'FourthMostRecentCompany': 255,
+    'FifthMostRecentCompany': 255,
+    'SixthMostRecentCompany': 255,
+    'SeventhMostRecentCompany': 255,
+    'MostRecentLocation': 255,
+    'SecondMostRecentLocation': 255,
+    'ThirdMostRecentLocation': 255,
+    'FourthMostRecentLocation': 255,
+    'FifthMostRecentLocation': 255,
+    'SixthMostRecentLocation': 255,
+    'SeventhMostRecentLocation': 255,
+    'PrimaryIndustry': 255,
+    'SecondaryIndustry': 255,
+    'Skill1': 100,
+    'Skill2': 100,
+    'Skill3': 100,
+    'Skill4': 100,
+    'Skill5': 100,
+    'Skill6': 100,
+    'Skill7': 100,
+    'Skill8': 100,
+    'Skill9': 100,
+    'Skill10': 100,
+    'PrimarySoftwareLanguage': 255,
+    'SecondarySoftwareLanguage': 255,
+    'TertiarySoftwareLanguage': 255,
+    'SoftwareApp1': 255,
+    'SoftwareApp2': 255,
+    'SoftwareApp3': 255,
+    'SoftwareApp4': 255,
+    'SoftwareApp5': 255,
+    'Hardware1': 255,
+    'Hardware2': 255,
+    'Hardware3': 255,
+    'Hardware4': 255,
+    'Hardware5': 255,
+    'PrimaryCategory': 255,
+    'SecondaryCategory': 255,
+    'LengthinUS': 50,
+    'YearsofExperience': 50,
+    'AvgTenure': 50,
+    'status': 50,
+    'employeetype': 100,
+    'Zipcode': 9,
+    'MostRecentPlacementTitle': 255,
+    'MostRecentPlacementClient': 255
+}
+
+# Default max length for unknown fields
+DEFAULT_FIELD_MAX_LENGTH = 255
+
+# Date columns; values that aren't YYYY-MM-DD are skipped rather than written
+CANDIDATE_DATE_FIELDS = frozenset([
+    "MostRecentStartDate", "MostRecentEndDate", "SecondMostRecentStartDate", 
+    "SecondMostRecentEndDate", "ThirdMostRecentStartDate", "ThirdMostRecentEndDate", 
+    "FourthMostRecentStartDate", "FourthMostRecentEndDate", "FifthMostRecentStartDate", 
+    "FifthMostRecentEndDate", "SixthMostRecentStartDate", "SixthMostRecentEndDate", 
+    "SeventhMostRecentStartDate", "SeventhMostRecentEndDate"
+])
+
+def _normalize_candidate_keys(parsed_data):
+    """Make all keys strings and rename fields to match the database columns (in place)"""
     try:
         # Ensure all keys are strings
         for key in list(parsed_data.keys()):
@@ -348,91 +492,101 @@ def update_candidate_record(userid, parsed_data, max_retries=3):
     except Exception as e:
         logger.error(f"Error preprocessing parsed_data: {str(e)}")
         # Continue anyway - we've done our best to clean the data
+
+def _build_candidate_fields(userid, parsed_data, exists):
+    """
+    Build the column list and parameter values for an aicandidate UPDATE or INSERT
     
-    # Field-specific length limits based on actual database schema
-    field_limits = {
-        # nvarchar(max) fields - no limit
-        'Summary': None,
-        'Certifications': None,
-        'ProjectTypes': None,
-        'Specialty': None,
-        'resume': None,
-        'markdownresume': None,
-        
-        # Limited length fields
-        'PrimaryTitle': 255,
-        'SecondaryTitle': 255,
-        'TertiaryTitle': 255,
-        'Address': 255,
-        'City': 100,
-        'State': 50,
-        'Bachelors': 255,
-        'Masters': 255,
-        'Phone1': 50,
-        'Phone2': 50,
-        'Email': 255,
-        'Email2': 255,
-        'FirstName': 100,
-        'MiddleName': 100,
-        'LastName': 100,
-        'LinkedIn': 255,
-        'Linkedin': 255,  # Case variation
-        'MostRecentCompany': 255,
-        'SecondMostRecentCompany': 255,
-        'ThirdMostRecentCompany': 255,
-        'FourthMostRecentCompany': 255,
-        'FifthMostRecentCompany': 255,
-        'SixthMostRecentCompany': 255,
-        'SeventhMostRecentCompany': 255,
-        'MostRecentLocation': 255,
-        'SecondMostRecentLocation': 255,
-        'ThirdMostRecentLocation': 255,
-        'FourthMostRecentLocation': 255,
-        'FifthMostRecentLocation': 255,
-        'SixthMostRecentLocation': 255,
-        'SeventhMostRecentLocation': 255,
-        'PrimaryIndustry': 255,
-        'SecondaryIndustry': 255,
-        'Skill1': 100,
-        'Skill2': 100,
-        'Skill3': 100,
-        'Skill4': 100,
-        'Skill5': 100,
-        'Skill6': 100,
-        'Skill7': 100,
-        'Skill8': 100,
-        'Skill9': 100,
-        'Skill10': 100,
-        'PrimarySoftwareLanguage': 255,
-        'SecondarySoftwareLanguage': 255,
-        'TertiarySoftwareLanguage': 255,
-        'SoftwareApp1': 255,
-        'SoftwareApp2': 255,
-        'SoftwareApp3': 255,
-        'SoftwareApp4': 255,
-        'SoftwareApp5': 255,
-        'Hardware1': 255,
-        'Hardware2': 255,
-        'Hardware3': 255,
-        'Hardware4': 255,
-        'Hardware5': 255,
-        'PrimaryCategory': 255,
-        'SecondaryCategory': 255,
-        'LengthinUS': 50,
-        'YearsofExperience': 50,
-        'AvgTenure': 50,
-        'status': 50,
-        'employeetype': 100,
-        'Zipcode': 9,
-        'MostRecentPlacementTitle': 255,
-        'MostRecentPlacementClient': 255
-    }
-    
-    # Default max length for unknown fields
-    default_max_length = 255
+    Args:
+        userid: User ID being written (used for truncation warnings)
+        parsed_data: Dictionary of field values to write
+        exists: Whether the record already exists (NULL values are skipped for UPDATE)
+        
+    Returns:
+        tuple: (fields, params)
+    """
+    fields = []
+    params = []
+    
+    # Process fields and values
+    for field, value in parsed_data.items():
+        # Normalize field name
+        db_field = "Zipcode" if field == "ZipCode" else field
+        
+        # Handle NULL values
+        if value == "NULL" or value == "":
+            if exists:
+                # Skip empty values for UPDATE to preserve existing data
+                continue
+            else:
+                # For INSERT, include as NULL
+                fields.append(db_field)
+                params.append(None)
+            continue
+        
+        # Handle date fields
+        if field in CANDIDATE_DATE_FIELDS:
+            if value == "Present" or not value:
+                # Skip non-SQL-compatible dates
+                continue
+            try:
+                # Validate date format
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                # Skip invalid dates
+                logger.warning(f"Skipping invalid date in field {field}: '{value}'")
+                continue
+        
+        # Process text fields with field-specific limits
+        if isinstance(value, str):
+            # Get field-specific limit
+            limit = CANDIDATE_FIELD_LIMITS.get(db_field, DEFAULT_FIELD_MAX_LENGTH)
+            
+            # Only truncate if there's a limit and value exceeds it
+            if limit and len(value) > limit:
+                logger.warning(f"Truncating field {db_field} from {len(value)} to {limit} characters")
+                
+                # Log truncation to error file
+                error_logger = get_error_logger()
+                error_logger.log_candidate_warning(
+                    userid=str(userid),
+                    warning_type='DATA_TRUNCATED',
+                    warning_details=f"Field {db_field} truncated from {len(value)} to {limit} characters",
+                    additional_info={'original_length': len(value), 'truncated_to': limit}
+                )
+                
+                params.append(value[:limit])
+            else:
+                params.append(value)
+        else:
+            params.append(value)
+        
+        fields.append(db_field)
+    
+    # Add LastProcessed timestamp only if not already provided
+    if "LastProcessed" not in fields:
+        fields.append("LastProcessed")
+        params.append(datetime.now())
+    
+    return fields, params
+
+def update_candidate_record(userid, parsed_data, max_retries=3):
+    """
+    Update the aicandidate table with parsed resume data with enhanced error handling and retry logic.
+    
+    Args:
+        userid: User ID to update
+        parsed_data: Dictionary of field values to update
+        max_retries: Maximum number of update attempts
+        
+    Returns:
+        tuple: (success_flag, message)
+    """
+    # Process parsed_data to ensure valid format
+    _normalize_candidate_keys(parsed_data)
     
     # First establish connection
-    conn, conn_success, conn_message = create_pyodbc_connection(retries=max_retries)
+    conn, conn_success, conn_message = get_pooled_connection(retries=max_retries)
     
     if not conn_success:
         return False, f"Failed to connect to database: {conn_message}"
@@ -443,81 +597,14 @@ def update_candidate_record(userid, parsed_data, max_retries=3):
         success, result, message = execute_query_with_retry(conn, check_query, [userid])
         
         if not success:
-            conn.close()
+            release_connection(conn, reusable=False)
             return False, f"Failed to check if record exists: {message}"
         
         exists = result[0][0] > 0
         logger.info(f"Record for UserID {userid} exists check: {exists}")
         
         # Prepare for update or insert
-        fields = []
-        params = []
-        
-        # Process fields and values
-        for field, value in parsed_data.items():
-            # Normalize field name
-            db_field = "Zipcode" if field == "ZipCode" else field
-            
-            # Handle NULL values
-            if value == "NULL" or value == "":
-                if exists:
-                    # Skip empty values for UPDATE to preserve existing data
-                    continue
-                else:
-                    # For INSERT, include as NULL
-                    fields.append(db_field)
-                    params.append(None)
-                continue
-            
-            # Handle date fields
-            date_fields = ["MostRecentStartDate", "MostRecentEndDate", "SecondMostRecentStartDate", 
-                           "SecondMostRecentEndDate", "ThirdMostRecentStartDate", "ThirdMostRecentEndDate", 
-                           "FourthMostRecentStartDate", "FourthMostRecentEndDate", "FifthMostRecentStartDate", 
-                           "FifthMostRecentEndDate", "SixthMostRecentStartDate", "SixthMostRecentEndDate", 
-                           "SeventhMostRecentStartDate", "SeventhMostRecentEndDate"]
-            
-            if field in date_fields:
-                if value == "Present" or not value:
-                    # Skip non-SQL-compatible dates
-                    continue
-                try:
-                    # Validate date format
-                    datetime.strptime(value, "%Y-%m-%d")
-                except ValueError:
-                    # Skip invalid dates
-                    logger.warning(f"Skipping invalid date in field {field}: '{value}'")
-                    continue
-            
-            # Process text fields with field-specific limits
-            if isinstance(value, str):
-                # Get field-specific limit
-                limit = field_limits.get(db_field, default_max_length)
-                
-                # Only truncate if there's a limit and value exceeds it
-                if limit and len(value) > limit:
-                    logger.warning(f"Truncating field {db_field} from {len(value)} to {limit} characters")
-                    
-                    # Log truncation to error file
-                    error_logger = get_error_logger()
-                    error_logger.log_candidate_warning(
-                        userid=str(userid),
-                        warning_type='DATA_TRUNCATED',
-                        warning_details=f"Field {db_field} truncated from {len(value)} to {limit} characters",
-                        additional_info={'original_length': len(value), 'truncated_to': limit}
-                    )
-                    
-                    params.append(value[:limit])
-                else:
-                    params.append(value)
-            else:
-                params.append(value)
-            
-            fields.append(db_field)
-        
-        # Add LastProcessed timestamp only if not already provided
-        if "LastProcessed" not in fields:
-            fields.append("LastProcessed")
-            params.append(datetime.now())
+        fields, params = _build_candidate_fields(userid, parsed_data, exists)
         
         # Execute update or insert
         if exists:
@@ -532,7 +619,7 @@ def update_candidate_record(userid, parsed_data, max_retries=3):
             success, result, message = execute_query_with_retry(conn, query, params, retries=max_retries)
             
             if not success:
-                conn.close()
+                release_connection(conn, reusable=False)
                 
                 # Log database error to error file
                 error_logger = get_error_logger()
@@ -560,24 +647,182 @@ def update_candidate_record(userid, parsed_data, max_retries=3):
             success, result, message = execute_query_with_retry(conn, query, params, retries=max_retries)
             
             if not success:
-                conn.close()
+                release_connection(conn, reusable=False)
                 return False, f"Failed to insert record: {message}"
         
         logger.info(f"Database update successful for UserID {userid}")
-        conn.close()
+        release_connection(conn)
         return True, "Record updated successfully"
         
     except Exception as e:
         logger.error(f"Unexpected error in update_candidate_record: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
         
-        try:
-            conn.close()
-        except:
-            pass
+        release_connection(conn, reusable=False)
             
         return False, f"Unexpected error: {str(e)}"
 
+def _json_param_default(value):
+    """Serialize datetimes for OPENJSON in a form every SQL Server date type accepts"""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+    return str(value)
+
+def _merge_candidate_rows(conn, chunk, records):
+    """
+    Upsert a chunk of aicandidate records with one MERGE per column set
+    
+    The rows are sent as a single JSON parameter and shredded server-side
+    with OPENJSON, so existing rows are updated and new rows inserted in the
+    same statement without a separate existence check. Blank values are only
+    written for inserted rows, matching _build_candidate_fields.
+    
+    Args:
+        conn: Open database connection (autocommit, so each MERGE is atomic)
+        chunk: Userids to write
+        records: Dictionary mapping userids to field values
+        
+    Returns:
+        tuple: (list of merged userids, whether any MERGE failed)
+    """
+    groups = {}
+    for userid in chunk:
+        parsed_data = records[userid]
+        _normalize_candidate_keys(parsed_data)
+        fields, params = _build_candidate_fields(userid, parsed_data, False)
+        blank = {field for field, value in parsed_data.items() if value == "NULL" or value == ""}
+        # LastProcessed is always set, so every row has at least one column to update
+        update_fields = tuple(field for field in fields if field not in blank)
+        row = dict(zip(fields, params))
+        row["userid"] = str(userid)
+        group = groups.setdefault((tuple(fields), update_fields), ([], []))
+        group[0].append(userid)
+        group[1].append(row)
+    
+    merged = []
+    failed = False
+    for (fields, update_fields), (group_userids, rows) in groups.items():
+        columns = ", ".join(f"{field} nvarchar(max) '$.{field}'" for field in fields)
+        query = (
+            "MERGE aicandidate WITH (HOLDLOCK) AS target "
+            f"USING OPENJSON(?) WITH (userid nvarchar(64) '$.userid', {columns}) AS source "
+            "ON target.userid = source.userid "
+            f"WHEN MATCHED THEN UPDATE SET {', '.join(f'{field} = source.{field}' for field in update_fields)} "
+            f"WHEN NOT MATCHED THEN INSERT (userid, {', '.join(fields)}) "
+            f"VALUES (source.userid, {', '.join('source.' + field for field in fields)});"
+        )
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, json.dumps(rows, default=_json_param_default))
+            cursor.close()
+            merged.extend(group_userids)
+        except pyodbc.Error as e:
+            failed = True
+            logger.warning(f"Bulk MERGE of {len(rows)} records failed, falling back to executemany: {str(e)}")
+    
+    return merged, failed
+
+def update_candidate_records_bulk(records, chunk_size=BULK_UPDATE_CHUNK_SIZE, max_retries=3):
+    """
+    Update or insert many aicandidate records in chunks
+    
+    With BULK_MERGE_WITH_OPENJSON each chunk is first written by
+    _merge_candidate_rows, one MERGE per column set. Rows it could not write
+    go through fast_executemany: one existence check, then one executemany
+    per distinct statement (UPDATE for existing rows, INSERT for new ones,
+    grouped by column set since rows with skipped dates have fewer columns).
+    Either way a chunk costs a handful of round-trips instead of two per row.
+    Callers should fall back to update_candidate_record for any userid not
+    reported as successful.
+    
+    Args:
+        records: Dictionary mapping userids to field values
+        chunk_size: Number of records written per chunk
+        max_retries: Maximum number of connection attempts
+        
+    Returns:
+        dict: userid -> True for every record that was updated
+    """
+    updated = {}
+    if not records:
+        return updated
+    
+    conn, conn_success, conn_message = get_pooled_connection(retries=max_retries)
+    if not conn_success:
+        logger.error(f"Bulk update could not connect to database: {conn_message}")
+        return updated
+    
+    reusable = True
+    try:
+        userids = list(records.keys())
+        for start in range(0, len(userids), chunk_size):
+            chunk = chunk_userids = userids[start:start + chunk_size]
+            try:
+                if BULK_MERGE_WITH_OPENJSON:
+                    merged, merge_failed = _merge_candidate_rows(conn, chunk, records)
+                    if merge_failed:
+                        reusable = False
+                    for userid in merged:
+                        updated[userid] = True
+                    chunk = [userid for userid in chunk if userid not in updated]
+                    if not chunk:
+                        logger.info(f"Bulk wrote {len(chunk_userids)}/{len(chunk_userids)} records")
+                        continue
+                
+                # One existence check for the whole chunk
+                markers = ", ".join("?" * len(chunk))
+                check_query = f"SELECT userid FROM aicandidate WITH (NOLOCK) WHERE userid IN ({markers})"
+                success, result, message = execute_query_with_retry(conn, check_query, chunk, retries=max_retries)
+                if not success:
+                    logger.error(f"Bulk update existence check failed: {message}")
+                    continue
+                existing = {str(row[0]) for row in result}
+                
+                # Group rows by statement and column set so each group is one parameterized query
+                groups = {}
+                for userid in chunk:
+                    exists = str(userid) in existing
+                    parsed_data = records[userid]
+                    _normalize_candidate_keys(parsed_data)
+                    fields, params = _build_candidate_fields(userid, parsed_data, exists)
+                    if exists:
+                        params.append(userid)
+                    else:
+                        params.insert(0, userid)
+                    group = groups.setdefault((exists, tuple(fields)), ([], []))
+                    group[0].append(userid)
+                    group[1].append(params)
+                
+                for (exists, fields), (group_userids, rows) in groups.items():
+                    if exists:
+                        operation = "UPDATE"
+                        set_clauses = ", ".join(f"{field} = ?" for field in fields)
+                        query = f"UPDATE aicandidate SET {set_clauses} WHERE userid = ?"
+                    else:
+                        operation = "INSERT"
+                        param_markers = ", ".join("?" * (len(fields) + 1))
+                        query = f"INSERT INTO aicandidate (userid, {', '.join(fields)}) VALUES ({param_markers})"
+                    try:
+                        cursor = conn.cursor()
+                        cursor.fast_executemany = True
+                        cursor.executemany(query, rows)
+                        cursor.close()
+                        for userid in group_userids:
+                            updated[userid] = True
+                    except pyodbc.Error as e:
+                        reusable = False
+                        logger.warning(f"Bulk {operation} of {len(rows)} records failed, they will be retried one by one: {str(e)}")
+                
+                logger.info(f"Bulk wrote {sum(1 for userid in chunk_userids if userid in updated)}/{len(chunk_userids)} records")
+            except Exception as e:
+                reusable = False
+                logger.error(f"Unexpected error in bulk update chunk: {str(e)}")
+                logger.error(f"Traceback: {traceback.format_exc()}")
+    finally:
+        release_connection(conn, reusable=reusable)
+    
+    return updated
+
 # New paginated function for streaming batch processing
 def get_resume_batch_paginated(batch_size=5000, offset=0, max_retries=3):
     """
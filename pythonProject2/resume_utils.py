@@ -4,6 +4,7 @@ Consolidated utilities for resume processing
 
 import os
 import sys
+import functools
 import logging
 import time
 import json
@@ -19,7 +20,9 @@ from db_connection import (
     get_resume_batch_with_retry,
     get_resume_by_userid_with_retry,
     update_candidate_record,
-    test_connection as test_db_connection
+    update_candidate_records_bulk,
+    test_connection as test_db_connection,
+    CONNECTION_POOL_SIZE
 )
 from error_logger import get_error_logger
 
@@ -132,18 +135,22 @@ def get_model_params(model_name=None):
         }
 
 # Token encoding
+@functools.lru_cache(maxsize=8)
+def get_token_encoding(encoding_name="cl100k_base"):
+    """Returns the tiktoken encoding for DEFAULT_MODEL, looked up once and cached."""
+    # Try to get encoding for the model first
+    try:
+        return tiktoken.encoding_for_model(DEFAULT_MODEL)
+    except KeyError as e:
+        # If that fails, use the explicit get_encoding method
+        logging.debug(f"Could not get encoding for model {DEFAULT_MODEL}: {str(e)}. Using fallback encoding {encoding_name}")
+        return tiktoken.get_encoding(encoding_name)
+
 def num_tokens_from_string(string, encoding_name="cl100k_base"):
     """Returns the number of tokens in a text string."""
     try:
-        # Try to get encoding for the model first
-        try:
-            encoding = tiktoken.encoding_for_model(DEFAULT_MODEL)
-        except KeyError as e:
-            # If that fails, use the explicit get_encoding method
-            logging.debug(f"Could not get encoding for model {DEFAULT_MODEL}: {str(e)}. Using fallback encoding {encoding_name}")
-            encoding = tiktoken.get_encoding(encoding_name)
-        
-        num_tokens = len(encoding.encode(string))
+        # Special tokens are counted as plain text, which also skips the special-token scan
+        num_tokens = len(get_token_encoding(encoding_name).encode(string, disallowed_special=()))
         return num_tokens
     except Exception as e:
         logging.error(f"Error counting tokens: {str(e)}")
@@ -369,6 +376,52 @@ def update_candidate_record_with_retry(userid, parsed_data, max_retries=3):
         logging.error(f"Traceback: {traceback.format_exc()}")
         return False
 
+def update_candidate_records_with_retry(records, max_retries=3):
+    """
+    Update many aicandidate records at once, falling back to single-row updates.
+    
+    Records are written in bulk with fast_executemany (UPDATE for existing rows,
+    INSERT for new ones). Any record the bulk path didn't write (failed chunks)
+    goes through update_candidate_record_with_retry, spread over up to
+    CONNECTION_POOL_SIZE threads so the single-row round-trips overlap.
+    
+    Args:
+        records: Dictionary mapping userids to field values
+        max_retries: Maximum number of update attempts
+        
+    Returns:
+        dict: userid -> True if successful, False otherwise
+    """
+    status = {}
+    try:
+        # Same diagnostics as the single-row path
+        error_logger = get_error_logger()
+        for userid, parsed_data in records.items():
+            issues = diagnose_database_fields(userid, parsed_data)
+            for issue in issues[:5]:  # Log first 5 issues to avoid spam
+                error_logger.log_candidate_warning(
+                    userid=str(userid),
+                    warning_type='FIELD_VALIDATION_ISSUE',
+                    warning_details=issue
+                )
+        
+        status.update(update_candidate_records_bulk(records, max_retries=max_retries))
+        logging.info(f"Bulk updated {len(status)}/{len(records)} records")
+    except Exception as e:
+        logging.error(f"Bulk update failed, falling back to single-row updates: {str(e)}")
+    
+    remaining = [userid for userid in records if not status.get(userid)]
+    if remaining:
+        # Each worker borrows a pooled connection per record, so threads reuse connections
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(CONNECTION_POOL_SIZE, len(remaining))) as executor:
+            single_results = executor.map(
+                lambda userid: update_candidate_record_with_retry(userid, records[userid], max_retries=max_retries),
+                remaining
+            )
+            status.update(zip(remaining, single_results))
+    
+    return status
+
 # Test the database connection
 def test_database_connection():
     """Test the database connection and report results"""
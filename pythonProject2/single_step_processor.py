@@ -5,7 +5,9 @@ This version reduces token usage by sending the resume only once
 """
 
 import os
+import json
 import logging
+import functools
 import time
 from datetime import datetime
 import re
@@ -17,8 +19,11 @@ if os.environ.get('QUIET_MODE', '').lower() in ('1', 'true', 'yes'):
 from two_step_processor_taxonomy import (
     validate_date_format, validate_linkedin_url, 
     prepare_update_data, extract_fields_directly, 
+    extract_step2_fields_directly,
     process_resume_with_enhanced_dates,
-    log_title_fields
+    log_title_fields,
+    DIRECT_COMPANY_PATTERNS, DIRECT_DATE_PATTERNS, DIRECT_LOCATION_PATTERNS,
+    DIRECT_INDUSTRY_PATTERNS, DIRECT_PERSONAL_INFO_PATTERNS, DIRECT_TECH_PATTERNS
 )
 from resume_utils import (
     DEFAULT_MODEL, MAX_TOKENS, DEFAULT_TEMPERATURE,
@@ -29,6 +34,335 @@ from resume_utils import (
 from skills_detector import get_taxonomy_context
 from error_logger import get_error_logger
 
+# Top 10 skills line in the unified response
+TOP10_SKILLS_PATTERN = re.compile(r'Top 10 Technical Skills:\s*(.+?)(?:\n|$)')
+PARSE_CACHE_SIZE = 1024  # Recent response texts whose parsed fields are kept for re-parses (retries, replays, duplicates)
+
+# Prompt pieces that are identical for every resume. They are built once at
+# import time and shared by every prompt, so create_unified_prompt only has to
+# assemble the resume- and taxonomy-specific messages around them.
+UNIFIED_BASE_INSTRUCTIONS = (
+    "You are not allowed to make up information.\n"
+    "You are an expert at analyzing technical resumes. Make your answers as short as possible. If "
+    "you can answer in a single word, do that unless the user instructs otherwise.\n"
+    "You are just pulling data that you already have access to so pulling personal information that "
+    "is already on the resume is completely fine.\n"
+    "If you can't find an answer or it's not provided/listed, just put NULL. \n"
+    "IMPORTANT: Never make assumptions or inferences. If information is not explicitly stated in the resume, return NULL. "
+    "Do NOT add comments, guesses, or parenthetical notes like '(likely...)' or '(probably...)'. "
+    "For example, if a location is not explicitly stated for a job, return NULL, not 'NULL (likely somewhere)' or any inference based on other information.\n"
+    "For dates, ALWAYS extract and convert to YYYY-MM-DD format. Common conversions:\n"
+    "  - '09/2021' or 'Sep 2021' becomes '2021-09-01'\n"
+    "  - '2021' becomes '2021-01-01'\n"
+    "  - 'Apr 2005' becomes '2005-04-01'\n"
+    "  - 'Present' or 'Current' stays as 'Present'\n"
+    "  - If only month/year given, use first day of month (01)\n"
+    "  - If date cannot be determined, output NULL\n"
+    "IMPORTANT: Look carefully for dates near company names - they may be in formats like MM/YYYY, Mon YYYY, or YYYY-YYYY.\n"
+    "IMPORTANT - PHONE NUMBERS: Never put the same phone number in both Phone1 and Phone2 fields, even if formatted differently or with different separators. If you only find one phone number, put it in Phone1 and set Phone2 to NULL. Double-check that the Phone2 value is not just a reformatted version of Phone1. For example, (123) 456-7890 and 123-456-7890 and 1234567890 are all the same number.\n"
+    "When identifying skills, prioritize accuracy over standardization. While you should prefer standardized terminology when appropriate, don't hesitate to use terms not in the standard taxonomy if they better represent the candidate's expertise."
+)
+
+UNIFIED_RULE_MESSAGES = (
+    # Date extraction rules
+    {
+        "role": "system",
+        "content": "CRITICAL - DATE EXTRACTION RULES:\n"
+                   "1. Look for dates near each company name - they're usually right after the company or location\n"
+                   "2. Common date formats in resumes:\n"
+                   "   - MM/YYYY - MM/YYYY (e.g., '09/2021 - Present')\n"
+                   "   - Mon YYYY - Mon YYYY (e.g., 'Apr 2005 - Apr 2012')\n"
+                   "   - Month YYYY to Month YYYY (e.g., 'January 2016 to December 2016')\n"
+                   "3. ALWAYS convert to YYYY-MM-DD by adding day 01\n"
+                   "4. If you see 'Present', 'Current', 'Now', or no end date for the most recent job, use 'Present'\n"
+                   "5. Extract dates for ALL seven most recent positions if available\n"
+                   "6. If a date is clearly visible but in a different format, CONVERT IT - don't return NULL"
+    },
+    # Industry rules
+    {
+        "role": "system",
+        "content": "Use the following rules when assessing Primary and Secondary Industry:"
+                   "You are required to give the user the requested information using the following rules."
+                   "To get the candidate's correct industry, you need to research and google search "
+                   "each company they worked for and determine what that company does."
+                   "Industry should be defined based on the clients they have worked for."
+                   "Information Technology is not an industry and should not be an answer."
+                   "IMPORTANT: You MUST provide BOTH a Primary AND Secondary Industry. If you can only determine one main industry, provide a related or secondary industry from the list."
+                   "Primary and Secondary Industry are required to come from this list and be based on the companies "
+                   "they have worked for:"
+                   "Agriculture, Amusement, Gambling, and Recreation Industries, Animal Production, Arts, "
+                   "Entertainment, and Recreation, Broadcasting, Clothing, Construction, Data Processing, "
+                   "Hosting, and Related Services, Education, Financial Services, Insurance, Fishing, "
+                   "Hunting and Trapping, Food Manufacturing, Food Services, Retail, Forestry and Logging, "
+                   "Funds, Trusts, and Other Financial Vehicles, Furniture and Home Furnishings Stores, "
+                   "Furniture and Related Product Manufacturing, Oil and Gas, HealthCare, Civil Engineering, "
+                   "Hospitals, Leisure and Hospitality, Machinery, Manufacturing, Merchant Wholesalers, "
+                   "Mining, Motion Picture, Motor Vehicle and Parts Dealers, Natural Resources, Nursing, "
+                   "Public Administration, Paper Manufacturing, Performing Arts, Spectator Sports, "
+                   "and Related Industries, Primary Metal Manufacturing, Chemistry and Biology, Publishing, "
+                   "Rail Transportation, Real Estate, Retail Trade, Transportation, Securities, "
+                   "Commodity Contracts, and Other Financial Investments and Related Activities, "
+                   "Supply Chain, Telecommunications, Textiles, Transportation, Utilities, Warehousing and "
+                   "Storage, Waste Management."
+    },
+    # Job titles rules
+    {
+        "role": "system",
+        "content": "Use the following rules when assessing Job Titles:"
+                   "Definition: Job Titles are what others call this person in the professional space."
+                   "Ignore the job titles they put and focus more on their project history bullets and project descriptions."
+                   "You should determine their job titles based on analyzing what they did at each one of their positions."
+                   "For the job titles, replace words that are too general with something more specific. "
+                   "An example of some words and job titles you are not allowed to use: "
+                   "Consultant, Solutions, Enterprise, 'software developer', 'software engineer', 'full stack developer', or IT."
+                   "For job title, use a different title for primary, secondary, and tertiary."
+                   "All three job titles must have an answer."
+                   "Each title must be different from each other."
+    },
+    # Company rules
+    {
+        "role": "system",
+        "content": "Use the following rules when filling out MostRecentCompany, SecondMostRecentCompany, ThirdMostRecentCompany, FourthMostRecentCompany, FifthMostRecentCompany, SixthMostRecentCompany, SeventhMostRecentCompany:"
+                   "Don't include the city or state in the company name."
+                   "Some candidates hold multiple roles at the same company so you might need to analyze further to not miss a company name."
+    },
+    # Location rules
+    {
+        "role": "system",
+        "content": "Use the following rules when finding company locations:"
+                   "1. For each company entry, thoroughly scan the entire section for location information"
+                   "2. Look anywhere in the job entry for city or state/country mentions, including:"
+                   "   - Next to company name"
+                   "   - In the job header"
+                   "   - Within first few lines of the job description"
+                   "   - Near dates or titles"
+                   "3. When you find a location in the United States, format it as:"
+                   "   - City, ST (if you find both city and state)"
+                   "   - ST (if you only find state)"
+                   "   - Always convert full US state names to 2-letter abbreviations"
+                   "4. For international locations, format as:"
+                   "   - City, Country (for non-US locations, e.g., 'London, UK' or 'Paris, France')"
+                   "   - Just 'City' if the country is not mentioned but you can identify the city"
+    },
+    # Project types rules
+    {
+        "role": "system",
+        "content": "Use the following rules when assessing Project Types: "
+                   "Use a mix of words like but not limited to implementation, "
+                   "integration, migration, move, deployment, optimization, consolidation and make it 2-3 words."
+    },
+    # Specialty rules - DISABLED to reduce output tokens
+    # {
+    #     "role": "system",
+    #     "content": "Use the following rules when assessing their Specialty:"
+    #                "For their specialty, emphasize the project types they have done and relate them to "
+    #                "their industry."
+    # },
+    # Category rules
+    {
+        "role": "system",
+        "content": "Use the following rules when assessing their Category:"
+                   "For the categories, do not repeat the same category."
+                   "Both categories MUST have an answer!"
+    },
+    # Summary rules - DISABLED to reduce output tokens
+    # {
+    #     "role": "system",
+    #     "content": "Use the following rules when writing their summary:"
+    #                "For their summary, give a brief summary of their resume in a few sentences."
+    #                "Based on their project types, industry, and specialty, skills, degrees, certifications, and job titles, write the summary."
+    # },
+    # Length in US rules
+    {
+        "role": "system",
+        "content": "Use the following rules when determining length in US:"
+                   "Look for a start and end date near each company name and look for a location near each "
+                   "company name as well. Whenever the location listed is located in america, add up the "
+                   "total time of employment at each one of those jobs."
+                   "Return the total in YEARS as a decimal number (e.g., 0.5 for 6 months, 1.25 for 15 months, 2.5 for 2 years 6 months)."
+                   "Just put a number and no other characters."
+                   "Result should not be 0."
+                   "Result should only be numerical."
+    },
+    # Experience calculations rules
+    {
+        "role": "system",
+        "content": "Use the following rules when determining Average Tenure and Year of Experience:"
+                   "Use all previous start date and end date questions answers to determine this. "
+                   "Just put a number and no other characters."
+                   "Result should not be 0."
+                   "Result should only be numerical."
+    },
+)
+
+TAXONOMY_GUIDANCE = (
+    "SKILLS TAXONOMY INTERPRETATION GUIDANCE:\n"
+    "The skills taxonomy above provides standardized categorization of technical skills for this resume.\n"
+    "Use this taxonomy to guide your analysis of programming languages, software applications, and hardware.\n"
+    "When identifying skills, prefer terminology from the appropriate taxonomy categories, but don't hesitate to use different terms when they better represent the candidate's expertise.\n"
+    "Align your responses with the skill categories most relevant to this candidate's profile.\n"
+    "For software languages, applications, and hardware, use the taxonomy as a reference but feel empowered to include technologies that aren't listed if they are clearly important to the candidate's profile.\n"
+    "Example: If the taxonomy lists 'Java' but the resume shows extensive React.js experience, it's appropriate to list React.js even if it's not in the taxonomy.\n"
+    "Balance standardization with accuracy - prioritize capturing the candidate's true expertise over strict adherence to the taxonomy.\n"
+    "IMPORTANT: You MUST provide BOTH a Primary AND Secondary technical category. These must be different from each other. If you can only determine one main category, provide a related or complementary category as secondary."
+)
+
+UNIFIED_TECH_MESSAGES = (
+    # Technical languages rules
+    {
+        "role": "system", 
+        "content": "Use the following rules when assessing Primary, Secondary, and Tertiary Technical Languages: "
+                   "Include ALL types of technical languages mentioned in the resume, such as:"
+                   "- Database languages (SQL, T-SQL, PL/SQL, MySQL, Oracle SQL, PostgreSQL)"
+                   "- Programming languages (Java, Python, C#, JavaScript, Ruby)"
+                   "- Scripting languages (PowerShell, Bash, Shell, VBA)"
+                   "- Query languages (SPARQL, GraphQL, HiveQL)"
+                   "- Markup/stylesheet languages (HTML, CSS, XML)"
+                   "Prioritize languages based on:"
+                   "1. Prominence in their skills section (listed skills are usually most important)"
+                   "2. Frequency of mention throughout work history"
+                   "3. Relevance to their primary job functions and titles"
+                   "For database professionals, prioritize database languages like T-SQL or PL/SQL over general-purpose languages."
+    },
+    # Software applications rules
+    {
+        "role": "system", 
+        "content": "Use the following rules when assessing Most used Software Applications: "
+                   "Please only list out actual software applications. nothing else."
+                   "Analyze their resume and determine what software they use most."
+                   "If none can be found put NULL."
+    },
+    # Hardware rules
+    {
+        "role": "system", 
+        "content": "Use the following rules when assessing Hardware: "
+                   "Please list 5 different specific hardware devices the candidate has worked with. "
+                   "Hardware devices include many categories such as:\n"
+                   "- Network equipment (firewalls, routers, switches, load balancers)\n"
+                   "- Server hardware (blade servers, rack servers, chassis systems)\n"
+                   "- Storage devices (SANs, NAS, RAID arrays, disk systems)\n"
+                   "- Security appliances (TACALANEs, hardware encryption devices)\n"
+                   "- Management interfaces (iDRAC, iLO, IMM, IPMI, BMC)\n"
+                   "- Virtualization hardware (ESXi hosts, hyperconverged systems)\n"
+                   "- Physical components (CPUs, RAM modules, hard drives, SSDs)\n"
+                   "- Communication hardware (modems, wireless access points, VPN concentrators)\n"
+                   "- Specialized hardware (tape libraries, KVM switches, console servers)\n\n"
+                   "IMPORTANT: Even if they worked with multiple hardware items from the same brand, list different types. "
+                   "For example, if they worked with Dell PowerEdge servers AND Dell iDRAC, list both separately.\n\n"
+                   "Look beyond obvious hardware to find specialized equipment, management interfaces, and components. "
+                   "Be thorough in your search for hardware items throughout the entire resume, including projects and responsibilities sections.\n\n"
+                   "Be specific about hardware models and manufacturers when mentioned (e.g. 'Palo Alto PA-5200 series' rather than just 'firewalls'). "
+                   "Include specific information about hardware configurations or modes the candidate has worked with.\n\n"
+                   "Please list only the hardware device names, one per line, without any prefixes or numbering:\n"
+                   "- What physical hardware do they talk about using the most?: [device name only]\n"
+                   "- What physical hardware do they talk about using the second most?: [device name only]\n"
+                   "- What physical hardware do they talk about using the third most?: [device name only]\n"
+                   "- What physical hardware do they talk about using the fourth most?: [device name only]\n"
+                   "- What physical hardware do they talk about using the fifth most?: [device name only]\n\n"
+                   "Try your best to identify 5 different hardware items. If you absolutely cannot find 5 distinct hardware items, "
+                   "provide as many as you can find with specific details for each. Only use NULL if no hardware at all is mentioned."
+    },
+)
+
+UNIFIED_USER_CONTENT = (
+    "Please analyze the following resume and give me the following comprehensive details (If you can't find an answer or it's not provided/listed, just put NULL):\n"
+    "- First Name:\n"
+    "- Middle Name:\n"
+    "- Last Name:\n"
+    "- Address:\n"
+    "- City (IMPORTANT: First check if they explicitly state where they live. If not stated and their current job is not listed as remote, use the city of their current employer's location. Only return NULL if neither is available):\n"
+    "- State (IMPORTANT: First check if they explicitly state where they live. If not stated and their current job is not listed as remote, use the state of their current employer's location. Only return NULL if neither is available):\n"
+    "- Zipcode(IMPORTANT: 5 digit zip only, no zip+4. If a zip code is explicitly on the resume use it. If you returned a City and State above, you MUST also provide a well-known zip code for that city - never return NULL for zip when City and State are populated. Only return NULL if both City and State above are also NULL. Do NOT infer a zip from job/company locations):\n"
+    "- Phone1:\n"
+    "- Phone2:\n"
+    "- Email (IMPORTANT: Resumes often obfuscate emails to avoid scrapers. Reconstruct them into a real address of the form user@domain.tld. Convert spelled-out or spaced separators back to symbols: 'at'/'(at)'/'[at]'/' at ' becomes '@', and 'dot'/'(dot)'/'[dot]'/' dot ' becomes '.'. Remove spaces inside the address. For example 'Ricky at infosmarttech dot com' becomes 'ricky@infosmarttech.com' and 'john [dot] doe [at] gmail [dot] com' becomes 'john.doe@gmail.com'. Only return NULL if no email is present at all):\n"
+    "- Email2:\n"
+    "- LinkedIn:\n"
+    "- Certifications:\n"
+    "- Bachelors:\n"
+    "- Masters:\n"
+    "- Best job title that fits their primary experience (IMPORTANT: Job titles should reflect what they DO, not what they call themselves. Focus on their actual work/project history, not their listed title. Avoid generic terms like: Consultant, Solutions, Enterprise, 'software developer', 'software engineer', 'full stack developer', or IT. Be specific - e.g., 'Cloud Infrastructure Engineer' not 'IT Professional'):\n"
+    "- Best job title that fits their secondary experience (Must be different from primary. Follow same rules as above):\n"
+    "- Best job title that fits their tertiary experience (Must be different from both primary and secondary. Follow same rules as above):\n"
+    "- Most Recent Company Worked for:\n"
+    "- Most Recent Start Date (YYYY-MM-DD format - convert from whatever format is in resume, e.g., '09/2021' becomes '2021-09-01'):\n"
+    "- Most Recent End Date (YYYY-MM-DD format or 'Present' if currently employed there):\n"
+    "- Most Recent Job Location:\n"
+    "- Second Most Recent Company Worked for:\n"
+    "- Second Most Recent Start Date (YYYY-MM-DD):\n"
+    "- Second Most Recent End Date (YYYY-MM-DD):\n"
+    "- Second Most Recent Job Location:\n"
+    "- Third Most Recent Company Worked for:\n"
+    "- Third Most Recent Start Date (YYYY-MM-DD):\n"
+    "- Third Most Recent End Date (YYYY-MM-DD):\n"
+    "- Third Most Recent Job Location:\n"
+    "- Fourth Most Recent Company Worked for:\n"
+    "- Fourth Most Recent Start Date (YYYY-MM-DD):\n"
+    "- Fourth Most Recent End Date (YYYY-MM-DD):\n"
+    "- Fourth Most Recent Job Location:\n"
+    "- Fifth Most Recent Company Worked for:\n"
+    "- Fifth Most Recent Start Date (YYYY-MM-DD):\n"
+    "- Fifth Most Recent End Date (YYYY-MM-DD):\n"
+    "- Fifth Most Recent Job Location:\n"
+    "- Sixth Most Recent Company Worked for:\n"
+    "- Sixth Most Recent Start Date (YYYY-MM-DD):\n"
+    "- Sixth Most Recent End Date (YYYY-MM-DD):\n"
+    "- Sixth Most Recent Job Location:\n"
+    "- Seventh Most Recent Company Worked for:\n"
+    "- Seventh Most Recent Start Date (YYYY-MM-DD):\n"
+    "- Seventh Most Recent End Date (YYYY-MM-DD):\n"
+    "- Seventh Most Recent Job Location:\n"
+    "- Based on all 7 of their most recent companies above, what is the Primary industry they work in:\n"
+    "- Based on all 7 of their most recent companies above, what is the Secondary industry they work in:\n"
+    "- Top 10 Technical Skills (IMPORTANT: Only include TECHNICAL skills like programming languages, frameworks, tools, platforms, databases, and cloud services. Do NOT include soft skills. Provide as comma-separated list):\n"
+    "- What technical language do they use most often? (Programming or scripting language - pick the ONE they use most):\n"
+    "- What technical language do they use second most often?:\n"
+    "- What technical language do they use third most often?:\n"
+    "- What software do they talk about using the most? (Include databases, tools, platforms, frameworks, etc.):\n"
+    "- What software do they talk about using the second most? (Must be different from first):\n"
+    "- What software do they talk about using the third most? (Must be different from previous):\n"
+    "- What software do they talk about using the fourth most? (Must be different from previous):\n"
+    "- What software do they talk about using the fifth most? (Must be different from previous):\n"
+    "- What physical hardware do they talk about using the most? (IMPORTANT: Only list actual PHYSICAL hardware like servers, routers, switches, IoT devices, embedded systems, etc. Do NOT include software or virtual systems):\n"
+    "- What physical hardware do they talk about using the second most? (Must be different from first, physical hardware only):\n"
+    "- What physical hardware do they talk about using the third most? (Must be different from previous, physical hardware only):\n"
+    "- What physical hardware do they talk about using the fourth most? (Must be different from previous, physical hardware only):\n"
+    "- What physical hardware do they talk about using the fifth most? (Must be different from previous, physical hardware only):\n"
+    "- Based on their skills, put them in a primary technical category (Choose from standard technical categories like Software Development, Cloud/DevOps, Data/Analytics, Infrastructure/Networking, Cybersecurity, Database Administration, QA/Testing, Project Management, Business Analysis, UI/UX Design, Hardware/Embedded, AI/Machine Learning, Mobile Development, Enterprise Systems, or Other):\n"
+    "- Based on their skills, put them in a subsidiary technical category (Must be different from primary. Choose from same categories):\n"
+    "- Types of projects they have worked on (Use action-oriented phrases that describe what they've accomplished, focusing on implementations, migrations, integrations, optimizations, deployments, etc.):\n"
+    "- How long have they worked in the United States in YEARS (numerical answer only, use decimals like 0.5 for 6 months). If all jobs are in US or no location specified, calculate from earliest job to most recent/present:\n"
+    "- Total years of professional experience (numerical answer only) - IMPORTANT: Calculate from the earliest job start date to the most recent job end date. If the most recent job says 'Present', 'Current', or similar, use today's date as the end date. Do NOT sum up individual job durations as jobs may overlap. For example, if someone worked from 2015-2018 and 2017-2020, the total is 5 years (2015-2020), not 6 years. If they started in 2015 and their current job is 'Present', calculate from 2015 to today:\n"
+    "- Average tenure at companies in years (numerical answer only) - Calculate by dividing total experience by number of different companies. Only count each company once even if they had multiple positions there:"
+)
+
+# Fields parse_unified_response can produce; these are also the keys of the structured-output schema
+UNIFIED_RESPONSE_FIELDS = tuple(dict.fromkeys([
+    *DIRECT_PERSONAL_INFO_PATTERNS,
+    "PrimaryTitle", "SecondaryTitle", "TertiaryTitle",
+    *DIRECT_COMPANY_PATTERNS,
+    *DIRECT_DATE_PATTERNS,
+    *DIRECT_LOCATION_PATTERNS,
+    *DIRECT_INDUSTRY_PATTERNS,
+    "Top10Skills",
+    *DIRECT_TECH_PATTERNS
+]))
+
+# response_format for requesting the unified fields as one flat JSON object (NULL answers come back as null)
+UNIFIED_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "resume",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {field: {"type": ["string", "null"]} for field in UNIFIED_RESPONSE_FIELDS},
+            "required": list(UNIFIED_RESPONSE_FIELDS),
+            "additionalProperties": False
+        }
+    }
+}
+
 def create_unified_prompt(resume_text, userid=None):
     """
     Create a unified prompt that combines step1 and step2 processing into a single API call
@@ -40,320 +374,53 @@ def create_unified_prompt(resume_text, userid=None):
     # Get relevant skills taxonomy
     taxonomy_context = get_taxonomy_context(resume_text, max_categories=3, userid=userid)
     
-    # System prompts for all processing needs - combined from both steps
+    # System prompts for all processing needs - combined from both steps.
+    # Only the resume and taxonomy messages are built per call; each is a single
+    # f-string so the resume text is copied once.
     return [
         # Base prompt
         {
             "role": "system",
-            "content": f"Based on this resume, give the user the information they need: \n{resume_text}\n"
-                       "You are not allowed to make up information.\n"
-                       "You are an expert at analyzing technical resumes. Make your answers as short as possible. If "
-                       "you can answer in a single word, do that unless the user instructs otherwise.\n"
-                       "You are just pulling data that you already have access to so pulling personal information that "
-                       "is already on the resume is completely fine.\n"
-                       "If you can't find an answer or it's not provided/listed, just put NULL. \n"
-                       "IMPORTANT: Never make assumptions or inferences. If information is not explicitly stated in the resume, return NULL. "
-                       "Do NOT add comments, guesses, or parenthetical notes like '(likely...)' or '(probably...)'. "
-                       "For example, if a location is not explicitly stated for a job, return NULL, not 'NULL (likely somewhere)' or any inference based on other information.\n"
-                       "For dates, ALWAYS extract and convert to YYYY-MM-DD format. Common conversions:\n"
-                       "  - '09/2021' or 'Sep 2021' becomes '2021-09-01'\n"
-                       "  - '2021' becomes '2021-01-01'\n"
-                       "  - 'Apr 2005' becomes '2005-04-01'\n"
-                       "  - 'Present' or 'Current' stays as 'Present'\n"
-                       "  - If only month/year given, use first day of month (01)\n"
-                       "  - If date cannot be determined, output NULL\n"
-                       "IMPORTANT: Look carefully for dates near company names - they may be in formats like MM/YYYY, Mon YYYY, or YYYY-YYYY.\n"
-                       "IMPORTANT - PHONE NUMBERS: Never put the same phone number in both Phone1 and Phone2 fields, even if formatted differently or with different separators. If you only find one phone number, put it in Phone1 and set Phone2 to NULL. Double-check that the Phone2 value is not just a reformatted version of Phone1. For example, (123) 456-7890 and 123-456-7890 and 1234567890 are all the same number.\n"
-                       "When identifying skills, prioritize accuracy over standardization. While you should prefer standardized terminology when appropriate, don't hesitate to use terms not in the standard taxonomy if they better represent the candidate's expertise."
-        },
-        # Date extraction rules
-        {
-            "role": "system",
-            "content": "CRITICAL - DATE EXTRACTION RULES:\n"
-                       "1. Look for dates near each company name - they're usually right after the company or location\n"
-                       "2. Common date formats in resumes:\n"
-                       "   - MM/YYYY - MM/YYYY (e.g., '09/2021 - Present')\n"
-                       "   - Mon YYYY - Mon YYYY (e.g., 'Apr 2005 - Apr 2012')\n"
-                       "   - Month YYYY to Month YYYY (e.g., 'January 2016 to December 2016')\n"
-                       "3. ALWAYS convert to YYYY-MM-DD by adding day 01\n"
-                       "4. If you see 'Present', 'Current', 'Now', or no end date for the most recent job, use 'Present'\n"
-                       "5. Extract dates for ALL seven most recent positions if available\n"
-                       "6. If a date is clearly visible but in a different format, CONVERT IT - don't return NULL"
-        },
-        # Industry rules
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing Primary and Secondary Industry:"
-                       "You are required to give the user the requested information using the following rules."
-                       "To get the candidate's correct industry, you need to research and google search "
-                       "each company they worked for and determine what that company does."
-                       "Industry should be defined based on the clients they have worked for."
-                       "Information Technology is not an industry and should not be an answer."
-                       "IMPORTANT: You MUST provide BOTH a Primary AND Secondary Industry. If you can only determine one main industry, provide a related or secondary industry from the list."
-                       "Primary and Secondary Industry are required to come from this list and be based on the companies "
-                       "they have worked for:"
-                       "Agriculture, Amusement, Gambling, and Recreation Industries, Animal Production, Arts, "
-                       "Entertainment, and Recreation, Broadcasting, Clothing, Construction, Data Processing, "
-                       "Hosting, and Related Services, Education, Financial Services, Insurance, Fishing, "
-                       "Hunting and Trapping, Food Manufacturing, Food Services, Retail, Forestry and Logging, "
-                       "Funds, Trusts, and Other Financial Vehicles, Furniture and Home Furnishings Stores, "
-                       "Furniture and Related Product Manufacturing, Oil and Gas, HealthCare, Civil Engineering, "
-                       "Hospitals, Leisure and Hospitality, Machinery, Manufacturing, Merchant Wholesalers, "
-                       "Mining, Motion Picture, Motor Vehicle and Parts Dealers, Natural Resources, Nursing, "
-                       "Public Administration, Paper Manufacturing, Performing Arts, Spectator Sports, "
-                       "and Related Industries, Primary Metal Manufacturing, Chemistry and Biology, Publishing, "
-                       "Rail Transportation, Real Estate, Retail Trade, Transportation, Securities, "
-                       "Commodity Contracts, and Other Financial Investments and Related Activities, "
-                       "Supply Chain, Telecommunications, Textiles, Transportation, Utilities, Warehousing and "
-                       "Storage, Waste Management."
-        },
-        # Job titles rules
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing Job Titles:"
-                       "Definition: Job Titles are what others call this person in the professional space."
-                       "Ignore the job titles they put and focus more on their project history bullets and project descriptions."
-                       "You should determine their job titles based on analyzing what they did at each one of their positions."
-                       "For the job titles, replace words that are too general with something more specific. "
-                       "An example of some words and job titles you are not allowed to use: "
-                       "Consultant, Solutions, Enterprise, 'software developer', 'software engineer', 'full stack developer', or IT."
-                       "For job title, use a different title for primary, secondary, and tertiary."
-                       "All three job titles must have an answer."
-                       "Each title must be different from each other."
-        },
-        # Company rules
-        {
-            "role": "system",
-            "content": "Use the following rules when filling out MostRecentCompany, SecondMostRecentCompany, ThirdMostRecentCompany, FourthMostRecentCompany, FifthMostRecentCompany, SixthMostRecentCompany, SeventhMostRecentCompany:"
-                       "Don't include the city or state in the company name."
-                       "Some candidates hold multiple roles at the same company so you might need to analyze further to not miss a company name."
-        },
-        # Location rules
-        {
-            "role": "system",
-            "content": "Use the following rules when finding company locations:"
-                       "1. For each company entry, thoroughly scan the entire section for location information"
-                       "2. Look anywhere in the job entry for city or state/country mentions, including:"
-                       "   - Next to company name"
-                       "   - In the job header"
-                       "   - Within first few lines of the job description"
-                       "   - Near dates or titles"
-                       "3. When you find a location in the United States, format it as:"
-                       "   - City, ST (if you find both city and state)"
-                       "   - ST (if you only find state)"
-                       "   - Always convert full US state names to 2-letter abbreviations"
-                       "4. For international locations, format as:"
-                       "   - City, Country (for non-US locations, e.g., 'London, UK' or 'Paris, France')"
-                       "   - Just 'City' if the country is not mentioned but you can identify the city"
-        },
-        # Project types rules
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing Project Types: "
-                       "Use a mix of words like but not limited to implementation, "
-                       "integration, migration, move, deployment, optimization, consolidation and make it 2-3 words."
-        },
-        # Specialty rules - DISABLED to reduce output tokens
-        # {
-        #     "role": "system",
-        #     "content": "Use the following rules when assessing their Specialty:"
-        #                "For their specialty, emphasize the project types they have done and relate them to "
-        #                "their industry."
-        # },
-        # Category rules
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing their Category:"
-                       "For the categories, do not repeat the same category."
-                       "Both categories MUST have an answer!"
-        },
-        # Summary rules - DISABLED to reduce output tokens
-        # {
-        #     "role": "system",
-        #     "content": "Use the following rules when writing their summary:"
-        #                "For their summary, give a brief summary of their resume in a few sentences."
-        #                "Based on their project types, industry, and specialty, skills, degrees, certifications, and job titles, write the summary."
-        # },
-        # Length in US rules
-        {
-            "role": "system",
-            "content": "Use the following rules when determining length in US:"
-                       "Look for a start and end date near each company name and look for a location near each "
-                       "company name as well. Whenever the location listed is located in america, add up the "
-                       "total time of employment at each one of those jobs."
-                       "Return the total in YEARS as a decimal number (e.g., 0.5 for 6 months, 1.25 for 15 months, 2.5 for 2 years 6 months)."
-                       "Just put a number and no other characters."
-                       "Result should not be 0."
-                       "Result should only be numerical."
-        },
-        # Experience calculations rules
-        {
-            "role": "system",
-            "content": "Use the following rules when determining Average Tenure and Year of Experience:"
-                       "Use all previous start date and end date questions answers to determine this. "
-                       "Just put a number and no other characters."
-                       "Result should not be 0."
-                       "Result should only be numerical."
+            "content": f"Based on this resume, give the user the information they need: \n{resume_text}\n{UNIFIED_BASE_INSTRUCTIONS}"
         },
+        *UNIFIED_RULE_MESSAGES,
         # Skills taxonomy context
         {
-            "role": "system", 
-            "content": f"{taxonomy_context}\n"
-                      f"SKILLS TAXONOMY INTERPRETATION GUIDANCE:\n"
-                      f"The skills taxonomy above provides standardized categorization of technical skills for this resume.\n"
-                      f"Use this taxonomy to guide your analysis of programming languages, software applications, and hardware.\n"
-                      f"When identifying skills, prefer terminology from the appropriate taxonomy categories, but don't hesitate to use different terms when they better represent the candidate's expertise.\n"
-                      f"Align your responses with the skill categories most relevant to this candidate's profile.\n"
-                      f"For software languages, applications, and hardware, use the taxonomy as a reference but feel empowered to include technologies that aren't listed if they are clearly important to the candidate's profile.\n"
-                      f"Example: If the taxonomy lists 'Java' but the resume shows extensive React.js experience, it's appropriate to list React.js even if it's not in the taxonomy.\n"
-                      f"Balance standardization with accuracy - prioritize capturing the candidate's true expertise over strict adherence to the taxonomy.\n"
-                      f"IMPORTANT: You MUST provide BOTH a Primary AND Secondary technical category. These must be different from each other. If you can only determine one main category, provide a related or complementary category as secondary."
-        },
-        # Technical languages rules
-        {
-            "role": "system", 
-            "content": "Use the following rules when assessing Primary, Secondary, and Tertiary Technical Languages: "
-                       "Include ALL types of technical languages mentioned in the resume, such as:"
-                       "- Database languages (SQL, T-SQL, PL/SQL, MySQL, Oracle SQL, PostgreSQL)"
-                       "- Programming languages (Java, Python, C#, JavaScript, Ruby)"
-                       "- Scripting languages (PowerShell, Bash, Shell, VBA)"
-                       "- Query languages (SPARQL, GraphQL, HiveQL)"
-                       "- Markup/stylesheet languages (HTML, CSS, XML)"
-                       "Prioritize languages based on:"
-                       "1. Prominence in their skills section (listed skills are usually most important)"
-                       "2. Frequency of mention throughout work history"
-                       "3. Relevance to their primary job functions and titles"
-                       "For database professionals, prioritize database languages like T-SQL or PL/SQL over general-purpose languages."
-        },
-        # Software applications rules
-        {
-            "role": "system", 
-            "content": "Use the following rules when assessing Most used Software Applications: "
-                       "Please only list out actual software applications. nothing else."
-                       "Analyze their resume and determine what software they use most."
-                       "If none can be found put NULL."
-        },
-        # Hardware rules
-        {
-            "role": "system", 
-            "content": "Use the following rules when assessing Hardware: "
-                       "Please list 5 different specific hardware devices the candidate has worked with. "
-                       "Hardware devices include many categories such as:\n"
-                       "- Network equipment (firewalls, routers, switches, load balancers)\n"
-                       "- Server hardware (blade servers, rack servers, chassis systems)\n"
-                       "- Storage devices (SANs, NAS, RAID arrays, disk systems)\n"
-                       "- Security appliances (TACALANEs, hardware encryption devices)\n"
-                       "- Management interfaces (iDRAC, iLO, IMM, IPMI, BMC)\n"
-                       "- Virtualization hardware (ESXi hosts, hyperconverged systems)\n"
-                       "- Physical components (CPUs, RAM modules, hard drives, SSDs)\n"
-                       "- Communication hardware (modems, wireless access points, VPN concentrators)\n"
-                       "- Specialized hardware (tape libraries, KVM switches, console servers)\n\n"
-                       "IMPORTANT: Even if they worked with multiple hardware items from the same brand, list different types. "
-                       "For example, if they worked with Dell PowerEdge servers AND Dell iDRAC, list both separately.\n\n"
-                       "Look beyond obvious hardware to find specialized equipment, management interfaces, and components. "
-                       "Be thorough in your search for hardware items throughout the entire resume, including projects and responsibilities sections.\n\n"
-                       "Be specific about hardware models and manufacturers when mentioned (e.g. 'Palo Alto PA-5200 series' rather than just 'firewalls'). "
-                       "Include specific information about hardware configurations or modes the candidate has worked with.\n\n"
-                       "Please list only the hardware device names, one per line, without any prefixes or numbering:\n"
-                       "- What physical hardware do they talk about using the most?: [device name only]\n"
-                       "- What physical hardware do they talk about using the second most?: [device name only]\n"
-                       "- What physical hardware do they talk about using the third most?: [device name only]\n"
-                       "- What physical hardware do they talk about using the fourth most?: [device name only]\n"
-                       "- What physical hardware do they talk about using the fifth most?: [device name only]\n\n"
-                       "Try your best to identify 5 different hardware items. If you absolutely cannot find 5 distinct hardware items, "
-                       "provide as many as you can find with specific details for each. Only use NULL if no hardware at all is mentioned."
+            "role": "system",
+            "content": f"{taxonomy_context}\n{TAXONOMY_GUIDANCE}"
         },
-        # User query combining all fields from both steps
+        *UNIFIED_TECH_MESSAGES,
+        # User query combining all fields from both steps. Kept as a fresh dict
+        # because apply_token_truncation rewrites user content in place.
         {
             "role": "user",
-            "content": "Please analyze the following resume and give me the following comprehensive details (If you can't find an answer or it's not provided/listed, just put NULL):\n"
-                      "- First Name:\n"
-                      "- Middle Name:\n"
-                      "- Last Name:\n"
-                      "- Address:\n"
-                      "- City (IMPORTANT: First check if they explicitly state where they live. If not stated and their current job is not listed as remote, use the city of their current employer's location. Only return NULL if neither is available):\n"
-                      "- State (IMPORTANT: First check if they explicitly state where they live. If not stated and their current job is not listed as remote, use the state of their current employer's location. Only return NULL if neither is available):\n"
-                      "- Zipcode(IMPORTANT: 5 digit zip only, no zip+4. If a zip code is explicitly on the resume use it. If you returned a City and State above, you MUST also provide a well-known zip code for that city - never return NULL for zip when City and State are populated. Only return NULL if both City and State above are also NULL. Do NOT infer a zip from job/company locations):\n"
-                      "- Phone1:\n"
-                      "- Phone2:\n"
-                      "- Email (IMPORTANT: Resumes often obfuscate emails to avoid scrapers. Reconstruct them into a real address of the form user@domain.tld. Convert spelled-out or spaced separators back to symbols: 'at'/'(at)'/'[at]'/' at ' becomes '@', and 'dot'/'(dot)'/'[dot]'/' dot ' becomes '.'. Remove spaces inside the address. For example 'Ricky at infosmarttech dot com' becomes 'ricky@infosmarttech.com' and 'john [dot] doe [at] gmail [dot] com' becomes 'john.doe@gmail.com'. Only return NULL if no email is present at all):\n"
-                      "- Email2:\n"
-                      "- LinkedIn:\n"
-                      "- Certifications:\n"
-                      "- Bachelors:\n"
-                      "- Masters:\n"
-                      "- Best job title that fits their primary experience (IMPORTANT: Job titles should reflect what they DO, not what they call themselves. Focus on their actual work/project history, not their listed title. Avoid generic terms like: Consultant, Solutions, Enterprise, 'software developer', 'software engineer', 'full stack developer', or IT. Be specific - e.g., 'Cloud Infrastructure Engineer' not 'IT Professional'):\n"
-                      "- Best job title that fits their secondary experience (Must be different from primary. Follow same rules as above):\n"
-                      "- Best job title that fits their tertiary experience (Must be different from both primary and secondary. Follow same rules as above):\n"
-                      "- Most Recent Company Worked for:\n"
-                      "- Most Recent Start Date (YYYY-MM-DD format - convert from whatever format is in resume, e.g., '09/2021' becomes '2021-09-01'):\n"
-                      "- Most Recent End Date (YYYY-MM-DD format or 'Present' if currently employed there):\n"
-                      "- Most Recent Job Location:\n"
-                      "- Second Most Recent Company Worked for:\n"
-                      "- Second Most Recent Start Date (YYYY-MM-DD):\n"
-                      "- Second Most Recent End Date (YYYY-MM-DD):\n"
-                      "- Second Most Recent Job Location:\n"
-                      "- Third Most Recent Company Worked for:\n"
-                      "- Third Most Recent Start Date (YYYY-MM-DD):\n"
-                      "- Third Most Recent End Date (YYYY-MM-DD):\n"
-                      "- Third Most Recent Job Location:\n"
-                      "- Fourth Most Recent Company Worked for:\n"
-                      "- Fourth Most Recent Start Date (YYYY-MM-DD):\n"
-                      "- Fourth Most Recent End Date (YYYY-MM-DD):\n"
-                      "- Fourth Most Recent Job Location:\n"
-                      "- Fifth Most Recent Company Worked for:\n"
-                      "- Fifth Most Recent Start Date (YYYY-MM-DD):\n"
-                      "- Fifth Most Recent End Date (YYYY-MM-DD):\n"
-                      "- Fifth Most Recent Job Location:\n"
-                      "- Sixth Most Recent Company Worked for:\n"
-                      "- Sixth Most Recent Start Date (YYYY-MM-DD):\n"
-                      "- Sixth Most Recent End Date (YYYY-MM-DD):\n"
-                      "- Sixth Most Recent Job Location:\n"
-                      "- Seventh Most Recent Company Worked for:\n"
-                      "- Seventh Most Recent Start Date (YYYY-MM-DD):\n"
-                      "- Seventh Most Recent End Date (YYYY-MM-DD):\n"
-                      "- Seventh Most Recent Job Location:\n"
-                      "- Based on all 7 of their most recent companies above, what is the Primary industry they work in:\n"
-                      "- Based on all 7 of their most recent companies above, what is the Secondary industry they work in:\n"
-                      "- Top 10 Technical Skills (IMPORTANT: Only include TECHNICAL skills like programming languages, frameworks, tools, platforms, databases, and cloud services. Do NOT include soft skills. Provide as comma-separated list):\n"
-                      "- What technical language do they use most often? (Programming or scripting language - pick the ONE they use most):\n"
-                      "- What technical language do they use second most often?:\n"
-                      "- What technical language do they use third most often?:\n"
-                      "- What software do they talk about using the most? (Include databases, tools, platforms, frameworks, etc.):\n"
-                      "- What software do they talk about using the second most? (Must be different from first):\n"
-                      "- What software do they talk about using the third most? (Must be different from previous):\n"
-                      "- What software do they talk about using the fourth most? (Must be different from previous):\n"
-                      "- What software do they talk about using the fifth most? (Must be different from previous):\n"
-                      "- What physical hardware do they talk about using the most? (IMPORTANT: Only list actual PHYSICAL hardware like servers, routers, switches, IoT devices, embedded systems, etc. Do NOT include software or virtual systems):\n"
-                      "- What physical hardware do they talk about using the second most? (Must be different from first, physical hardware only):\n"
-                      "- What physical hardware do they talk about using the third most? (Must be different from previous, physical hardware only):\n"
-                      "- What physical hardware do they talk about using the fourth most? (Must be different from previous, physical hardware only):\n"
-                      "- What physical hardware do they talk about using the fifth most? (Must be different from previous, physical hardware only):\n"
-                      "- Based on their skills, put them in a primary technical category (Choose from standard technical categories like Software Development, Cloud/DevOps, Data/Analytics, Infrastructure/Networking, Cybersecurity, Database Administration, QA/Testing, Project Management, Business Analysis, UI/UX Design, Hardware/Embedded, AI/Machine Learning, Mobile Development, Enterprise Systems, or Other):\n"
-                      "- Based on their skills, put them in a subsidiary technical category (Must be different from primary. Choose from same categories):\n"
-                      "- Types of projects they have worked on (Use action-oriented phrases that describe what they've accomplished, focusing on implementations, migrations, integrations, optimizations, deployments, etc.):\n"
-                      "- How long have they worked in the United States in YEARS (numerical answer only, use decimals like 0.5 for 6 months). If all jobs are in US or no location specified, calculate from earliest job to most recent/present:\n"
-                      "- Total years of professional experience (numerical answer only) - IMPORTANT: Calculate from the earliest job start date to the most recent job end date. If the most recent job says 'Present', 'Current', or similar, use today's date as the end date. Do NOT sum up individual job durations as jobs may overlap. For example, if someone worked from 2015-2018 and 2017-2020, the total is 5 years (2015-2020), not 6 years. If they started in 2015 and their current job is 'Present', calculate from 2015 to today:\n"
-                      "- Average tenure at companies in years (numerical answer only) - Calculate by dividing total experience by number of different companies. Only count each company once even if they had multiple positions there:"
+            "content": UNIFIED_USER_CONTENT
         }
     ]
 
 def parse_unified_response(response_text):
     """
     Parse the unified response with combined fields from both steps
+    
+    Identical response texts are parsed once; each caller gets its own copy
+    of the fields so mutating the result never touches the cache.
     """
+    return dict(_parse_unified_response_cached(response_text))
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_unified_response_cached(response_text):
+    """Parse one unified response; cached by text, so callers must copy the result"""
     # First use step1 extractor for basic info
     extracted_fields = extract_fields_directly(response_text)
     
     # Then use step2 extractor for technical info
-    from two_step_processor_taxonomy import extract_step2_fields_directly
     tech_fields = extract_step2_fields_directly(response_text)
     
     # Combine the results
     extracted_fields.update(tech_fields)
     
     # Explicitly look for Top 10 Technical Skills
-    skills_match = re.search(r'Top 10 Technical Skills:\s*(.+?)(?:\n|$)', response_text)
+    skills_match = TOP10_SKILLS_PATTERN.search(response_text)
     if skills_match:
         skills = skills_match.group(1).strip()
         if skills and skills.upper() != "NULL":
@@ -364,24 +431,79 @@ def parse_unified_response(response_text):
             logging.warning("Top10Skills field is empty or NULL")
     else:
         logging.warning("Top10Skills field not found in response")
+        _fill_top10_skills_fallback(extracted_fields)
+    
+    return extracted_fields
+
+def _fill_top10_skills_fallback(extracted_fields):
+    """Construct Top10Skills from the language and software fields when the response has none"""
+    tech_skills = []
+    
+    # Check for technical languages
+    for field in ["PrimarySoftwareLanguage", "SecondarySoftwareLanguage", "TertiarySoftwareLanguage"]:
+        if field in extracted_fields and extracted_fields[field] and extracted_fields[field] != "NULL":
+            tech_skills.append(extracted_fields[field])
+            
+    # Check for software applications
+    for field in ["SoftwareApp1", "SoftwareApp2", "SoftwareApp3", "SoftwareApp4", "SoftwareApp5"]:
+        if field in extracted_fields and extracted_fields[field] and extracted_fields[field] != "NULL":
+            tech_skills.append(extracted_fields[field])
+    
+    # If we found some skills, use them
+    if tech_skills:
+        extracted_fields["Top10Skills"] = ", ".join(tech_skills[:10])
+        logging.info(f"Constructed Top10Skills from other fields: {extracted_fields['Top10Skills']}")
+
+def parse_unified_json_response(response_text):
+    """
+    Parse a structured-output response (see UNIFIED_RESPONSE_FORMAT)
+    
+    The JSON keys are already database field names, so no label matching is needed.
+    
+    Args:
+        response_text: Message content returned by the API
+        
+    Returns:
+        Dictionary of extracted fields, or None if the text is not a flat JSON
+        object with unified field names (callers then use parse_unified_response)
+    """
+    # Labeled-text answers never start with '{', so skip the decoder (and its exception) for them
+    if not response_text.lstrip().startswith('{'):
+        return None
+    
+    try:
+        data = json.loads(response_text)
+    except ValueError:
+        return None
+    
+    return extract_unified_json_fields(data)
+
+def extract_unified_json_fields(data):
+    """
+    Extract the unified fields from one decoded structured-output object
+    
+    Args:
+        data: Decoded JSON object keyed by database field names
         
-        # Fallback: Try to construct Top10Skills from other technical fields
-        tech_skills = []
-        
-        # Check for technical languages
-        for field in ["PrimarySoftwareLanguage", "SecondarySoftwareLanguage", "TertiarySoftwareLanguage"]:
-            if field in extracted_fields and extracted_fields[field] and extracted_fields[field] != "NULL":
-                tech_skills.append(extracted_fields[field])
-                
-        # Check for software applications
-        for field in ["SoftwareApp1", "SoftwareApp2", "SoftwareApp3", "SoftwareApp4", "SoftwareApp5"]:
-            if field in extracted_fields and extracted_fields[field] and extracted_fields[field] != "NULL":
-                tech_skills.append(extracted_fields[field])
-        
-        # If we found some skills, use them
-        if tech_skills:
-            extracted_fields["Top10Skills"] = ", ".join(tech_skills[:10])
-            logging.info(f"Constructed Top10Skills from other fields: {extracted_fields['Top10Skills']}")
+    Returns:
+        Dictionary of extracted fields, or None if data is not an object with
+        unified field names
+    """
+    if not isinstance(data, dict) or not any(field in data for field in UNIFIED_RESPONSE_FIELDS):
+        return None
+    
+    extracted_fields = {}
+    for field in UNIFIED_RESPONSE_FIELDS:
+        value = data.get(field)
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        value = str(value).strip()
+        if value and value.upper() != "NULL":
+            extracted_fields[field] = value
+    
+    if "Top10Skills" not in extracted_fields:
+        logging.warning("Top10Skills field is empty or NULL")
+        _fill_top10_skills_fallback(extracted_fields)
     
     return extracted_fields
 
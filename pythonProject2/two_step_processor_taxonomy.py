@@ -3,6 +3,7 @@ Two-step resume processor with skills taxonomy integration
 """
 
 import os
+import re
 import logging
 import time
 import concurrent.futures
@@ -28,353 +29,471 @@ MAX_WORKERS = 50       # Maximum number of concurrent API requests
 MODEL = DEFAULT_MODEL  # Using the default model from resume_utils
 USE_BATCH_API = True   # Use the new OpenAI batch API for better efficiency
 
+def _compile_patterns(patterns):
+    """Compile a list of regex patterns, or a dict of field -> list of patterns"""
+    if isinstance(patterns, dict):
+        return {field: [re.compile(pattern) for pattern in field_patterns] for field, field_patterns in patterns.items()}
+    return [re.compile(pattern) for pattern in patterns]
+
+# Direct-extraction patterns for step 1 fields, compiled once at import
+
+# === JOB TITLE PATTERNS ===
+# Patterns to look for job titles - different possible phrasings
+DIRECT_PRIMARY_TITLE_PATTERNS = _compile_patterns([
+    r"Best job title that fits? their primary experience:\s*(.+)",
+    r"Best job title that fit their primary experience:\s*(.+)",
+    r"Best job title that fits their primary experience:\s*(.+)",
+    r"Primary Job Title:\s*(.+)"
+])
+
+DIRECT_SECONDARY_TITLE_PATTERNS = _compile_patterns([
+    r"Best secondary job title that fits their secondary experience:\s*(.+)",
+    r"Best job title that fits their secondary experience:\s*(.+)",
+    r"Secondary Job Title:\s*(.+)"
+])
+
+DIRECT_TERTIARY_TITLE_PATTERNS = _compile_patterns([
+    r"Best tertiary job title that fits their tertiary experience:\s*(.+)",
+    r"Best job title that fits their tertiary experience:\s*(.+)",
+    r"Tertiary Job Title:\s*(.+)"
+])
+
+# === COMPANY PATTERNS ===
+# Patterns for company information
+DIRECT_COMPANY_PATTERNS = _compile_patterns({
+    "MostRecentCompany": [
+        r"Most Recent Company Worked for:\s*(.+)",
+        r"Most Recent Company:\s*(.+)"
+    ],
+    "SecondMostRecentCompany": [
+        r"Second Most Recent Company Worked for:\s*(.+)",
+        r"Second Most Recent Company:\s*(.+)" 
+    ],
+    "ThirdMostRecentCompany": [
+        r"Third Most Recent Company Worked for:\s*(.+)",
+        r"Third Most Recent Company:\s*(.+)"
+    ],
+    "FourthMostRecentCompany": [
+        r"Fourth Most Recent Company Worked for:\s*(.+)",
+        r"Fourth Most Recent Company:\s*(.+)"
+    ],
+    "FifthMostRecentCompany": [
+        r"Fifth Most Recent Company Worked for:\s*(.+)",
+        r"Fifth Most Recent Company:\s*(.+)"
+    ],
+    "SixthMostRecentCompany": [
+        r"Sixth Most Recent Company Worked for:\s*(.+)",
+        r"Sixth Most Recent Company:\s*(.+)"
+    ],
+    "SeventhMostRecentCompany": [
+        r"Seventh Most Recent Company Worked for:\s*(.+)",
+        r"Seventh Most Recent Company:\s*(.+)"
+    ]
+})
+
+# === DATE PATTERNS ===
+# Patterns for dates
+DIRECT_DATE_PATTERNS = _compile_patterns({
+    "MostRecentStartDate": [
+        r"Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Most Recent Start Date:\s*(.+)"
+    ],
+    "MostRecentEndDate": [
+        r"Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Most Recent End Date:\s*(.+)"
+    ],
+    "SecondMostRecentStartDate": [
+        r"Second Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Second Most Recent Start Date:\s*(.+)"
+    ],
+    "SecondMostRecentEndDate": [
+        r"Second Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Second Most Recent End Date:\s*(.+)"
+    ],
+    "ThirdMostRecentStartDate": [
+        r"Third Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Third Most Recent Start Date:\s*(.+)"
+    ],
+    "ThirdMostRecentEndDate": [
+        r"Third Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Third Most Recent End Date:\s*(.+)"
+    ],
+    "FourthMostRecentStartDate": [
+        r"Fourth Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Fourth Most Recent Start Date:\s*(.+)"
+    ],
+    "FourthMostRecentEndDate": [
+        r"Fourth Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Fourth Most Recent End Date:\s*(.+)"
+    ],
+    "FifthMostRecentStartDate": [
+        r"Fifth Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Fifth Most Recent Start Date:\s*(.+)"
+    ],
+    "FifthMostRecentEndDate": [
+        r"Fifth Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Fifth Most Recent End Date:\s*(.+)"
+    ],
+    "SixthMostRecentStartDate": [
+        r"Sixth Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Sixth Most Recent Start Date:\s*(.+)"
+    ],
+    "SixthMostRecentEndDate": [
+        r"Sixth Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Sixth Most Recent End Date:\s*(.+)"
+    ],
+    "SeventhMostRecentStartDate": [
+        r"Seventh Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Seventh Most Recent Start Date:\s*(.+)"
+    ],
+    "SeventhMostRecentEndDate": [
+        r"Seventh Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
+        r"Seventh Most Recent End Date:\s*(.+)"
+    ]
+})
+
+# === LOCATION PATTERNS ===
+# Patterns for locations
+DIRECT_LOCATION_PATTERNS = _compile_patterns({
+    "MostRecentLocation": [
+        r"Most Recent Job Location:\s*(.+)",
+        r"Most Recent Location:\s*(.+)"
+    ],
+    "SecondMostRecentLocation": [
+        r"Second Most Recent Job Location:\s*(.+)",
+        r"Second Most Recent Location:\s*(.+)"
+    ],
+    "ThirdMostRecentLocation": [
+        r"Third Most Recent Job Location:\s*(.+)",
+        r"Third Most Recent Location:\s*(.+)"
+    ],
+    "FourthMostRecentLocation": [
+        r"Fourth Most Recent Job Location:\s*(.+)",
+        r"Fourth Most Recent Location:\s*(.+)"
+    ],
+    "FifthMostRecentLocation": [
+        r"Fifth Most Recent Job Location:\s*(.+)",
+        r"Fifth Most Recent Location:\s*(.+)"
+    ],
+    "SixthMostRecentLocation": [
+        r"Sixth Most Recent Job Location:\s*(.+)",
+        r"Sixth Most Recent Location:\s*(.+)"
+    ],
+    "SeventhMostRecentLocation": [
+        r"Seventh Most Recent Job Location:\s*(.+)",
+        r"Seventh Most Recent Location:\s*(.+)"
+    ]
+})
+
+# === INDUSTRY PATTERNS ===
+# Patterns for industry
+DIRECT_INDUSTRY_PATTERNS = _compile_patterns({
+    "PrimaryIndustry": [
+        r"Based on all 7 of their most recent companies above, what is the Primary industry they work in:\s*(.+)",
+        r"Primary Industry:\s*(.+)",
+        r"What is the Primary industry they work in:\s*(.+)",
+        r"Primary industry they work in:\s*(.+)",
+        r"Primary industry:\s*(.+)"
+    ],
+    "SecondaryIndustry": [
+        r"Based on all 7 of their most recent companies above, what is the Secondary industry they work in:\s*(.+)",
+        r"Secondary Industry:\s*(.+)",
+        r"What is the Secondary industry they work in:\s*(.+)",
+        r"Secondary industry they work in:\s*(.+)",
+        r"Secondary industry:\s*(.+)",
+        r"Second most common industry:\s*(.+)",
+        r"Second industry:\s*(.+)"
+    ]
+})
+
+# === PERSONAL INFO PATTERNS ===
+# Patterns for personal information
+DIRECT_PERSONAL_INFO_PATTERNS = _compile_patterns({
+    "Address": [
+        r"Their street address:\s*(.+)",
+        r"Street Address:\s*(.+)",
+        r"Address:\s*(.+)"  # Add pattern for single_step_processor format
+    ],
+    "City": [
+        r"Their City:\s*(.+)",
+        r"City:\s*(.+)"
+    ],
+    "State": [
+        r"Their State:\s*(.+)",
+        r"State:\s*(.+)"
+    ],
+    "ZipCode": [
+        r"Their Zipcode\([^)]*\):\s*([^\n]+)",
+        r"Their Zipcode:\s*([^\n]+)",
+        r"Zipcode\([^)]*\):\s*([^\n]+)",
+        r"Zipcode:\s*([^\n]+)",
+        r"Zip Code:\s*([^\n]+)",
+        r"Zip:\s*([^\n]+)"
+    ],
+    "Phone1": [
+        r"Their Phone Number:\s*(.+)",
+        r"Phone Number 1:\s*(.+)",
+        r"Their Phone Number 1:\s*(.+)",
+        r"Phone1:\s*(.+)"  # Add pattern for single_step_processor format
+    ],
+    "Phone2": [
+        r"Their Second Phone Number:\s*(.+)",
+        r"Phone Number 2:\s*(.+)",
+        r"Their Phone Number 2:\s*(.+)",
+        r"Phone2:\s*(.+)"  # Add pattern for single_step_processor format
+    ],
+    "Email": [
+        r"Their Email:\s*(.+)",
+        r"Email 1:\s*(.+)",
+        r"Their Email 1:\s*(.+)",
+        r"Email:\s*(.+)"  # Add pattern for single_step_processor format
+    ],
+    "Email2": [
+        r"Their Second Email:\s*(.+)",
+        r"Email 2:\s*(.+)",
+        r"Their Email 2:\s*(.+)",
+        r"Email2:\s*(.+)"  # Add pattern for single_step_processor format
+    ],
+    "FirstName": [
+        r"Their First Name:\s*(.+)",
+        r"First Name:\s*(.+)",
+        r"- First Name:\s*(.+)"  # Add pattern with hyphen prefix for single_step_processor
+    ],
+    "MiddleName": [
+        r"Their Middle Name:\s*(.+)",
+        r"Middle Name:\s*(.+)"
+    ],
+    "LastName": [
+        r"Their Last Name:\s*(.+)",
+        r"Last Name:\s*(.+)"
+    ],
+    "Linkedin": [
+        r"Their Linkedin URL:\s*(.+)",
+        r"LinkedIn URL:\s*(.+)",
+        r"LinkedIn:\s*(.+)"  # Add pattern for single_step_processor format
+    ],
+    "Bachelors": [
+        r"Their Bachelor's Degree:\s*(.+)",
+        r"Bachelor's Degree:\s*(.+)",
+        r"Bachelors:\s*(.+)"  # Add pattern for single_step_processor format
+    ],
+    "Masters": [
+        r"Their Master's Degree:\s*(.+)",
+        r"Master's Degree:\s*(.+)",
+        r"Masters:\s*(.+)"  # Add pattern for single_step_processor format
+    ],
+    "Certifications": [
+        r"Their Certifications Listed:\s*(.+)",
+        r"Certifications:\s*(.+)",
+        r"Certifications Listed:\s*(.+)"
+    ]
+})
+
 # Function copied from removed file to preserve functionality
 def extract_fields_directly(response_text):
     """Extract various fields directly using regex patterns"""
-    import re
-    
     # Dictionary to store extracted fields
     extracted = {}
     
-    # === JOB TITLE PATTERNS ===
-    # Patterns to look for job titles - different possible phrasings
-    primary_patterns = [
-        r"Best job title that fits? their primary experience:\s*(.+)",
-        r"Best job title that fit their primary experience:\s*(.+)",
-        r"Best job title that fits their primary experience:\s*(.+)",
-        r"Primary Job Title:\s*(.+)"
-    ]
-    
-    secondary_patterns = [
-        r"Best secondary job title that fits their secondary experience:\s*(.+)",
-        r"Best job title that fits their secondary experience:\s*(.+)",
-        r"Secondary Job Title:\s*(.+)"
-    ]
-    
-    tertiary_patterns = [
-        r"Best tertiary job title that fits their tertiary experience:\s*(.+)",
-        r"Best job title that fits their tertiary experience:\s*(.+)",
-        r"Tertiary Job Title:\s*(.+)"
-    ]
-    
-    # === COMPANY PATTERNS ===
-    # Patterns for company information
-    company_patterns = {
-        "MostRecentCompany": [
-            r"Most Recent Company Worked for:\s*(.+)",
-            r"Most Recent Company:\s*(.+)"
-        ],
-        "SecondMostRecentCompany": [
-            r"Second Most Recent Company Worked for:\s*(.+)",
-            r"Second Most Recent Company:\s*(.+)" 
-        ],
-        "ThirdMostRecentCompany": [
-            r"Third Most Recent Company Worked for:\s*(.+)",
-            r"Third Most Recent Company:\s*(.+)"
-        ],
-        "FourthMostRecentCompany": [
-            r"Fourth Most Recent Company Worked for:\s*(.+)",
-            r"Fourth Most Recent Company:\s*(.+)"
-        ],
-        "FifthMostRecentCompany": [
-            r"Fifth Most Recent Company Worked for:\s*(.+)",
-            r"Fifth Most Recent Company:\s*(.+)"
-        ],
-        "SixthMostRecentCompany": [
-            r"Sixth Most Recent Company Worked for:\s*(.+)",
-            r"Sixth Most Recent Company:\s*(.+)"
-        ],
-        "SeventhMostRecentCompany": [
-            r"Seventh Most Recent Company Worked for:\s*(.+)",
-            r"Seventh Most Recent Company:\s*(.+)"
-        ]
-    }
-    
-    # === DATE PATTERNS ===
-    # Patterns for dates
-    date_patterns = {
-        "MostRecentStartDate": [
-            r"Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Most Recent Start Date:\s*(.+)"
-        ],
-        "MostRecentEndDate": [
-            r"Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Most Recent End Date:\s*(.+)"
-        ],
-        "SecondMostRecentStartDate": [
-            r"Second Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Second Most Recent Start Date:\s*(.+)"
-        ],
-        "SecondMostRecentEndDate": [
-            r"Second Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Second Most Recent End Date:\s*(.+)"
-        ],
-        "ThirdMostRecentStartDate": [
-            r"Third Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Third Most Recent Start Date:\s*(.+)"
-        ],
-        "ThirdMostRecentEndDate": [
-            r"Third Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Third Most Recent End Date:\s*(.+)"
-        ],
-        "FourthMostRecentStartDate": [
-            r"Fourth Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Fourth Most Recent Start Date:\s*(.+)"
-        ],
-        "FourthMostRecentEndDate": [
-            r"Fourth Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Fourth Most Recent End Date:\s*(.+)"
-        ],
-        "FifthMostRecentStartDate": [
-            r"Fifth Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Fifth Most Recent Start Date:\s*(.+)"
-        ],
-        "FifthMostRecentEndDate": [
-            r"Fifth Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Fifth Most Recent End Date:\s*(.+)"
-        ],
-        "SixthMostRecentStartDate": [
-            r"Sixth Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Sixth Most Recent Start Date:\s*(.+)"
-        ],
-        "SixthMostRecentEndDate": [
-            r"Sixth Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Sixth Most Recent End Date:\s*(.+)"
-        ],
-        "SeventhMostRecentStartDate": [
-            r"Seventh Most Recent Start Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Seventh Most Recent Start Date:\s*(.+)"
-        ],
-        "SeventhMostRecentEndDate": [
-            r"Seventh Most Recent End Date \(YYYY-MM-DD\):\s*(.+)",
-            r"Seventh Most Recent End Date:\s*(.+)"
-        ]
-    }
-    
-    # === LOCATION PATTERNS ===
-    # Patterns for locations
-    location_patterns = {
-        "MostRecentLocation": [
-            r"Most Recent Job Location:\s*(.+)",
-            r"Most Recent Location:\s*(.+)"
-        ],
-        "SecondMostRecentLocation": [
-            r"Second Most Recent Job Location:\s*(.+)",
-            r"Second Most Recent Location:\s*(.+)"
-        ],
-        "ThirdMostRecentLocation": [
-            r"Third Most Recent Job Location:\s*(.+)",
-            r"Third Most Recent Location:\s*(.+)"
-        ],
-        "FourthMostRecentLocation": [
-            r"Fourth Most Recent Job Location:\s*(.+)",
-            r"Fourth Most Recent Location:\s*(.+)"
-        ],
-        "FifthMostRecentLocation": [
-            r"Fifth Most Recent Job Location:\s*(.+)",
-            r"Fifth Most Recent Location:\s*(.+)"
-        ],
-        "SixthMostRecentLocation": [
-            r"Sixth Most Recent Job Location:\s*(.+)",
-            r"Sixth Most Recent Location:\s*(.+)"
-        ],
-        "SeventhMostRecentLocation": [
-            r"Seventh Most Recent Job Location:\s*(.+)",
-            r"Seventh Most Recent Location:\s*(.+)"
-        ]
-    }
-    
-    # === INDUSTRY PATTERNS ===
-    # Patterns for industry
-    industry_patterns = {
-        "PrimaryIndustry": [
-            r"Based on all 7 of their most recent companies above, what is the Primary industry they work in:\s*(.+)",
-            r"Primary Industry:\s*(.+)",
-            r"What is the Primary industry they work in:\s*(.+)",
-            r"Primary industry they work in:\s*(.+)",
-            r"Primary industry:\s*(.+)"
-        ],
-        "SecondaryIndustry": [
-            r"Based on all 7 of their most recent companies above, what is the Secondary industry they work in:\s*(.+)",
-            r"Secondary Industry:\s*(.+)",
-            r"What is the Secondary industry they work in:\s*(.+)",
-            r"Secondary industry they work in:\s*(.+)",
-            r"Secondary industry:\s*(.+)",
-            r"Second most common industry:\s*(.+)",
-            r"Second industry:\s*(.+)"
-        ]
-    }
-    
-    # === PERSONAL INFO PATTERNS ===
-    # Patterns for personal information
-    personal_info_patterns = {
-        "Address": [
-            r"Their street address:\s*(.+)",
-            r"Street Address:\s*(.+)",
-            r"Address:\s*(.+)"  # Add pattern for single_step_processor format
-        ],
-        "City": [
-            r"Their City:\s*(.+)",
-            r"City:\s*(.+)"
-        ],
-        "State": [
-            r"Their State:\s*(.+)",
-            r"State:\s*(.+)"
-        ],
-        "ZipCode": [
-            r"Their Zipcode\([^)]*\):\s*([^\n]+)",
-            r"Their Zipcode:\s*([^\n]+)",
-            r"Zipcode\([^)]*\):\s*([^\n]+)",
-            r"Zipcode:\s*([^\n]+)",
-            r"Zip Code:\s*([^\n]+)",
-            r"Zip:\s*([^\n]+)"
-        ],
-        "Phone1": [
-            r"Their Phone Number:\s*(.+)",
-            r"Phone Number 1:\s*(.+)",
-            r"Their Phone Number 1:\s*(.+)",
-            r"Phone1:\s*(.+)"  # Add pattern for single_step_processor format
-        ],
-        "Phone2": [
-            r"Their Second Phone Number:\s*(.+)",
-            r"Phone Number 2:\s*(.+)",
-            r"Their Phone Number 2:\s*(.+)",
-            r"Phone2:\s*(.+)"  # Add pattern for single_step_processor format
-        ],
-        "Email": [
-            r"Their Email:\s*(.+)",
-            r"Email 1:\s*(.+)",
-            r"Their Email 1:\s*(.+)",
-            r"Email:\s*(.+)"  # Add pattern for single_step_processor format
-        ],
-        "Email2": [
-            r"Their Second Email:\s*(.+)",
-            r"Email 2:\s*(.+)",
-            r"Their Email 2:\s*(.+)",
-            r"Email2:\s*(.+)"  # Add pattern for single_step_processor format
-        ],
-        "FirstName": [
-            r"Their First Name:\s*(.+)",
-            r"First Name:\s*(.+)",
-            r"- First Name:\s*(.+)"  # Add pattern with hyphen prefix for single_step_processor
-        ],
-        "MiddleName": [
-            r"Their Middle Name:\s*(.+)",
-            r"Middle Name:\s*(.+)"
-        ],
-        "LastName": [
-            r"Their Last Name:\s*(.+)",
-            r"Last Name:\s*(.+)"
-        ],
-        "Linkedin": [
-            r"Their Linkedin URL:\s*(.+)",
-            r"LinkedIn URL:\s*(.+)",
-            r"LinkedIn:\s*(.+)"  # Add pattern for single_step_processor format
-        ],
-        "Bachelors": [
-            r"Their Bachelor's Degree:\s*(.+)",
-            r"Bachelor's Degree:\s*(.+)",
-            r"Bachelors:\s*(.+)"  # Add pattern for single_step_processor format
-        ],
-        "Masters": [
-            r"Their Master's Degree:\s*(.+)",
-            r"Master's Degree:\s*(.+)",
-            r"Masters:\s*(.+)"  # Add pattern for single_step_processor format
-        ],
-        "Certifications": [
-            r"Their Certifications Listed:\s*(.+)",
-            r"Certifications:\s*(.+)",
-            r"Certifications Listed:\s*(.+)"
-        ]
-    }
-    
     # === EXTRACT JOB TITLES ===
     # Try to find primary title
-    for pattern in primary_patterns:
-        match = re.search(pattern, response_text)
+    for pattern in DIRECT_PRIMARY_TITLE_PATTERNS:
+        match = pattern.search(response_text)
         if match:
             extracted["PrimaryTitle"] = match.group(1).strip()
-            logging.info(f"Direct extract: Found PrimaryTitle '{extracted['PrimaryTitle']}' using pattern '{pattern}'")
+            logging.info("Direct extract: Found PrimaryTitle '%s' using pattern '%s'", extracted['PrimaryTitle'], pattern.pattern)
             break
     
     # Try to find secondary title
-    for pattern in secondary_patterns:
-        match = re.search(pattern, response_text)
+    for pattern in DIRECT_SECONDARY_TITLE_PATTERNS:
+        match = pattern.search(response_text)
         if match:
             extracted["SecondaryTitle"] = match.group(1).strip()
-            logging.info(f"Direct extract: Found SecondaryTitle '{extracted['SecondaryTitle']}' using pattern '{pattern}'")
+            logging.info("Direct extract: Found SecondaryTitle '%s' using pattern '%s'", extracted['SecondaryTitle'], pattern.pattern)
             break
     
     # Try to find tertiary title
-    for pattern in tertiary_patterns:
-        match = re.search(pattern, response_text)
+    for pattern in DIRECT_TERTIARY_TITLE_PATTERNS:
+        match = pattern.search(response_text)
         if match:
             extracted["TertiaryTitle"] = match.group(1).strip()
-            logging.info(f"Direct extract: Found TertiaryTitle '{extracted['TertiaryTitle']}' using pattern '{pattern}'")
+            logging.info("Direct extract: Found TertiaryTitle '%s' using pattern '%s'", extracted['TertiaryTitle'], pattern.pattern)
             break
     
     # === EXTRACT COMPANIES ===
     # Extract company information
-    for field, patterns in company_patterns.items():
+    for field, patterns in DIRECT_COMPANY_PATTERNS.items():
         for pattern in patterns:
-            match = re.search(pattern, response_text)
+            match = pattern.search(response_text)
             if match:
                 value = match.group(1).strip()
                 if value.upper() != "NULL" and value != "":
                     extracted[field] = value
-                    logging.info(f"Direct extract: Found {field} '{value}' using pattern '{pattern}'")
+                    logging.info("Direct extract: Found %s '%s' using pattern '%s'", field, value, pattern.pattern)
                 break
     
     # === EXTRACT DATES ===
     # Extract date information
-    for field, patterns in date_patterns.items():
+    for field, patterns in DIRECT_DATE_PATTERNS.items():
         for pattern in patterns:
-            match = re.search(pattern, response_text)
+            match = pattern.search(response_text)
             if match:
                 value = match.group(1).strip()
                 if value.upper() != "NULL" and value != "":
                     extracted[field] = value
-                    logging.info(f"Direct extract: Found {field} '{value}'")
+                    logging.info("Direct extract: Found %s '%s'", field, value)
                 break
     
     # === EXTRACT LOCATIONS ===
     # Extract location information
-    for field, patterns in location_patterns.items():
+    for field, patterns in DIRECT_LOCATION_PATTERNS.items():
         for pattern in patterns:
-            match = re.search(pattern, response_text)
+            match = pattern.search(response_text)
             if match:
                 value = match.group(1).strip()
                 if value.upper() != "NULL" and value != "":
                     extracted[field] = value
-                    logging.info(f"Direct extract: Found {field} '{value}'")
+                    logging.info("Direct extract: Found %s '%s'", field, value)
                 break
     
     # === EXTRACT INDUSTRY ===
     # Extract industry information
-    for field, patterns in industry_patterns.items():
+    for field, patterns in DIRECT_INDUSTRY_PATTERNS.items():
         for pattern in patterns:
-            match = re.search(pattern, response_text)
+            match = pattern.search(response_text)
             if match:
                 value = match.group(1).strip()
                 if value.upper() != "NULL" and value != "":
                     extracted[field] = value
-                    logging.info(f"Direct extract: Found {field} '{value}'")
+                    logging.info("Direct extract: Found %s '%s'", field, value)
                 break
                 
     # === EXTRACT PERSONAL INFO ===
     # Extract personal information
-    for field, patterns in personal_info_patterns.items():
+    for field, patterns in DIRECT_PERSONAL_INFO_PATTERNS.items():
         for pattern in patterns:
-            match = re.search(pattern, response_text)
+            match = pattern.search(response_text)
             if match:
                 value = match.group(1).strip()
                 if value.upper() != "NULL" and value != "":
                     extracted[field] = value
-                    logging.info(f"Direct extract: Found {field} '{value}'")
+                    logging.info("Direct extract: Found %s '%s'", field, value)
                 break
     
     return extracted
 
+# Response label -> database field for the step 1 line parser
+STEP1_FIELD_MAPPING = {
+    "First Name": "FirstName",
+    "Middle Name": "MiddleName",
+    "Last Name": "LastName",
+    "Street Address": "Address",
+    "City": "City",
+    "State": "State", 
+    "Phone Number 1": "Phone1",
+    "Phone Number 2": "Phone2",
+    "Email 1": "Email",
+    "Email 2": "Email2",
+    "LinkedIn URL": "Linkedin",
+    "Bachelor's Degree": "Bachelors",
+    "Master's Degree": "Masters",
+    "Certifications": "Certifications",
+    "Primary Job Title": "PrimaryTitle",
+    "Secondary Job Title": "SecondaryTitle",
+    "Tertiary Job Title": "TertiaryTitle",
+
+    # Add alternative phrasings that appear in the actual API response
+    "Best job title that fit their primary experience": "PrimaryTitle",
+    "Best secondary job title that fits their secondary experience": "SecondaryTitle", 
+    "Best tertiary job title that fits their tertiary experience": "TertiaryTitle",
+
+    # Additional variations that might appear
+    "Best job title that fits their primary experience": "PrimaryTitle",
+    "Best job title fitting their primary experience": "PrimaryTitle",
+    "Most Recent Company": "MostRecentCompany",
+    "Most Recent Start Date": "MostRecentStartDate",
+    "Most Recent End Date": "MostRecentEndDate",
+    "Most Recent Job Location": "MostRecentLocation",
+    "Second Most Recent Company": "SecondMostRecentCompany",
+    "Second Most Recent Start Date": "SecondMostRecentStartDate",
+    "Second Most Recent End Date": "SecondMostRecentEndDate",
+    "Second Most Recent Job Location": "SecondMostRecentLocation",
+    "Third Most Recent Company": "ThirdMostRecentCompany",
+    "Third Most Recent Start Date": "ThirdMostRecentStartDate",
+    "Third Most Recent End Date": "ThirdMostRecentEndDate",
+    "Third Most Recent Job Location": "ThirdMostRecentLocation",
+    "Fourth Most Recent Company": "FourthMostRecentCompany",
+    "Fourth Most Recent Start Date": "FourthMostRecentStartDate",
+    "Fourth Most Recent End Date": "FourthMostRecentEndDate",
+    "Fourth Most Recent Job Location": "FourthMostRecentLocation",
+    "Fifth Most Recent Company": "FifthMostRecentCompany",
+    "Fifth Most Recent Start Date": "FifthMostRecentStartDate",
+    "Fifth Most Recent End Date": "FifthMostRecentEndDate",
+    "Fifth Most Recent Job Location": "FifthMostRecentLocation",
+    "Sixth Most Recent Company": "SixthMostRecentCompany",
+    "Sixth Most Recent Start Date": "SixthMostRecentStartDate",
+    "Sixth Most Recent End Date": "SixthMostRecentEndDate",
+    "Sixth Most Recent Job Location": "SixthMostRecentLocation",
+    "Seventh Most Recent Company": "SeventhMostRecentCompany",
+    "Seventh Most Recent Start Date": "SeventhMostRecentStartDate",
+    "Seventh Most Recent End Date": "SeventhMostRecentEndDate",
+    "Seventh Most Recent Job Location": "SeventhMostRecentLocation",
+    "Primary Industry": "PrimaryIndustry",
+    "Secondary Industry": "SecondaryIndustry",
+    "Top 10 Technical Skills": "Top10Skills"
+}
+
+# Response label -> database field for the step 2 line parser,
+# matching the exact prompt questions with the technical language fields
+STEP2_FIELD_MAPPING = {
+    "What technical language do they use most often?": "PrimarySoftwareLanguage",
+    "What technical language do they use second most often?": "SecondarySoftwareLanguage",
+    "What technical language do they use third most often?": "TertiarySoftwareLanguage",
+    "What software do they talk about using the most?": "SoftwareApp1",
+    "What software do they talk about using the second most?": "SoftwareApp2",
+    "What software do they talk about using the third most?": "SoftwareApp3",
+    "What software do they talk about using the fourth most?": "SoftwareApp4",
+    "What software do they talk about using the fifth most?": "SoftwareApp5",
+    "What physical hardware do they talk about using the most?": "Hardware1",
+    "What physical hardware do they talk about using the second most?": "Hardware2",
+    "What physical hardware do they talk about using the third most?": "Hardware3",
+    "What physical hardware do they talk about using the fourth most?": "Hardware4",
+    "What physical hardware do they talk about using the fifth most?": "Hardware5",
+    "Based on their skills, put them in a primary technical category": "PrimaryCategory",
+    "Based on their skills, put them in a subsidiary technical category": "SecondaryCategory",
+    "Types of projects they have worked on": "ProjectTypes",
+    # DISABLED to reduce output tokens
+    # "Based on their skills, categories, certifications, and industries, determine what they specialize in": "Specialty",
+    # "Based on all this knowledge, write a summary of this candidate that could be sellable to an employer": "Summary",
+    "How long have they lived in the United States(numerical answer only)": "LengthinUS",
+    "Total years of professional experience (numerical answer only)": "YearsofExperience",
+    "Average tenure at companies in years (numerical answer only)": "AvgTenure"
+}
+
+LABELED_LINE_PATTERN = re.compile(r'^[^\S\n]*([^:\n]*):(.*)$', re.MULTILINE)  # Label and raw value of each line with a colon
+
+def _parse_labeled_lines(response_text):
+    """
+    Collect the "Label: value" lines of a step 1 / step 2 response in one pass
+
+    Section headers (all-caps lines ending in a colon) are skipped, leading
+    dashes are stripped from labels and empty values become 'NULL'.
+    """
+    result = {}
+    for match in LABELED_LINE_PATTERN.finditer(response_text):
+        key, value = match.groups()
+        value = value.strip()
+        # The whole line ends in a colon only when the value does (or is empty)
+        if (not value or value[-1] == ':') and (key + value).isupper():
+            continue
+
+        # Normalize NULL values
+        if not value or value.upper() == 'NULL':
+            value = 'NULL'
+        result[key.strip('- \t')] = value
+
+    return result
+
 def parse_step1_response(response_text):
     """Parse the response from step 1"""
     # Log the raw response for debugging
@@ -383,121 +502,10 @@ def parse_step1_response(response_text):
     # Try direct extraction of all fields first
     direct_fields = extract_fields_directly(response_text)
     
-    result = {}
-    sections = {
-        "PERSONAL INFORMATION": [
-            "First Name", "Middle Name", "Last Name", "Street Address", "City", 
-            "State", "Phone Number 1", "Phone Number 2", "Email 1", "Email 2", 
-            "LinkedIn URL", "Bachelor's Degree", "Master's Degree", "Certifications"
-        ],
-        "JOB TITLES": [
-            "Primary Job Title", "Secondary Job Title", "Tertiary Job Title"
-        ],
-        "WORK HISTORY": [
-            "Most Recent Company", "Most Recent Start Date", "Most Recent End Date", "Most Recent Job Location",
-            "Second Most Recent Company", "Second Most Recent Start Date", "Second Most Recent End Date", "Second Most Recent Job Location",
-            "Third Most Recent Company", "Third Most Recent Start Date", "Third Most Recent End Date", "Third Most Recent Job Location",
-            "Fourth Most Recent Company", "Fourth Most Recent Start Date", "Fourth Most Recent End Date", "Fourth Most Recent Job Location",
-            "Fifth Most Recent Company", "Fifth Most Recent Start Date", "Fifth Most Recent End Date", "Fifth Most Recent Job Location",
-            "Sixth Most Recent Company", "Sixth Most Recent Start Date", "Sixth Most Recent End Date", "Sixth Most Recent Job Location",
-            "Seventh Most Recent Company", "Seventh Most Recent Start Date", "Seventh Most Recent End Date", "Seventh Most Recent Job Location"
-        ],
-        "INDUSTRY": [
-            "Primary Industry", "Secondary Industry"
-        ],
-        "SKILLS": [
-            "Top 10 Technical Skills"
-        ]
-    }
-    
-    lines = response_text.strip().split('\n')
-    current_section = None
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Check if this is a section header
-        if line.endswith(':') and line.isupper():
-            current_section = line[:-1]
-            continue
-            
-        # Parse key-value pair
-        if ':' in line:
-            parts = line.split(':', 1)
-            key = parts[0].strip('- \t')
-            value = parts[1].strip()
-            
-            # Normalize NULL values
-            if value.upper() == 'NULL' or value == '':
-                value = 'NULL'
-                
-            result[key] = value
-    
-    # Map to standard field names
-    field_mapping = {
-        "First Name": "FirstName",
-        "Middle Name": "MiddleName",
-        "Last Name": "LastName",
-        "Street Address": "Address",
-        "City": "City",
-        "State": "State", 
-        "Phone Number 1": "Phone1",
-        "Phone Number 2": "Phone2",
-        "Email 1": "Email",
-        "Email 2": "Email2",
-        "LinkedIn URL": "Linkedin",
-        "Bachelor's Degree": "Bachelors",
-        "Master's Degree": "Masters",
-        "Certifications": "Certifications",
-        "Primary Job Title": "PrimaryTitle",
-        "Secondary Job Title": "SecondaryTitle",
-        "Tertiary Job Title": "TertiaryTitle",
-        
-        # Add alternative phrasings that appear in the actual API response
-        "Best job title that fit their primary experience": "PrimaryTitle",
-        "Best secondary job title that fits their secondary experience": "SecondaryTitle", 
-        "Best tertiary job title that fits their tertiary experience": "TertiaryTitle",
-        
-        # Additional variations that might appear
-        "Best job title that fits their primary experience": "PrimaryTitle",
-        "Best job title fitting their primary experience": "PrimaryTitle",
-        "Most Recent Company": "MostRecentCompany",
-        "Most Recent Start Date": "MostRecentStartDate",
-        "Most Recent End Date": "MostRecentEndDate",
-        "Most Recent Job Location": "MostRecentLocation",
-        "Second Most Recent Company": "SecondMostRecentCompany",
-        "Second Most Recent Start Date": "SecondMostRecentStartDate",
-        "Second Most Recent End Date": "SecondMostRecentEndDate",
-        "Second Most Recent Job Location": "SecondMostRecentLocation",
-        "Third Most Recent Company": "ThirdMostRecentCompany",
-        "Third Most Recent Start Date": "ThirdMostRecentStartDate",
-        "Third Most Recent End Date": "ThirdMostRecentEndDate",
-        "Third Most Recent Job Location": "ThirdMostRecentLocation",
-        "Fourth Most Recent Company": "FourthMostRecentCompany",
-        "Fourth Most Recent Start Date": "FourthMostRecentStartDate",
-        "Fourth Most Recent End Date": "FourthMostRecentEndDate",
-        "Fourth Most Recent Job Location": "FourthMostRecentLocation",
-        "Fifth Most Recent Company": "FifthMostRecentCompany",
-        "Fifth Most Recent Start Date": "FifthMostRecentStartDate",
-        "Fifth Most Recent End Date": "FifthMostRecentEndDate",
-        "Fifth Most Recent Job Location": "FifthMostRecentLocation",
-        "Sixth Most Recent Company": "SixthMostRecentCompany",
-        "Sixth Most Recent Start Date": "SixthMostRecentStartDate",
-        "Sixth Most Recent End Date": "SixthMostRecentEndDate",
-        "Sixth Most Recent Job Location": "SixthMostRecentLocation",
-        "Seventh Most Recent Company": "SeventhMostRecentCompany",
-        "Seventh Most Recent Start Date": "SeventhMostRecentStartDate",
-        "Seventh Most Recent End Date": "SeventhMostRecentEndDate",
-        "Seventh Most Recent Job Location": "SeventhMostRecentLocation",
-        "Primary Industry": "PrimaryIndustry",
-        "Secondary Industry": "SecondaryIndustry",
-        "Top 10 Technical Skills": "Top10Skills"
-    }
+    result = _parse_labeled_lines(response_text)
     
     mapped_result = {}
-    for original_key, mapped_key in field_mapping.items():
+    for original_key, mapped_key in STEP1_FIELD_MAPPING.items():
         # Get the value, strip any whitespace, and handle NULL standardization
         value = result.get(original_key, "NULL")
         if isinstance(value, str):
@@ -513,7 +521,7 @@ def parse_step1_response(response_text):
     for field, value in direct_fields.items():
         if value and (mapped_result.get(field, "NULL") == "NULL"):
             mapped_result[field] = value
-            logging.info(f"Using directly extracted {field}: '{value}'")
+            logging.info("Using directly extracted %s: '%s'", field, value)
     
     # Verify titles were successfully extracted
     if mapped_result.get("PrimaryTitle", "NULL") == "NULL":
@@ -562,11 +570,140 @@ def parse_step1_response(response_text):
         
     return mapped_result
 
+# Direct-extraction patterns for step 2 fields, compiled once at import
+HARDWARE_SECTION_PATTERN = re.compile(r'(Hardware 1:.+?)(?=Based on their skills|$)', re.DOTALL)
+HARDWARE_ITEM_PATTERN = re.compile(r'Hardware (\d): (.+?)(?:\n|$)')
+
+# Q&A format hardware questions
+DIRECT_QA_HARDWARE_PATTERNS = [
+    (re.compile(r"(?:- )?What physical hardware do they talk about using the most\?:\s*(.+?)(?:\n|$)"), "Hardware1"),
+    (re.compile(r"(?:- )?What physical hardware do they talk about using the second most\?:\s*(.+?)(?:\n|$)"), "Hardware2"),
+    (re.compile(r"(?:- )?What physical hardware do they talk about using the third most\?:\s*(.+?)(?:\n|$)"), "Hardware3"),
+    (re.compile(r"(?:- )?What physical hardware do they talk about using the fourth most\?:\s*(.+?)(?:\n|$)"), "Hardware4"),
+    (re.compile(r"(?:- )?What physical hardware do they talk about using the fifth most\?:\s*(.+?)(?:\n|$)"), "Hardware5")
+]
+
+# Patterns for technical fields
+DIRECT_TECH_PATTERNS = _compile_patterns({
+    "PrimarySoftwareLanguage": [
+        r"What technical language do they use most often\?:\s*(.+)",
+        r"What programming language do they talk most about the most\?:\s*(.+)",
+        r"Primary technical language:\s*(.+)",
+        r"Most used programming language:\s*(.+)"
+    ],
+    "SecondarySoftwareLanguage": [
+        r"What technical language do they use second most often\?:\s*(.+)",
+        r"What programming language do they talk most about the second most\?:\s*(.+)",
+        r"Secondary technical language:\s*(.+)",
+        r"Second most used programming language:\s*(.+)"
+    ],
+    "TertiarySoftwareLanguage": [
+        r"What technical language do they use third most often\?:\s*(.+)",
+        r"What programming language do they talk most about the third the most\?:\s*(.+)",
+        r"Tertiary technical language:\s*(.+)",
+        r"Third most used programming language:\s*(.+)"
+    ],
+    "SoftwareApp1": [
+        r"(?:- )?What software do they talk about using the most\?:\s*(.+)",
+        r"Primary software application:\s*(.+)",
+        r"Most used software:\s*(.+)"
+    ],
+    "SoftwareApp2": [
+        r"(?:- )?What software do they talk about using the second most\?:\s*(.+)",
+        r"Secondary software application:\s*(.+)",
+        r"Second most used software:\s*(.+)"
+    ],
+    "SoftwareApp3": [
+        r"(?:- )?What software do they talk about using the third most\?:\s*(.+)",
+        r"Tertiary software application:\s*(.+)",
+        r"Third most used software:\s*(.+)"
+    ],
+    "SoftwareApp4": [
+        r"(?:- )?What software do they talk about using the fourth most\?:\s*(.+)",
+        r"Fourth software application:\s*(.+)",
+        r"Fourth most used software:\s*(.+)"
+    ],
+    "SoftwareApp5": [
+        r"(?:- )?What software do they talk about using the fifth most\?:\s*(.+)",
+        r"Fifth software application:\s*(.+)",
+        r"Fifth most used software:\s*(.+)"
+    ],
+    "Hardware1": [
+        r"What physical hardware do they talk about using the most\?:\s*(.+)",
+        r"Primary hardware:\s*(.+)",
+        r"Most used hardware:\s*(.+)",
+        r"Primary physical device:\s*(.+)",
+        r"Most common hardware device:\s*(.+)",
+        r"Hardware 1:\s*(.+)"
+    ],
+    "Hardware2": [
+        r"What physical hardware do they talk about using the second most\?:\s*(.+)",
+        r"Secondary hardware:\s*(.+)",
+        r"Second most used hardware:\s*(.+)",
+        r"Secondary physical device:\s*(.+)",
+        r"Second most common hardware device:\s*(.+)",
+        r"Hardware 2:\s*(.+)"
+    ],
+    "Hardware3": [
+        r"What physical hardware do they talk about using the third most\?:\s*(.+)",
+        r"Tertiary hardware:\s*(.+)",
+        r"Third most used hardware:\s*(.+)",
+        r"Tertiary physical device:\s*(.+)",
+        r"Third most common hardware device:\s*(.+)",
+        r"Hardware 3:\s*(.+)"
+    ],
+    "Hardware4": [
+        r"What physical hardware do they talk about using the fourth most\?:\s*(.+)",
+        r"Fourth hardware:\s*(.+)",
+        r"Fourth most used hardware:\s*(.+)",
+        r"Fourth physical device:\s*(.+)",
+        r"Fourth most common hardware device:\s*(.+)",
+        r"Hardware 4:\s*(.+)"
+    ],
+    "Hardware5": [
+        r"What physical hardware do they talk about using the fifth most\?:\s*(.+)",
+        r"Fifth hardware:\s*(.+)",
+        r"Fifth most used hardware:\s*(.+)",
+        r"Fifth physical device:\s*(.+)",
+        r"Fifth most common hardware device:\s*(.+)",
+        r"Hardware 5:\s*(.+)"
+    ],
+    "PrimaryCategory": [
+        r"Based on their skills, put them in a primary technical category:\s*(.+)"
+    ],
+    "SecondaryCategory": [
+        r"Based on their skills, put them in a subsidiary technical category:\s*(.+)",
+        r"Based on their skills, put them in a secondary technical category:\s*(.+)",
+        r"Secondary technical category:\s*(.+)",
+        r"subsidiary technical category:\s*(.+)",
+        r"Second technical category:\s*(.+)",
+        r"Second most relevant technical category:\s*(.+)"
+    ],
+    "ProjectTypes": [
+        r"Types of projects they have worked on:\s*(.+)"
+    ],
+    # DISABLED to reduce output tokens
+    # "Specialty": [
+    #     r"Based on their skills, categories, certifications, and industries, determine what they specialize in:\s*(.+)"
+    # ],
+    # "Summary": [
+    #     r"Based on all this knowledge, write a summary of this candidate that could be sellable to an employer:\s*(.+)",
+    #     r"Based on all this knowledge, write a summary of this candidate:\s*(.+)"
+    # ],
+    "LengthinUS": [
+        r"How long have they lived in the United States\(numerical answer only\):\s*(.+)"
+    ],
+    "YearsofExperience": [
+        r"Total years of professional experience \(numerical answer only\):\s*(.+)"
+    ],
+    "AvgTenure": [
+        r"Average tenure at companies in years \(numerical answer only\):\s*(.+)"
+    ]
+})
+
 # Custom version of parse_step2_response with updated field mappings for technical languages
 def extract_step2_fields_directly(response_text):
     """Extract step 2 fields directly using regex patterns"""
-    import re
-    
     # Dictionary to store extracted fields
     extracted = {}
     
@@ -574,13 +711,13 @@ def extract_step2_fields_directly(response_text):
     hardware_mentions = []
     
     # First try to extract hardware using the formatted pattern we requested
-    hardware_section_match = re.search(r'(Hardware 1:.+?)(?=Based on their skills|$)', response_text, re.DOTALL)
+    hardware_section_match = HARDWARE_SECTION_PATTERN.search(response_text)
     if hardware_section_match:
         hardware_section = hardware_section_match.group(1).strip()
-        logging.info(f"Found formatted hardware section: {hardware_section}")
+        logging.info("Found formatted hardware section: %s", hardware_section)
         
         # Extract individual hardware items
-        hardware_matches = re.findall(r'Hardware (\d): (.+?)(?:\n|$)', hardware_section)
+        hardware_matches = HARDWARE_ITEM_PATTERN.findall(hardware_section)
         for idx, value in hardware_matches:
             if idx.isdigit() and 1 <= int(idx) <= 5:
                 field_name = f"Hardware{idx}"
@@ -588,149 +725,22 @@ def extract_step2_fields_directly(response_text):
                 if clean_value.upper() != "NULL" and clean_value:
                     extracted[field_name] = clean_value
                     hardware_mentions.append(f"{field_name}: {clean_value}")
-                    logging.info(f"Direct extract (Step 2): Found {field_name} '{clean_value}' from formatted section")
+                    logging.info("Direct extract (Step 2): Found %s '%s' from formatted section", field_name, clean_value)
     
     # If we didn't find the formatted section, look for the common Q&A format
-    qa_hardware_patterns = [
-        (r"(?:- )?What physical hardware do they talk about using the most\?:\s*(.+?)(?:\n|$)", "Hardware1"),
-        (r"(?:- )?What physical hardware do they talk about using the second most\?:\s*(.+?)(?:\n|$)", "Hardware2"),
-        (r"(?:- )?What physical hardware do they talk about using the third most\?:\s*(.+?)(?:\n|$)", "Hardware3"),
-        (r"(?:- )?What physical hardware do they talk about using the fourth most\?:\s*(.+?)(?:\n|$)", "Hardware4"),
-        (r"(?:- )?What physical hardware do they talk about using the fifth most\?:\s*(.+?)(?:\n|$)", "Hardware5")
-    ]
-    
-    # Try to extract each hardware item using Q&A format
-    for pattern, field_name in qa_hardware_patterns:
-        match = re.search(pattern, response_text)
+    for pattern, field_name in DIRECT_QA_HARDWARE_PATTERNS:
+        match = pattern.search(response_text)
         if match:
             value = match.group(1).strip()
             if value.upper() != "NULL" and value != "":
                 extracted[field_name] = value
                 hardware_mentions.append(f"{field_name}: {value}")
-                logging.info(f"Direct extract (Step 2): Found {field_name} '{value}' from Q&A format")
-    
-    # Patterns for technical fields
-    tech_patterns = {
-        "PrimarySoftwareLanguage": [
-            r"What technical language do they use most often\?:\s*(.+)",
-            r"What programming language do they talk most about the most\?:\s*(.+)",
-            r"Primary technical language:\s*(.+)",
-            r"Most used programming language:\s*(.+)"
-        ],
-        "SecondarySoftwareLanguage": [
-            r"What technical language do they use second most often\?:\s*(.+)",
-            r"What programming language do they talk most about the second most\?:\s*(.+)",
-            r"Secondary technical language:\s*(.+)",
-            r"Second most used programming language:\s*(.+)"
-        ],
-        "TertiarySoftwareLanguage": [
-            r"What technical language do they use third most often\?:\s*(.+)",
-            r"What programming language do they talk most about the third the most\?:\s*(.+)",
-            r"Tertiary technical language:\s*(.+)",
-            r"Third most used programming language:\s*(.+)"
-        ],
-        "SoftwareApp1": [
-            r"(?:- )?What software do they talk about using the most\?:\s*(.+)",
-            r"Primary software application:\s*(.+)",
-            r"Most used software:\s*(.+)"
-        ],
-        "SoftwareApp2": [
-            r"(?:- )?What software do they talk about using the second most\?:\s*(.+)",
-            r"Secondary software application:\s*(.+)",
-            r"Second most used software:\s*(.+)"
-        ],
-        "SoftwareApp3": [
-            r"(?:- )?What software do they talk about using the third most\?:\s*(.+)",
-            r"Tertiary software application:\s*(.+)",
-            r"Third most used software:\s*(.+)"
-        ],
-        "SoftwareApp4": [
-            r"(?:- )?What software do they talk about using the fourth most\?:\s*(.+)",
-            r"Fourth software application:\s*(.+)",
-            r"Fourth most used software:\s*(.+)"
-        ],
-        "SoftwareApp5": [
-            r"(?:- )?What software do they talk about using the fifth most\?:\s*(.+)",
-            r"Fifth software application:\s*(.+)",
-            r"Fifth most used software:\s*(.+)"
-        ],
-        "Hardware1": [
-            r"What physical hardware do they talk about using the most\?:\s*(.+)",
-            r"Primary hardware:\s*(.+)",
-            r"Most used hardware:\s*(.+)",
-            r"Primary physical device:\s*(.+)",
-            r"Most common hardware device:\s*(.+)",
-            r"Hardware 1:\s*(.+)"
-        ],
-        "Hardware2": [
-            r"What physical hardware do they talk about using the second most\?:\s*(.+)",
-            r"Secondary hardware:\s*(.+)",
-            r"Second most used hardware:\s*(.+)",
-            r"Secondary physical device:\s*(.+)",
-            r"Second most common hardware device:\s*(.+)",
-            r"Hardware 2:\s*(.+)"
-        ],
-        "Hardware3": [
-            r"What physical hardware do they talk about using the third most\?:\s*(.+)",
-            r"Tertiary hardware:\s*(.+)",
-            r"Third most used hardware:\s*(.+)",
-            r"Tertiary physical device:\s*(.+)",
-            r"Third most common hardware device:\s*(.+)",
-            r"Hardware 3:\s*(.+)"
-        ],
-        "Hardware4": [
-            r"What physical hardware do they talk about using the fourth most\?:\s*(.+)",
-            r"Fourth hardware:\s*(.+)",
-            r"Fourth most used hardware:\s*(.+)",
-            r"Fourth physical device:\s*(.+)",
-            r"Fourth most common hardware device:\s*(.+)",
-            r"Hardware 4:\s*(.+)"
-        ],
-        "Hardware5": [
-            r"What physical hardware do they talk about using the fifth most\?:\s*(.+)",
-            r"Fifth hardware:\s*(.+)",
-            r"Fifth most used hardware:\s*(.+)",
-            r"Fifth physical device:\s*(.+)",
-            r"Fifth most common hardware device:\s*(.+)",
-            r"Hardware 5:\s*(.+)"
-        ],
-        "PrimaryCategory": [
-            r"Based on their skills, put them in a primary technical category:\s*(.+)"
-        ],
-        "SecondaryCategory": [
-            r"Based on their skills, put them in a subsidiary technical category:\s*(.+)",
-            r"Based on their skills, put them in a secondary technical category:\s*(.+)",
-            r"Secondary technical category:\s*(.+)",
-            r"subsidiary technical category:\s*(.+)",
-            r"Second technical category:\s*(.+)",
-            r"Second most relevant technical category:\s*(.+)"
-        ],
-        "ProjectTypes": [
-            r"Types of projects they have worked on:\s*(.+)"
-        ],
-        # DISABLED to reduce output tokens
-        # "Specialty": [
-        #     r"Based on their skills, categories, certifications, and industries, determine what they specialize in:\s*(.+)"
-        # ],
-        # "Summary": [
-        #     r"Based on all this knowledge, write a summary of this candidate that could be sellable to an employer:\s*(.+)",
-        #     r"Based on all this knowledge, write a summary of this candidate:\s*(.+)"
-        # ],
-        "LengthinUS": [
-            r"How long have they lived in the United States\(numerical answer only\):\s*(.+)"
-        ],
-        "YearsofExperience": [
-            r"Total years of professional experience \(numerical answer only\):\s*(.+)"
-        ],
-        "AvgTenure": [
-            r"Average tenure at companies in years \(numerical answer only\):\s*(.+)"
-        ]
-    }
+                logging.info("Direct extract (Step 2): Found %s '%s' from Q&A format", field_name, value)
     
     # Extract all technology fields
-    for field, patterns in tech_patterns.items():
+    for field, patterns in DIRECT_TECH_PATTERNS.items():
         for pattern in patterns:
-            match = re.search(pattern, response_text)
+            match = pattern.search(response_text)
             if match:
                 value = match.group(1).strip()
                 if value.upper() != "NULL" and value != "":
@@ -738,13 +748,13 @@ def extract_step2_fields_directly(response_text):
                     # Track hardware field extractions specifically
                     if field.startswith("Hardware"):
                         hardware_mentions.append(f"{field}: {value}")
-                    logging.info(f"Direct extract (Step 2): Found {field} '{value}'")
+                    logging.info("Direct extract (Step 2): Found %s '%s'", field, value)
                 break
     
     # Log hardware extraction stats
     if any(field.startswith("Hardware") for field in extracted.keys()):
-        logging.info(f"Hardware extraction successful: {len(hardware_mentions)} hardware fields found")
-        logging.info(f"Hardware mentions: {', '.join(hardware_mentions)}")
+        logging.info("Hardware extraction successful: %s hardware fields found", len(hardware_mentions))
+        logging.info("Hardware mentions: %s", ', '.join(hardware_mentions))
     
     return extracted
 
@@ -753,85 +763,10 @@ def parse_step2_response(response_text):
     # Try direct extraction first
     direct_fields = extract_step2_fields_directly(response_text)
     
-    result = {}
-    sections = {
-        "TECHNICAL SKILLS AND LANGUAGES": [
-            "Primary Technical Language", 
-            "Secondary Technical Language", "Tertiary Technical Language"
-        ],
-        "SOFTWARE AND HARDWARE": [
-            "Primary Software Application", "Secondary Software Application", 
-            "Tertiary Software Application", "Fourth Software Application",
-            "Fifth Software Application", "Primary Hardware", "Secondary Hardware",
-            "Tertiary Hardware", "Fourth Hardware", "Fifth Hardware"
-        ],
-        "TECHNICAL CATEGORIZATION": [
-            "Primary Technical Category", "Secondary Technical Category",
-            "Types of Projects", "Technical Specialization"
-        ],
-        "EXPERIENCE CALCULATIONS": [
-            "Years of Experience in United States", 
-            "Total Years of Professional Experience",
-            "Average Job Tenure in Years"
-        ],
-        "CANDIDATE SUMMARY": [
-            "Professional Summary"
-        ]
-    }
-    
-    lines = response_text.strip().split('\n')
-    current_section = None
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Check if this is a section header
-        if line.endswith(':') and line.isupper():
-            current_section = line[:-1]
-            continue
-            
-        # Parse key-value pair
-        if ':' in line:
-            parts = line.split(':', 1)
-            key = parts[0].strip('- \t')
-            value = parts[1].strip()
-            
-            # Normalize NULL values
-            if value.upper() == 'NULL' or value == '':
-                value = 'NULL'
-                
-            result[key] = value
-    
-    # Map to standard field names - updated to match exact prompt questions with new technical language fields
-    field_mapping = {
-        "What technical language do they use most often?": "PrimarySoftwareLanguage",
-        "What technical language do they use second most often?": "SecondarySoftwareLanguage",
-        "What technical language do they use third most often?": "TertiarySoftwareLanguage",
-        "What software do they talk about using the most?": "SoftwareApp1",
-        "What software do they talk about using the second most?": "SoftwareApp2",
-        "What software do they talk about using the third most?": "SoftwareApp3",
-        "What software do they talk about using the fourth most?": "SoftwareApp4",
-        "What software do they talk about using the fifth most?": "SoftwareApp5",
-        "What physical hardware do they talk about using the most?": "Hardware1",
-        "What physical hardware do they talk about using the second most?": "Hardware2",
-        "What physical hardware do they talk about using the third most?": "Hardware3",
-        "What physical hardware do they talk about using the fourth most?": "Hardware4",
-        "What physical hardware do they talk about using the fifth most?": "Hardware5",
-        "Based on their skills, put them in a primary technical category": "PrimaryCategory",
-        "Based on their skills, put them in a subsidiary technical category": "SecondaryCategory",
-        "Types of projects they have worked on": "ProjectTypes",
-        # DISABLED to reduce output tokens
-        # "Based on their skills, categories, certifications, and industries, determine what they specialize in": "Specialty",
-        # "Based on all this knowledge, write a summary of this candidate that could be sellable to an employer": "Summary",
-        "How long have they lived in the United States(numerical answer only)": "LengthinUS",
-        "Total years of professional experience (numerical answer only)": "YearsofExperience",
-        "Average tenure at companies in years (numerical answer only)": "AvgTenure"
-    }
+    result = _parse_labeled_lines(response_text)
     
     mapped_result = {}
-    for original_key, mapped_key in field_mapping.items():
+    for original_key, mapped_key in STEP2_FIELD_MAPPING.items():
         # Get the value, strip any whitespace, and handle NULL standardization
         value = result.get(original_key, "NULL")
         if isinstance(value, str):
@@ -844,7 +779,7 @@ def parse_step2_response(response_text):
     for field, value in direct_fields.items():
         if value and (mapped_result.get(field, "NULL") == "NULL"):
             mapped_result[field] = value
-            logging.info(f"Using directly extracted Step 2 field: {field} = '{value}'")
+            logging.info("Using directly extracted Step 2 field: %s = '%s'", field, value)
     
     # Verify category fields
     missing_categories = []
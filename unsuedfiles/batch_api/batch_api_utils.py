@@ -6,6 +6,7 @@ to operate independently without requiring files from the parent project.
 """
 
 import os
+import functools
 import logging
 import time
 import json
@@ -92,36 +93,65 @@ except ImportError:
     logging.warning(f"Could not import model from main project, using fallback: {DEFAULT_MODEL}")
 MAX_TOKENS = 16000
 DEFAULT_TEMPERATURE = 0
+RELEASE_CHUNK_SIZE = 2000  # Userids per UPDATE ... IN (...) in release_resume_batch (SQL Server allows 2100 parameters)
 
 # Token encoding
+@functools.lru_cache(maxsize=8)
+def get_token_encoding(encoding_name="cl100k_base"):
+    """Returns the tiktoken encoding for DEFAULT_MODEL, looked up once and cached."""
+    # Try to get encoding for the model first
+    try:
+        # Handle gpt-5 models by using gpt-4 encoding
+        model_for_encoding = DEFAULT_MODEL
+        if "gpt-5" in DEFAULT_MODEL.lower():
+            model_for_encoding = "gpt-4"  # Use gpt-4 encoding for gpt-5 models
+        return tiktoken.encoding_for_model(model_for_encoding)
+    except (KeyError, Exception):
+        # If that fails, use the explicit get_encoding method
+        return tiktoken.get_encoding(encoding_name)
+
 def num_tokens_from_string(string, encoding_name="cl100k_base"):
     """Returns the number of tokens in a text string."""
     try:
-        # Try to get encoding for the model first
-        try:
-            # Handle gpt-5 models by using gpt-4 encoding
-            model_for_encoding = DEFAULT_MODEL
-            if "gpt-5" in DEFAULT_MODEL.lower():
-                model_for_encoding = "gpt-4"  # Use gpt-4 encoding for gpt-5 models
-            encoding = tiktoken.encoding_for_model(model_for_encoding)
-        except (KeyError, Exception):
-            # If that fails, use the explicit get_encoding method
-            encoding = tiktoken.get_encoding(encoding_name)
-        
-        num_tokens = len(encoding.encode(string))
+        # Special tokens are counted as plain text, which also skips the special-token scan
+        num_tokens = len(get_token_encoding(encoding_name).encode(string, disallowed_special=()))
         return num_tokens
     except Exception as e:
         logging.error(f"Error counting tokens: {str(e)}")
         # Return an estimate if token counting fails (average 4 characters per token)
         return len(string) // 4
 
-def apply_token_truncation(messages, max_input_tokens=128000):  # Increased to 128K
-    """Truncates the messages if they exceed the token limit."""
+def count_tokens_batch(texts, encoding_name="cl100k_base"):
+    """Returns the number of tokens in each text string, encoding them all in one call.
+
+    tiktoken's encode_batch runs the encoder over a thread pool outside the GIL,
+    which is much faster than calling num_tokens_from_string in a loop.
+    """
+    texts = list(texts)
+    try:
+        encoding = get_token_encoding(encoding_name)
+        return [
+            len(tokens)
+            for tokens in encoding.encode_batch(texts, num_threads=os.cpu_count() or 1, disallowed_special=())
+        ]
+    except Exception as e:
+        logging.error(f"Error counting tokens: {str(e)}")
+        # Return estimates if token counting fails (average 4 characters per token)
+        return [len(text) // 4 for text in texts]
+
+def apply_token_truncation(messages, max_input_tokens=128000, token_counts=None):  # Increased to 128K
+    """Truncates the messages if they exceed the token limit.
+
+    token_counts can hold precomputed token counts for each message (as returned by
+    count_tokens_batch) so callers that already tokenized the messages don't pay for it twice.
+    """
     # Calculate current tokens
-    total_tokens = 0
-    for message in messages:
-        if isinstance(message, dict) and "content" in message:
-            total_tokens += num_tokens_from_string(message["content"])
+    if token_counts is None:
+        token_counts = count_tokens_batch(
+            message["content"] if isinstance(message, dict) and "content" in message else ""
+            for message in messages
+        )
+    total_tokens = sum(token_counts)
     
     # If under limit, return as is
     if total_tokens <= max_input_tokens:
@@ -132,7 +162,7 @@ def apply_token_truncation(messages, max_input_tokens=128000):  # Increased to 1
     for i, message in enumerate(truncated_messages):
         if message["role"] == "user" and "content" in message:
             # Calculate how many tokens to keep
-            user_tokens = num_tokens_from_string(message["content"])
+            user_tokens = token_counts[i]
             tokens_to_remove = total_tokens - max_input_tokens
             
             if tokens_to_remove >= user_tokens:
@@ -217,7 +247,7 @@ def get_resume_batch(batch_size=None):
             if cleaned_resume and len(str(cleaned_resume).strip()) > 0:
                 resume_batch.append((userid, cleaned_resume))
                 user_ids.append(userid)
-                logging.info(f"Added UserID {userid} to batch (resume length: {len(cleaned_resume)})")
+                logging.debug(f"Added UserID {userid} to batch (resume length: {len(cleaned_resume)})")
         
         if user_ids:
             logging.info(f"Found {len(user_ids)} valid resumes to process")
@@ -251,6 +281,59 @@ def get_resume_batch(batch_size=None):
             pass
         return []
 
+def release_resume_batch(userids):
+    """
+    Return resumes to the unprocessed pool by clearing their LastProcessed
+    
+    get_resume_batch marks every resume it returns as processed before any
+    request is built, so resumes that end up without a result (left out of a
+    full batch file, or missing from a multi-resume answer) must be released
+    here or they are never fetched again.
+    
+    Args:
+        userids: User IDs to release
+        
+    Returns:
+        Number of rows released
+    """
+    userids = list(userids)
+    if not userids:
+        return 0
+    
+    released = 0
+    conn = None
+    try:
+        conn_result = create_pyodbc_connection()
+        # Handle the tuple return from create_pyodbc_connection
+        if isinstance(conn_result, tuple):
+            conn, success, message = conn_result
+            if not success:
+                conn = None
+                logging.error(f"Failed to connect to database to release {len(userids)} resumes (first userids: {userids[:20]}): {message}")
+                return 0
+        else:
+            conn = conn_result
+        
+        cursor = conn.cursor()
+        for start in range(0, len(userids), RELEASE_CHUNK_SIZE):
+            chunk = userids[start:start + RELEASE_CHUNK_SIZE]
+            markers = ", ".join("?" * len(chunk))
+            cursor.execute(f"UPDATE dbo.aicandidate SET LastProcessed = NULL WHERE userid IN ({markers})", chunk)
+            released += cursor.rowcount
+        conn.commit()
+        cursor.close()
+        logging.info(f"Released {released} resumes back to the unprocessed pool")
+    except Exception as e:
+        logging.error(f"Error releasing {len(userids)} resumes (first userids: {userids[:20]}): {str(e)}")
+    finally:
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+    
+    return released
+
 def update_candidate_record_with_retry(userid, parsed_data, max_retries=3):
     """Update the aicandidate table with parsed resume data with deadlock retry logic"""
     # Define values that should be treated as null
@@ -536,10 +619,11 @@ def update_candidate_record_with_retry(userid, parsed_data, max_retries=3):
     logging.error(f"Failed to update record for UserID {userid} after {max_retries} retries due to deadlocks.")
     return False
 
-# Step 1 prompt creation function (simplified version of what's in two_step_prompts_taxonomy.py)
-def create_step1_prompt(resume_text, userid=None):
-    """Create a prompt for step 1 of resume processing (personal info extraction)"""
-    system_message = """You are an AI assistant specialized in resume parsing. Extract personal and work history information from the resume text provided by the user.
+# Static system messages for the step prompts, shared by every request
+# (apply_token_truncation only rewrites the user message, so these are never modified)
+STEP1_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": """You are an AI assistant specialized in resume parsing. Extract personal and work history information from the resume text provided by the user.
 Focus on:
 1. Name (First, Middle, Last)
 2. Contact info (Phone, Email, LinkedIn)
@@ -553,23 +637,11 @@ Focus on:
 
 Format your response as a structured JSON with these fields. If a field is not found in the resume, use "NULL" as the value.
 """
+}
 
-    # Create the user message with the resume
-    user_message = f"Please extract information from the following resume:\n\n{resume_text}"
-
-    # Build the messages array
-    messages = [
-        {"role": "system", "content": system_message},
-        {"role": "user", "content": user_message}
-    ]
-    
-    # Apply token truncation if needed
-    return apply_token_truncation(messages)
-
-# Step 2 prompt creation function (simplified version of what's in two_step_prompts_taxonomy.py)
-def create_step2_prompt(resume_text, step1_results, userid=None):
-    """Create a prompt for step 2 of resume processing (technical details extraction)"""
-    system_message = """You are an AI assistant specialized in technical resume analysis. Extract detailed technical information from the resume text provided by the user.
+STEP2_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": """You are an AI assistant specialized in technical resume analysis. Extract detailed technical information from the resume text provided by the user.
 Focus on:
 1. Programming languages (Primary, Secondary, Tertiary)
 2. Software applications (up to 5)
@@ -583,7 +655,26 @@ Focus on:
 
 Format your response as a structured JSON with these fields. If a field is not found in the resume, use "NULL" as the value.
 """
+}
+
+# Step 1 prompt creation function (simplified version of what's in two_step_prompts_taxonomy.py)
+def create_step1_prompt(resume_text, userid=None):
+    """Create a prompt for step 1 of resume processing (personal info extraction)"""
+    # Create the user message with the resume
+    user_message = f"Please extract information from the following resume:\n\n{resume_text}"
 
+    # Build the messages array
+    messages = [
+        STEP1_SYSTEM_MESSAGE,
+        {"role": "user", "content": user_message}
+    ]
+    
+    # Apply token truncation if needed
+    return apply_token_truncation(messages)
+
+# Step 2 prompt creation function (simplified version of what's in two_step_prompts_taxonomy.py)
+def create_step2_prompt(resume_text, step1_results, userid=None):
+    """Create a prompt for step 2 of resume processing (technical details extraction)"""
     # Create a user message that combines the resume and step 1 results
     step1_json = json.dumps(step1_results, indent=2)
     user_message = f"""I've already extracted basic information from this resume:
@@ -596,7 +687,7 @@ Now please extract detailed technical information from the following resume:
 
     # Build the messages array
     messages = [
-        {"role": "system", "content": system_message},
+        STEP2_SYSTEM_MESSAGE,
         {"role": "user", "content": user_message}
     ]
     
@@ -604,20 +695,35 @@ Now please extract detailed technical information from the following resume:
     return apply_token_truncation(messages)
 
 # Response parsing functions (simplified versions of what's in two_step_processor_taxonomy.py)
+JSON_DECODER = json.JSONDecoder()  # Shared decoder for pulling the first object out of a response
+
+def extract_json_object(response_text):
+    """
+    Decode the first JSON object in a response, ignoring any text around it
+    
+    raw_decode stops at the end of the object, so the response is scanned once
+    and no slice of it is copied.
+    
+    Returns:
+        The decoded object, or None if the response contains no '{'
+    
+    Raises:
+        json.JSONDecodeError: If the text starting at the first '{' is not valid JSON
+    """
+    start_idx = response_text.find('{')
+    if start_idx < 0:
+        return None
+    parsed, _end_idx = JSON_DECODER.raw_decode(response_text, start_idx)
+    return parsed
+
 def parse_step1_response(response_text):
     """Parse the LLM response from step 1 to extract structured data"""
     # Try to find and parse JSON from the response
     try:
-        # Find JSON content - look for everything between the first { and the last }
-        start_idx = response_text.find('{')
-        end_idx = response_text.rfind('}')
+        # Decode the JSON object starting at the first {
+        parsed_data = extract_json_object(response_text)
         
-        if start_idx >= 0 and end_idx > start_idx:
-            json_str = response_text[start_idx:end_idx+1]
-            
-            # Parse the JSON
-            parsed_data = json.loads(json_str)
-            
+        if parsed_data is not None:
             # Log the result
             logging.debug(f"Successfully parsed step 1 response: {len(parsed_data)} fields extracted")
             
@@ -636,16 +742,10 @@ def parse_step2_response(response_text):
     """Parse the LLM response from step 2 to extract structured data"""
     # Try to find and parse JSON from the response
     try:
-        # Find JSON content - look for everything between the first { and the last }
-        start_idx = response_text.find('{')
-        end_idx = response_text.rfind('}')
+        # Decode the JSON object starting at the first {
+        parsed_data = extract_json_object(response_text)
         
-        if start_idx >= 0 and end_idx > start_idx:
-            json_str = response_text[start_idx:end_idx+1]
-            
-            # Parse the JSON
-            parsed_data = json.loads(json_str)
-            
+        if parsed_data is not None:
             # Log the result
             logging.debug(f"Successfully parsed step 2 response: {len(parsed_data)} fields extracted")
             
@@ -12,6 +12,41 @@ import datetime
 from typing import Optional, Tuple, Dict, Union, List
 import logging
 
+# Date formats to try, in order, with confidence scores. Patterns are compiled once;
+# 'fields' gives the order of the numeric groups (y/m/d) so those dates can be built
+# directly, missing parts default to 1. Formats without fields go through strptime.
+DATE_FORMATS = [
+    # YYYY-MM-DD (highest confidence)
+    {'pattern': re.compile(r'^(\d{4})-(\d{2})-(\d{2})$'), 'format': '%Y-%m-%d', 'confidence': 1.0, 'fields': 'ymd'},
+    # MM/DD/YYYY
+    {'pattern': re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})$'), 'format': '%m/%d/%Y', 'confidence': 0.9, 'fields': 'mdy'},
+    # MMM YYYY (e.g., "Jan 2020")
+    {'pattern': re.compile(r'^[A-Za-z]{3,9}\s+\d{4}$'), 'format': '%b %Y', 'confidence': 0.7, 'fields': None},
+    # Month YYYY (e.g., "January 2020")
+    {'pattern': re.compile(r'^[A-Za-z]{3,9}\s+\d{4}$'), 'format': '%B %Y', 'confidence': 0.7, 'fields': None},
+    # YYYY-MM
+    {'pattern': re.compile(r'^(\d{4})-(\d{2})$'), 'format': '%Y-%m', 'confidence': 0.7, 'fields': 'ym'},
+    # MM/YYYY
+    {'pattern': re.compile(r'^(\d{1,2})/(\d{4})$'), 'format': '%m/%Y', 'confidence': 0.7, 'fields': 'my'},
+    # YYYY
+    {'pattern': re.compile(r'^(\d{4})$'), 'format': '%Y', 'confidence': 0.5, 'fields': 'y'}
+]
+
+def _build_numeric_date(fields: str, groups: Tuple[str, ...]) -> datetime.date:
+    """
+    Build a date from numeric regex groups
+
+    Args:
+        fields: Order of the groups, e.g. 'mdy' for MM/DD/YYYY
+        groups: The matched digit strings
+
+    Returns:
+        The date, with a missing month or day set to 1. Raises ValueError for
+        out-of-range values, the same as strptime would.
+    """
+    parts = dict(zip(fields, (int(group) for group in groups)))
+    return datetime.date(parts['y'], parts.get('m', 1), parts.get('d', 1))
+
 def parse_resume_date(date_string: str, allow_future: bool = False) -> Tuple[Optional[datetime.date], float, str]:
     """
     Parse a date string from a resume with confidence score
@@ -41,42 +76,17 @@ def parse_resume_date(date_string: str, allow_future: bool = False) -> Tuple[Opt
     # Get today's date for validation
     today = datetime.date.today()
     
-    # Try different date formats with confidence scores
-    formats_to_try = [
-        # YYYY-MM-DD (highest confidence)
-        {'pattern': r'^\d{4}-\d{2}-\d{2}$', 'format': '%Y-%m-%d', 'confidence': 1.0},
-        # MM/DD/YYYY
-        {'pattern': r'^\d{1,2}/\d{1,2}/\d{4}$', 'format': '%m/%d/%Y', 'confidence': 0.9},
-        # MMM YYYY (e.g., "Jan 2020")
-        {'pattern': r'^[A-Za-z]{3,9}\s+\d{4}$', 'format': '%b %Y', 'confidence': 0.7, 'day': 1},
-        # Month YYYY (e.g., "January 2020")
-        {'pattern': r'^[A-Za-z]{3,9}\s+\d{4}$', 'format': '%B %Y', 'confidence': 0.7, 'day': 1},
-        # YYYY-MM
-        {'pattern': r'^\d{4}-\d{2}$', 'format': '%Y-%m', 'confidence': 0.7, 'day': 1},
-        # MM/YYYY
-        {'pattern': r'^\d{1,2}/\d{4}$', 'format': '%m/%Y', 'confidence': 0.7, 'day': 1},
-        # YYYY
-        {'pattern': r'^\d{4}$', 'format': '%Y', 'confidence': 0.5, 'day': 1, 'month': 1}
-    ]
-    
-    for format_info in formats_to_try:
-        if re.match(format_info['pattern'], cleaned_string):
+    for format_info in DATE_FORMATS:
+        match = format_info['pattern'].match(cleaned_string)
+        if match:
             try:
-                # Handle incomplete dates (month or year only)
-                if 'day' in format_info:
-                    # For formats missing the day, we'll set it to the 1st
-                    if format_info['format'] == '%Y':
-                        # Year only
-                        date_obj = datetime.datetime.strptime(cleaned_string, format_info['format']).date()
-                        date_obj = date_obj.replace(month=format_info.get('month', date_obj.month), 
-                                                   day=format_info.get('day', date_obj.day))
-                    else:
-                        # Month and year
-                        date_obj = datetime.datetime.strptime(cleaned_string, format_info['format']).date()
-                        date_obj = date_obj.replace(day=format_info.get('day', date_obj.day))
+                if format_info['fields']:
+                    # Numeric formats: build the date straight from the matched groups
+                    date_obj = _build_numeric_date(format_info['fields'], match.groups())
                 else:
-                    # Complete date
+                    # Month name formats: let strptime resolve the name, then use the 1st of the month
                     date_obj = datetime.datetime.strptime(cleaned_string, format_info['format']).date()
+                    date_obj = date_obj.replace(day=1)
                 
                 # Validate the date (e.g., not in the future, unless allowed)
                 if not allow_future and date_obj > today:
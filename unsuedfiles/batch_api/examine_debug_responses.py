@@ -6,7 +6,6 @@ Examine the debug response JSON files in the debug_output directory
 import os
 import sys
 import json
-import glob
 import argparse
 import logging
 from datetime import datetime
@@ -24,8 +23,14 @@ logging.basicConfig(
 
 def find_debug_files(directory: str) -> List[str]:
     """Find all debug JSON files in the given directory"""
-    pattern = os.path.join(directory, "debug_*.json")
-    return glob.glob(pattern)
+    if not os.path.isdir(directory):
+        return []
+    with os.scandir(directory) as entries:
+        return [
+            entry.path for entry in entries
+            if entry.name.startswith("debug_") and entry.name.endswith(".json")
+            and entry.is_file(follow_symlinks=False)
+        ]
 
 def load_debug_file(file_path: str) -> Dict[str, Any]:
     """Load and parse a debug JSON file"""
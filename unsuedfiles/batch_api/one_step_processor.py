@@ -13,15 +13,28 @@ import time
 import logging
 import pyodbc
 import re
-import glob
 from typing import List, Dict, Tuple, Any, Optional
 from datetime import datetime, timedelta
-import tiktoken
-import uuid
+import secrets
+import random
+import functools
 import openai
 from dotenv import load_dotenv
+from tenacity import retry, wait_random_exponential, stop_after_attempt, retry_if_exception_type
 import argparse
 import sys
+import concurrent.futures
+import contextlib
+import multiprocessing
+import queue
+import threading
+import heapq
+
+# orjson is optional; fall back to the standard json module when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add parent directory to path so we can import from the main project
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,20 +45,24 @@ batch_api_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, batch_api_dir)
 
 # Import our robust db connection function
-from db_connection import create_pyodbc_connection
+from db_connection import create_pyodbc_connection, get_pooled_connection, release_connection
 
 # Import our standalone utilities without external dependencies
 from batch_api_utils import (
     DEFAULT_MODEL,
     get_resume_batch,
+    release_resume_batch,
     apply_token_truncation,
     num_tokens_from_string,
+    count_tokens_batch,
+    get_token_encoding,
+    extract_json_object,
     parse_step1_response,
     parse_step2_response
 )
 
 # Use the SAME update function as single_step_processor
-from resume_utils import update_candidate_record_with_retry
+from resume_utils import update_candidate_records_with_retry
 
 # Import our enhanced helper modules
 from skills_detector import get_taxonomy_context
@@ -55,7 +72,15 @@ from date_processor import process_resume_with_enhanced_dates
 # This ensures batch API produces identical results to regular processing
 from single_step_processor import (
     create_unified_prompt as original_create_unified_prompt,
-    parse_unified_response
+    parse_unified_response,
+    parse_unified_json_response,
+    extract_unified_json_fields,
+    UNIFIED_RESPONSE_FORMAT,
+    UNIFIED_BASE_INSTRUCTIONS,
+    UNIFIED_RULE_MESSAGES,
+    UNIFIED_TECH_MESSAGES,
+    UNIFIED_USER_CONTENT,
+    TAXONOMY_GUIDANCE
 )
 
 # Load environment variables
@@ -74,13 +99,94 @@ logging.basicConfig(
 # Set up OpenAI client with API key from environment
 api_key = os.getenv('OPENAI_API_KEY')
 openai.api_key = api_key
+openai.max_retries = 0  # call_openai_with_retry does the retrying; the client's own retries would multiply the attempts
 if not api_key:
     logging.error("API key is not set in the environment variables.")
 
 # Configuration
-BATCH_SIZE = 500  # Default batch size (can be overridden via command line)
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "50000"))  # Most resumes fetched per batch (can be overridden via command line or environment); fetching also stops once the batch file is full
+RESUME_FETCH_PAGE_SIZE = 1000  # Resumes fetched (and marked processed) per get_resume_batch call while filling a batch
+MAX_BATCH_REQUESTS = 50000  # OpenAI Batch API limit on requests per input file
+MAX_BATCH_FILE_BYTES = 180 * 1024 * 1024  # Stay safely under the 200 MB Batch API input file limit
 MODEL = DEFAULT_MODEL  # Use the same model as the main app
 BATCH_STATUS_TABLE = "aicandidateBatchStatus"  # Table to track batch processing status
+RESUME_FETCH_CHUNK_SIZE = 2000  # Userids per SELECT ... IN (...) when fetching resumes (SQL Server allows 2100 parameters)
+RESUMES_PER_REQUEST = int(os.getenv("RESUMES_PER_REQUEST", "1"))  # Resumes packed into one request (can be overridden via command line or environment, max 4)
+MAX_RESUMES_PER_REQUEST = 4  # Accuracy drops off when more resumes share one prompt
+RESENT_BATCHES_FILE = os.path.join(os.path.dirname(__file__), "resent_batches.txt")  # Batches whose missing multi-resume answers were already resent
+RESUME_MARKER = "===RESUME_{}==="  # Separates resumes and answer blocks in multi-resume requests
+RESUME_MARKER_PATTERN = re.compile(r'^[ \t]*===RESUME_(\d+)===[ \t]*$', re.MULTILINE)
+CODE_BLOCK_PATTERN = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')  # Markdown code blocks wrapped around model answers
+BARE_NULL_PATTERN = re.compile(r'\bNULL\b')  # Unquoted NULLs to quote before parsing JSON-like answers
+TECH_INDICATORS = (
+    "Software", "Developer", "Engineer", "DevOps", "AWS", "Azure",
+    "Cloud", "Docker", "Kubernetes", "Python", "Java", "C#", "JavaScript",
+    "SQL", "Database", "Programming", "Coding", "API", "Backend", "Frontend"
+)
+TECH_INDICATOR_PATTERN = re.compile('|'.join(map(re.escape, TECH_INDICATORS)))  # Any indicator as a case-sensitive substring, in one scan
+DEBUG_RESPONSE_NAME_PATTERN = re.compile(r'debug_response_([0-9]+)\.json')  # Debug files named after a user ID (fullmatch)
+DEBUG_FILE_PEEK_BYTES = 256  # Bytes read from a debug file to tell JSON-looking answers from text ones
+TECH_CONTENT_FIELDS = ("Summary", "PrimaryTitle", "SecondaryTitle", "TertiaryTitle")  # Fields recovery checks for technical content
+MAX_POLL_WORKERS = 8  # Batches checked in parallel while polling
+MAX_IN_FLIGHT_BATCHES = 5  # Batches submitted but not yet finished in continuous mode
+BATCH_LIST_LIMIT = 100  # Most recent batches fetched by the one list call per polling tick
+ACTIVE_BATCH_STATUSES = frozenset({"validating", "in_progress", "finalizing", "cancelling"})  # No output to fetch yet
+POLL_BACKOFF_FACTOR = 1.5  # Growth of the polling delay while nothing changes
+MAX_POLL_DELAY = 300  # Cap in seconds for the backed-off polling delay (never below check_interval)
+POLL_JITTER = 0.1  # Up to this fraction of the delay is added at random so pollers drift apart
+OPENAI_MAX_ATTEMPTS = 3  # Attempts per OpenAI call before a transient error is treated as a failure
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # Bytes per chunk when streaming batch output files
+DOWNLOAD_QUEUE_CHUNKS = 8  # Downloaded chunks buffered ahead of the parser
+DOWNLOAD_PUT_TIMEOUT = 1  # Seconds the reader waits on a full queue before checking whether the parser stopped
+PREP_WORKERS = os.cpu_count() or 1  # Workers building request lines in serialize_batch_requests
+PREP_USE_PROCESSES = os.getenv("PREP_USE_PROCESSES") == "1"  # Build request lines in worker processes instead of threads
+TEXT_PARSE_PROCESS_MIN = int(os.getenv("TEXT_PARSE_PROCESS_MIN", "2000"))  # Labeled-text answers per results file before parsing fans out to PREP_WORKERS processes
+EXACT_TOKEN_COUNT = os.getenv("EXACT_TOKEN_COUNT") == "1"  # Tokenize batch files for the log line; otherwise estimate 4 chars per token
+UPLOAD_FROM_MEMORY = True  # Upload batch input from memory while the local copy is written; False re-reads the file
+USE_STRUCTURED_OUTPUT = False  # Request JSON via UNIFIED_RESPONSE_FORMAT / MULTI_RESUME_RESPONSE_FORMAT
+BATCH_DISCOUNT = 0.5  # Batch API price as a fraction of the standard API price
+
+# Standard API price per token for the batch cost estimate
+MODEL_PRICING = {
+    # GPT-4 models
+    "gpt-4": {"input": 0.00003, "output": 0.00006},  # $30/M input, $60/M output
+    "gpt-4-32k": {"input": 0.00006, "output": 0.00012},  # $60/M input, $120/M output
+    "gpt-4-turbo": {"input": 0.00001, "output": 0.00003},  # $10/M input, $30/M output
+    "gpt-4o": {"input": 0.00001, "output": 0.00003},  # $10/M input, $30/M output
+    
+    # GPT-4 mini/micro models
+    "gpt-4o-mini": {"input": 0.000000075, "output": 0.0000003},  # $0.075/M input, $0.30/M output
+    "gpt-4o-mini-2024-07-18": {"input": 0.000000075, "output": 0.0000003},  # $0.075/M input, $0.30/M output
+    
+    # Fallback to default pricing
+    "default": {"input": 0.000000075, "output": 0.0000003}  # Default to gpt-4o-mini pricing
+}
+
+# response_format for multi-resume requests: one unified object per resume, tagged with its marker number
+_UNIFIED_SCHEMA = UNIFIED_RESPONSE_FORMAT["json_schema"]["schema"]
+MULTI_RESUME_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "resumes",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"resume": {"type": "integer"}, **_UNIFIED_SCHEMA["properties"]},
+                        "required": ["resume", *_UNIFIED_SCHEMA["required"]],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["results"],
+            "additionalProperties": False
+        }
+    }
+}
 
 # Wrapper to use the SAME unified prompt as single_step_processor for consistency
 def create_unified_prompt(resume_text, userid=None):
@@ -98,408 +204,162 @@ def create_unified_prompt(resume_text, userid=None):
     # Use the original create_unified_prompt from single_step_processor
     return original_create_unified_prompt(resume_text, userid)
 
-# ALL OLD PROMPT CODE HAS BEEN REMOVED - WE NOW USE single_step_processor's EXACT PROMPTS
+def create_multi_resume_prompt(resumes: List[Tuple[int, str]], structured: bool = False) -> List[Dict]:
+    """
+    Build one prompt that asks for answers to several resumes at once
 
-def count_tokens(content: str) -> int:
-    """Count the number of tokens in a string"""
-    try:
-        # Use tiktoken to count tokens
-        import tiktoken
-        encoding = tiktoken.encoding_for_model("gpt-4")
-        return len(encoding.encode(content))
-    except Exception:
-        # Fallback to character-based estimation
-        return len(content) // 4
+    Uses the same rule messages as single_step_processor so the shared system
+    prompt is only sent (and billed) once per group instead of once per resume.
+    The model is asked to return one answer block per resume, each starting
+    with its RESUME_MARKER line, or with structured=True one entry per resume
+    in the results array of MULTI_RESUME_RESPONSE_FORMAT.
 
-def setup_batch_status_table(): YYYY-MM-DD if full date is known, YYYY-MM if only month/year, or YYYY if only year is known. For current positions, use 'Present' as the end date. If a date is completely unknown, output NULL.\n"
-                       "When identifying skills, software languages, applications, and hardware, prioritize accuracy over standardization. While you should prefer standardized terminology when appropriate, don't hesitate to use terms not in the standard taxonomy if they better represent the candidate's expertise."
-        },
-        {
-            "role": "system",
-            "content": f"BACKGROUND INFORMATION:\n\n"
-                       f"You are analyzing a professional resume for the first time in this conversation.\n"
-                       f"Focus on understanding the candidate's complete professional profile including their technical and non-technical capabilities.\n"
-                       f"For technical candidates, pay close attention to languages, frameworks, hardware, and project types.\n"
-                       f"For non-technical candidates, focus on business skills, functions performed, and transferable skills.\n"
-                       f"Always provide a professional category for every candidate - never return NULL for categories."
-        },
-        {
-            "role": "system",
-            "content": f"SKILLS TAXONOMY INTERPRETATION GUIDANCE:\n"
-                       f"The skills taxonomy provides standardized categorization of technical skills for this resume.\n"
-                       f"Use this taxonomy to guide your analysis of programming languages, software applications, and hardware.\n"
-                       f"When identifying skills, prefer terminology from the appropriate taxonomy categories, but don't hesitate to use different terms when they better represent the candidate's expertise.\n"
-                       f"Align your responses with the skill categories most relevant to this candidate's profile.\n"
-                       f"For software languages, applications, and hardware, use the taxonomy as a reference but feel empowered to include technologies that aren't listed if they are clearly important to the candidate's profile.\n"
-                       f"Example: If the taxonomy lists 'Java' but the resume shows extensive React.js experience, it's appropriate to list React.js even if it's not in the taxonomy.\n"
-                       f"Balance standardization with accuracy - prioritize capturing the candidate's true expertise over strict adherence to the taxonomy.\n"
-                       f"IMPORTANT: You MUST provide BOTH a Primary AND Secondary technical category. These must be different from each other. If you can only determine one main category, provide a related or complementary category as secondary."
-        },
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing Primary and Secondary Industry:"
-                       "You are required to give the user the requested information using the following rules."
-                       "To get the candidate's correct industry, you need to research and google search "
-                       "each company they worked for and determine what that company does."
-                       "Industry should be defined based on the clients they have worked for."
-                       "Information Technology is not an industry and should not be an answer."
-                       "IMPORTANT: You MUST provide BOTH a Primary AND Secondary Industry. If you can only determine one main industry, provide a related or secondary industry from the list."
-                       "Primary and Secondary Industry are required to come from this list and be based on the companies "
-                       "they have worked for:"
-                       "Agriculture, Amusement, Gambling, and Recreation Industries, Animal Production, Arts, "
-                       "Entertainment, and Recreation, Broadcasting, Clothing, Construction, Data Processing, "
-                       "Hosting, and Related Services, Education, Financial Services, Insurance, Fishing, "
-                       "Hunting and Trapping, Food Manufacturing, Food Services, Retail, Forestry and Logging, "
-                       "Funds, Trusts, and Other Financial Vehicles, Furniture and Home Furnishings Stores, "
-                       "Furniture and Related Product Manufacturing, Oil and Gas, HealthCare, Civil Engineering, "
-                       "Hospitals, Leisure and Hospitality, Machinery, Manufacturing, Merchant Wholesalers, "
-                       "Mining, Motion Picture, Motor Vehicle and Parts Dealers, Natural Resources, Nursing, "
-                       "Public Administration, Paper Manufacturing, Performing Arts, Spectator Sports, "
-                       "and Related Industries, Primary Metal Manufacturing, Chemistry and Biology, Publishing, "
-                       "Rail Transportation, Real Estate, Retail Trade, Transportation, Securities, "
-                       "Commodity Contracts, and Other Financial Investments and Related Activities, "
-                       "Supply Chain, Telecommunications, Textiles, Transportation, Utilities, Warehousing and "
-                       "Storage, Waste Management."
-        },
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing Job Titles:"
-                       "Definition: Job Titles are what others call this person in the professional space."
-                       "Ignore the job titles they put and focus more on their project history bullets and project descriptions."
-                       "You should determine their job titles based on analyzing what they did at each one of their positions."
-                       "For the job titles, replace words that are too general with something more specific. "
-                       "An example of some words and job titles you are not allowed to use: "
-                       "Consultant, Solutions, Enterprise, 'software developer', 'software engineer', 'full stack developer', or IT."
-                       "For job title, use a different title for primary, secondary, and tertiary."
-                       "All three job titles must have an answer."
-                       "Each title must be different from each other."
-        },
-        {
-            "role": "system",
-            "content": "Use the following rules when filling out MostRecentCompany, SecondMostRecentCompany, ThirdMostRecentCompany, FourthMostRecentCompany, FifthMostRecentCompany, SixthMostRecentCompany, SeventhMostRecentCompany:"
-                       "Don't include the city or state in the company name."
-                       "Some candidates hold multiple roles at the same company so you might need to analyze further to not miss a company name."
-        },
-        {
-            "role": "system",
-            "content": "Use the following rules when finding company locations:"
-                       "1. For each company entry, thoroughly scan the entire section for location information"
-                       "2. Look anywhere in the job entry for city or state mentions, including:"
-                       "   - Next to company name"
-                       "   - In the job header"
-                       "   - Within first few lines of the job description"
-                       "   - Near dates or titles"
-                       "3. When you find a location, format it ONLY as:"
-                       "   - City, ST (if you find both)"
-                       "   - ST (if you only find state)"
-                       "4. Always convert full state names to 2-letter abbreviations"
-                       "5. Strip out any extra information (zip codes, countries, etc.)"
-                       "6. Use NULL only if you truly cannot find any location information in that job entry"
-                       "IMPORTANT: Be thorough - check the entire job section before deciding there's no location."
-        },
-        {
-            "role": "system",
-            "content": "Abbreviate the state if it is not already done so."
-                       "When needing to do a list, separate by commas."
-                       "If there is no last name or the last name is one letter, look in their email for their last name."
-        },
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing Skills, and refer to industry standards:"
-                       "Definition: Skills are a list of keywords from the resume that repeat and are consistent "
-                       "throughout their project work."
-                       "Skills should be 2 words max."
-                       "Prioritize skills that match standard industry categories that are most relevant to this resume."
-                       "After listing the 10 skills, re-analyze the 10 skills chosen, combine like skills "
-                       "together and do not repeat the same skill word multiple times. Then, if you have less "
-                       "than 10 skills, find more skills to add."
-        },
-        {
-            "role": "user",
-            "content": "- Please analyze the following resume and give me the following details(If you can't find an answer or it's not provided/listed, just put NULL):"
-                       "- Best job title that fit their primary experience:\n"
-                       "- Best secondary job title that fits their secondary experience(Must differ from Primary):\n"
-                       "- Best tertiary job title that fits their tertiary experience(Must differ from Primary and Secondary):\n"
-                       "- Their street address:\n"
-                       "- Their City:\n"
-                       "- Their State:\n"
-                       "- Their Certifications Listed:\n"
-                       "- Their Bachelor's Degree:\n"
-                       "- Their Master's Degree:\n"
-                       "- Their Phone Number:\n"
-                       "- Their Second Phone Number:\n"
-                       "- Their Email:\n"
-                       "- Their Second Email:\n"
-                       "- Their First Name:\n"
-                       "- Their Middle Name:\n"
-                       "- Their Last Name:\n"
-                       "- Their Linkedin URL:\n"
-                       "- Most Recent Company Worked for:\n"
-                       "- Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Most Recent Job Location:\n"
-                       "- Second Most Recent Company Worked for:\n"
-                       "- Second Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Second Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Second Most Recent Job Location:\n"
-                       "- Third Most Recent Company Worked for:\n"
-                       "- Third Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Third Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Third Most Recent Job Location:\n"
-                       "- Fourth Most Recent Company Worked for:\n"
-                       "- Fourth Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Fourth Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Fourth Most Recent Job Location:\n"
-                       "- Fifth Most Recent Company Worked for:\n"
-                       "- Fifth Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Fifth Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Fifth Most Recent Job Location:\n"
-                       "- Sixth Most Recent Company Worked for:\n"
-                       "- Sixth Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Sixth Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Sixth Most Recent Job Location:\n"
-                       "- Seventh Most Recent Company Worked for:\n"
-                       "- Seventh Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Seventh Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Seventh Most Recent Job Location:\n"
-                       "- Based on all 7 of their most recent companies above, what is the Primary industry they work in:\n"
-                       "- Based on all 7 of their most recent companies above, what is the Secondary industry they work in:\n"
-                       "- Top 10 Technical Skills:"
-        },
-        {
-            "role": "user",
-            "content": "- Please return the answer in this exact structure(If you can't find an answer or it's not provided/listed, just put NULL):"
-                       "- Best job title that fit their primary experience:\n"
-                       "- Best secondary job title that fits their secondary experience:\n"
-                       "- Best tertiary job title that fits their tertiary experience:\n"
-                       "- Their street address:\n"
-                       "- Their City:\n"
-                       "- Their State:\n"
-                       "- Their Certifications Listed:\n"
-                       "- Their Bachelor's Degree:\n"
-                       "- Their Master's Degree:\n"
-                       "- Their Phone Number:\n"
-                       "- Their Second Phone Number:\n"
-                       "- Their Email:\n"
-                       "- Their Second Email:\n"
-                       "- Their First Name:\n"
-                       "- Their Middle Name:\n"
-                       "- Their Last Name:\n"
-                       "- Their Linkedin URL:\n"
-                       "- Most Recent Company Worked for:\n"
-                       "- Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Most Recent Job Location:\n"
-                       "- Second Most Recent Company Worked for:\n"
-                       "- Second Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Second Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Second Most Recent Job Location:\n"
-                       "- Third Most Recent Company Worked for:\n"
-                       "- Third Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Third Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Third Most Recent Job Location:\n"
-                       "- Fourth Most Recent Company Worked for:\n"
-                       "- Fourth Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Fourth Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Fourth Most Recent Job Location:\n"
-                       "- Fifth Most Recent Company Worked for:\n"
-                       "- Fifth Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Fifth Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Fifth Most Recent Job Location:\n"
-                       "- Sixth Most Recent Company Worked for:\n"
-                       "- Sixth Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Sixth Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Sixth Most Recent Job Location:\n"
-                       "- Seventh Most Recent Company Worked for:\n"
-                       "- Seventh Most Recent Start Date (YYYY-MM-DD):\n"
-                       "- Seventh Most Recent End Date (YYYY-MM-DD):\n"
-                       "- Seventh Most Recent Job Location:\n"
-                       "- Based on all 7 of their most recent companies above, what is the Primary industry they work in:\n"
-                       "- Based on all 7 of their most recent companies above, what is the Secondary industry they work in:\n"
-                       "- Top 10 Technical Skills:"
-        }
-    ]
-    
-    # Step 2 prompt messages - complete version from two_step_prompts_taxonomy.py with all system messages
-    step2_messages = [
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing Primary, Secondary, and Tertiary Technical Languages: "
-                       "Include ALL types of technical languages mentioned in the resume, such as:"
-                       "- Database languages (SQL, T-SQL, PL/SQL, MySQL, Oracle SQL, PostgreSQL)"
-                       "- Programming languages (Java, Python, C#, JavaScript, Ruby)"
-                       "- Scripting languages (PowerShell, Bash, Shell, VBA)"
-                       "- Query languages (SPARQL, GraphQL, HiveQL)"
-                       "- Markup/stylesheet languages (HTML, CSS, XML)"
-                       "- There are more but these are just a few examples. You don't have to stick to just the above list"
-                       "Prioritize languages based on:"
-                       "1. Frequency of mention throughout work history and resume"
-                       "2. Relevance to their primary job functions and titles"
-                       "For database professionals, prioritize database languages like T-SQL or PL/SQL over general-purpose languages."
-        },
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing Most used Software Applications: "
-                       "Please only list out actual software applications"
-                       "It can be any kind of software in any industry used for anything. The goal is to list out any software they could easily use again at another job"
-                       "Analyze their resume and determine what software they use most"
-                       "If none can be found put NULL"
-        },
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing Hardware: "
-                       "Please list 5 different specific hardware devices the candidate has worked with. "
-                       "Hardware devices include many categories such as:\n"
-                       "- Network equipment (firewalls, routers, switches, load balancers)\n"
-                       "- Server hardware (blade servers, rack servers, chassis systems)\n"
-                       "- Storage devices (SANs, NAS, RAID arrays, disk systems)\n"
-                       "- Security appliances (TACALANEs, hardware encryption devices)\n"
-                       "- Management interfaces (iDRAC, iLO, IMM, IPMI, BMC)\n"
-                       "- Virtualization hardware (ESXi hosts, hyperconverged systems)\n"
-                       "- Physical components (CPUs, RAM modules, hard drives, SSDs)\n"
-                       "- Communication hardware (modems, wireless access points, VPN concentrators)\n"
-                       "- Specialized hardware (tape libraries, KVM switches, console servers)\n\n"
-                       "IMPORTANT: Even if they worked with multiple hardware items from the same brand, list different types. "
-                       "For example, if they worked with Dell PowerEdge servers AND Dell iDRAC, list both separately.\n\n"
-                       "Look beyond obvious hardware to find specialized equipment, management interfaces, and components. "
-                       "Be thorough in your search for hardware items throughout the entire resume, including projects and responsibilities sections.\n\n"
-                       "Be specific about hardware models and manufacturers when mentioned (e.g. 'Palo Alto PA-5200 series' rather than just 'firewalls'). "
-                       "Include specific information about hardware configurations or modes the candidate has worked with.\n\n"
-                       "Please provide each hardware item on a separate line in this exact format:\n"
-                       "Hardware 1: [Specific hardware device]\n"
-                       "Hardware 2: [Specific hardware device]\n"
-                       "Hardware 3: [Specific hardware device]\n"
-                       "Hardware 4: [Specific hardware device]\n"
-                       "Hardware 5: [Specific hardware device]\n\n"
-                       "Try your best to identify 5 different hardware items. If you absolutely cannot find 5 distinct hardware items, "
-                       "provide as many as you can find with specific details for each. Only use NULL if no hardware at all is mentioned."
-        },
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing Project Types: "
-                       "Use a mix of words like but not limited to implementation, "
-                       "integration, migration, move, deployment, optimization, consolidation and make it 2-3 words."
-        },
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing their Specialty:"
-                       "For their specialty, emphasize the project types they have done and relate them to "
-                       "their industry."
-        },
-        {
-            "role": "system",
-            "content": "Use the following rules when assessing their Category:"
-                       "For candidates with technical skills, use technical categories like Software Development, Database Administration, Network Engineering, etc."
-                       "For non-technical candidates, use functional/business categories like Business Administration, Finance, Marketing, Customer Service, etc."
-                       "For the categories, do not repeat the same category."
-                       "Both primary and secondary categories MUST have an answer - NEVER return NULL!"
-                       "Every candidate fits into at least one professional category, even if not a technical one."
-        },
-        {
-            "role": "system",
-            "content": "Use the following rules when writing their summary:"
-                       "For their summary, give a brief summary of their resume in a few sentences"
-                       "Based on their project types, industry, and specialty, skills, degrees, certifications, and job titles, write the summary"
-        },
+    Args:
+        resumes: List of (userid, resume_text) tuples, at most MAX_RESUMES_PER_REQUEST
+        structured: Whether the request uses MULTI_RESUME_RESPONSE_FORMAT
+
+    Returns:
+        A list of messages for the chat completion API
+    """
+    resume_sections = []
+    taxonomy_sections = []
+    for index, (userid, resume_text) in enumerate(resumes, 1):
+        marker = RESUME_MARKER.format(index)
+        resume_sections.append(f"{marker}\n{resume_text}\n")
+        taxonomy_context = get_taxonomy_context(resume_text, max_categories=3, userid=userid)
+        taxonomy_sections.append(f"{marker}\n{taxonomy_context}\n")
+
+    count = len(resumes)
+    if structured:
+        answer_format = (f"Return one entry per resume in the results array, setting \"resume\" to the "
+                         f"number in its marker (1-{count}), and never mix answers between resumes.")
+    else:
+        markers = ", ".join(RESUME_MARKER.format(i) for i in range(1, count + 1))
+        answer_format = (f"Start each block with its marker on a line by itself ({markers}) and never mix "
+                         f"answers between resumes.")
+
+    return [
         {
             "role": "system",
-            "content": "Use the following rules when determining length in US:"
-                       "Calculate how many years they have been WORKING in the United States based on their employment history. "
-                       "Only count years where they had jobs at US-based companies or locations. "
-                       "If all their work experience is in the US, this should equal their total years of professional experience. "
-                       "If they have no international work experience visible, assume all work was in the US. "
-                       "This is about PROFESSIONAL WORK TIME, not their entire life or education duration. "
-                       "Just put a number and no other characters. "
-                       "Result should not exceed their total years of professional experience. "
-                       "Result should only be numerical"
+            "content": f"Based on these {count} resumes, give the user the information they need for each one. "
+                       f"Each resume starts with its own marker line.\n{''.join(resume_sections)}{UNIFIED_BASE_INSTRUCTIONS}"
         },
+        *UNIFIED_RULE_MESSAGES,
         {
             "role": "system",
-            "content": "Use the following rules when determining Average Tenure and Year of Experience:"
-                       "Use all previous start date and end date questions answers to determine this."
-                       "Just put a number and no other characters"
-                       "Result should not be 0"
-                       "Result should only be numerical"
-        },
-        {
-            "role": "user",
-            "content": "- Please analyze the following resume and give me the following details(If you can't find an answer or it's not provided/listed, just put NULL):"
-                       "- What technical language do they use most often?:\n"
-                       "- What technical language do they use second most often?:\n"
-                       "- What technical language do they use third most often?:\n"
-                       "- What software do they talk about using the most?:\n"
-                       "- What software do they talk about using the second most?:\n"
-                       "- What software do they talk about using the third most?:\n"
-                       "- What software do they talk about using the fourth most?:\n"
-                       "- What software do they talk about using the fifth most?:\n"
-                       "- What physical hardware do they talk about using the most?:\n"
-                       "- What physical hardware do they talk about using the second most?:\n"
-                       "- What physical hardware do they talk about using the third most?:\n"
-                       "- What physical hardware do they talk about using the fourth most?:\n"
-                       "- What physical hardware do they talk about using the fifth most?:\n"
-                       "- Based on their experience, put them in a primary technical category if they are technical or functional category if they are functional:\n"
-                       "- Based on their experience, put them in a subsidiary technical category if they are technical or functional category if they are functional:\n"
-                       "- Types of projects they have worked on:\n"
-                       "- Based on their skills, categories, certifications, and industries, determine what they specialize in:\n"
-                       "- Based on all this knowledge, write a summary of this candidate that could be sellable to an employer:\n"
-                       "- How long have they lived in the United States(numerical answer only):\n"
-                       "- Total years of professional experience (numerical answer only):\n"
-                       "- Average tenure at companies in years (numerical answer only):"
+            "content": "".join(taxonomy_sections + [TAXONOMY_GUIDANCE])
         },
+        *UNIFIED_TECH_MESSAGES,
         {
             "role": "user",
-            "content": "- Please return the answer in this exact structure(If you can't find an answer or it's not provided/listed, just put NULL):"
-                       "- What technical language do they use most often?:\n"
-                       "- What technical language do they use second most often?:\n"
-                       "- What technical language do they use third most often?:\n"
-                       "- What software do they talk about using the most?:\n"
-                       "- What software do they talk about using the second most?:\n"
-                       "- What software do they talk about using the third most?:\n"
-                       "- What software do they talk about using the fourth most?:\n"
-                       "- What software do they talk about using the fifth most?:\n"
-                       "- What physical hardware do they talk about using the most?:\n"
-                       "- What physical hardware do they talk about using the second most?:\n"
-                       "- What physical hardware do they talk about using the third most?:\n"
-                       "- What physical hardware do they talk about using the fourth most?:\n"
-                       "- What physical hardware do they talk about using the fifth most?:\n"
-                       "- Based on their experience, put them in a primary technical category if they are technical or functional category if they are functional:\n"
-                       "- Based on their experience, put them in a subsidiary technical category if they are technical or functional category if they are functional:\n"
-                       "- Types of projects they have worked on:\n"
-                       "- Based on their skills, categories, certifications, and industries, determine what they specialize in:\n"
-                       "- Based on all this knowledge, write a summary of this candidate that could be sellable to an employer:\n"
-                       "- How long have they lived in the United States(numerical answer only):\n"
-                       "- Total years of professional experience (numerical answer only):\n"
-                       "- Average tenure at companies in years (numerical answer only):"
+            "content": f"Analyze each of the {count} resumes separately and return {count} answers in order. "
+                       f"{answer_format}\n\n{UNIFIED_USER_CONTENT}"
         }
     ]
-    
-    # Get taxonomy context from skills detector
-    taxonomy_context = get_taxonomy_context(resume_text, max_categories=2, userid=userid)
-    
-    # If we have taxonomy context, add it to the system message for enhanced processing
-    if taxonomy_context:
-        # Add taxonomy context to the first system message
-        for i, msg in enumerate(step1_messages):
-            if msg["role"] == "system":
-                step1_messages[i]["content"] += "\n\n" + taxonomy_context
-                logging.info(f"UserID {userid}: Added taxonomy context to prompt")
-                break
-                
-    # Combine all messages exactly as in the original two_step_prompts_taxonomy.py
-    messages = step1_messages
-    
-    # Only add step 2 messages without any intermediate instruction or system message
-    messages.extend(step2_messages)
+
+def split_multi_resume_content(content: str, userids: List[int]) -> Dict[int, str]:
+    """
+    Split a multi-resume answer into one text block per userid
+
+    Args:
+        content: The model response for a multi-resume request
+        userids: The userids in the order they were packed into the request
+
+    Returns:
+        Dictionary mapping userids to their answer block. Userids whose block
+        is missing are left out; check_and_process_batch resends them as
+        single-resume requests.
+    """
+    matches = list(RESUME_MARKER_PATTERN.finditer(content))
+    blocks = {}
+    for i, match in enumerate(matches):
+        index = int(match.group(1))
+        if not 1 <= index <= len(userids):
+            continue
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        block = content[match.end():end].strip()
+        if block:
+            blocks[userids[index - 1]] = block
+
+    missing = [userid for userid in userids if userid not in blocks]
+    if missing:
+        logging.warning(f"Multi-resume answer missing blocks for UserIDs {missing}; they will be resent as single-resume requests")
+
+    return blocks
+
+def largest_code_block(text: str) -> Optional[str]:
+    """Return the largest markdown code block in text (assumed the most complete), or None"""
+    largest = None
+    for match in CODE_BLOCK_PATTERN.finditer(text):
+        block = match.group(1)
+        if largest is None or len(block) > len(largest):
+            largest = block
+    return largest
+
+def split_multi_resume_json(content: str, userids: List[int]) -> Optional[Dict[int, Dict]]:
+    """
+    Split a structured multi-resume answer into extracted fields per userid
+
+    Args:
+        content: The model response for a multi-resume request
+        userids: The userids in the order they were packed into the request
+
+    Returns:
+        Dictionary mapping userids to their extracted fields, or None if the
+        content is not a results object (callers then split on markers).
+        Userids without a usable result are left out; check_and_process_batch
+        resends them as single-resume requests.
+    """
+    if not content.lstrip().startswith('{'):
+        return None
+    try:
+        data = load_json(content)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("results"), list):
+        return None
+
+    results = {}
+    for item in data["results"]:
+        if not isinstance(item, dict):
+            continue
+        index = item.get("resume")
+        if not isinstance(index, int) or not 1 <= index <= len(userids):
+            continue
+        fields = extract_unified_json_fields(item)
+        if fields is not None:
+            results[userids[index - 1]] = fields
+
+    missing = [userid for userid in userids if userid not in results]
+    if missing:
+        logging.warning(f"Multi-resume answer missing results for UserIDs {missing}; they will be resent as single-resume requests")
+
+    return results
+
+def userids_from_custom_id(custom_id: str) -> List[int]:
+    """
+    Get the userids packed into a request from its custom_id
+
+    Single requests use unified_<userid>; multi-resume requests use
+    multi_<userid>_<userid>_...
+
+    Returns:
+        List of userids, empty if the custom_id format is not recognized
+    """
+    prefix, _, ids = custom_id.partition("_")
+    if prefix not in ("unified", "multi") or not ids:
+        return []
+    try:
+        return [int(userid) for userid in ids.split("_")]
+    except ValueError:
+        return []
+
 
 def count_tokens(content: str) -> int:
     """Count the number of tokens in a string"""
     try:
-        # Handle gpt-5 models by using gpt-4 encoding
-        model_for_encoding = MODEL
-        if "gpt-5" in MODEL.lower():
-            model_for_encoding = "gpt-4"  # Use gpt-4 encoding for gpt-5 models
-        encoding = tiktoken.encoding_for_model(model_for_encoding)
-        return len(encoding.encode(content))
+        # Cached encoding (gpt-5 models use the gpt-4 encoding)
+        return len(get_token_encoding().encode(content, disallowed_special=()))
     except Exception:
         # Fall back to a simple approximation if encoding fails
         return len(content) // 4  # Approximate 4 chars per token
@@ -507,8 +367,11 @@ def count_tokens(content: str) -> int:
 def setup_batch_status_table():
     """Check if we can access the database - don't try to create tables"""
     try:
-        # Connect to the database using the robust connection function
-        conn = create_pyodbc_connection()
+        # Reuse a pooled connection instead of logging in for every status call
+        conn, conn_success, conn_message = get_pooled_connection()
+        if not conn_success:
+            logging.error(f"Error connecting to database: {conn_message}")
+            return False
         cursor = conn.cursor()
         
         # Simple test query to verify connection works
@@ -516,7 +379,7 @@ def setup_batch_status_table():
         cursor.fetchone()
         
         cursor.close()
-        conn.close()
+        release_connection(conn)
         
         logging.info(f"Database connection verified successfully")
         return True
@@ -541,66 +404,181 @@ def mark_records_as_queued(batch_id: str, userids: List[int]) -> bool:
         logging.error(f"Error logging queued records: {str(e)}")
         return False
 
-def update_batch_status(batch_id: str, status: str, userids: Optional[List[int]] = None, 
-                        input_file_id: Optional[str] = None, output_file_id: Optional[str] = None, 
-                        error_file_id: Optional[str] = None, error_message: Optional[str] = None) -> bool:
-    """Update batch status in the tracking table"""
+def batch_status_set_clause(status: str, input_file_id: Optional[str] = None,
+                            output_file_id: Optional[str] = None, error_file_id: Optional[str] = None,
+                            error_message: Optional[str] = None) -> Tuple[List[str], List]:
+    """
+    Build the SET assignments and parameters for one status transition
+
+    Values are passed as parameters so the statement text stays the same for a
+    given set of fields and the server can reuse its plan.
+
+    Returns:
+        Tuple of (assignments, params)
+    """
+    update_fields = ["status = ?", "updated_at = GETDATE()"]
+    params = [status]
+
+    if status in ['completed', 'failed']:
+        update_fields.append("completed_at = GETDATE()")
+
+    if input_file_id:
+        update_fields.append("input_file_id = ?")
+        params.append(input_file_id)
+
+    if output_file_id:
+        update_fields.append("output_file_id = ?")
+        params.append(output_file_id)
+
+    if error_file_id:
+        update_fields.append("error_file_id = ?")
+        params.append(error_file_id)
+
+    if error_message:
+        update_fields.append("error_message = ?")
+        params.append(error_message)
+
+    return update_fields, params
+
+def update_batch_status(batch_id: str, status: Optional[str] = None, userids: Optional[List[int]] = None,
+                        input_file_id: Optional[str] = None, output_file_id: Optional[str] = None,
+                        error_file_id: Optional[str] = None, error_message: Optional[str] = None,
+                        transitions: Optional[List[Dict]] = None) -> bool:
+    """
+    Update batch status in the tracking table
+
+    Args:
+        batch_id: The batch whose rows are updated
+        status: New status for a single update
+        userids: Optional userids to limit a single update to
+        input_file_id, output_file_id, error_file_id, error_message: Optional values to record
+        transitions: Several updates to apply in one transaction instead of the
+            single update above. Each dict takes the same keys ("status",
+            "userids", "input_file_id", ...) and they are applied in order.
+
+    Returns:
+        True if all updates were committed, False if they were rolled back
+    """
+    if transitions is None:
+        transitions = [{
+            "status": status,
+            "userids": userids,
+            "input_file_id": input_file_id,
+            "output_file_id": output_file_id,
+            "error_file_id": error_file_id,
+            "error_message": error_message
+        }]
+
+    # Turn each transition into (status, query, parameter rows)
+    statements = []
+    for transition in transitions:
+        update_fields, set_params = batch_status_set_clause(
+            transition["status"],
+            transition.get("input_file_id"),
+            transition.get("output_file_id"),
+            transition.get("error_file_id"),
+            transition.get("error_message")
+        )
+        transition_userids = transition.get("userids")
+        where_clause = "batch_id = ? AND userid = ?" if transition_userids else "batch_id = ?"
+        query = f"UPDATE {BATCH_STATUS_TABLE} SET {', '.join(update_fields)} WHERE {where_clause}"
+        if transition_userids:
+            rows = [set_params + [batch_id, userid] for userid in transition_userids]
+        else:
+            rows = [set_params + [batch_id]]
+
+        statements.append((transition["status"], query, rows))
+
+    conn = None
     try:
-        # Connect to the database using the robust connection function
-        conn = create_pyodbc_connection()
+        # Reuse a pooled connection instead of logging in for every status call
+        conn, conn_success, conn_message = get_pooled_connection()
+        if not conn_success:
+            logging.error(f"Error updating batch status: {conn_message}")
+            return False
         cursor = conn.cursor()
-        
-        # Update fields
-        update_fields = [f"status = '{status}'", "updated_at = GETDATE()"]
-        
-        if status in ['completed', 'failed']:
-            update_fields.append("completed_at = GETDATE()")
-            
-        if input_file_id:
-            update_fields.append(f"input_file_id = '{input_file_id}'")
-            
-        if output_file_id:
-            update_fields.append(f"output_file_id = '{output_file_id}'")
-            
-        if error_file_id:
-            update_fields.append(f"error_file_id = '{error_file_id}'")
-            
-        if error_message:
-            # Escape single quotes in error message
-            escaped_error = error_message.replace("'", "''")
-            update_fields.append(f"error_message = '{escaped_error}'")
-        
-        # Build WHERE clause
-        if userids:
-            userid_list = ', '.join(map(str, userids))
-            where_clause = f"batch_id = '{batch_id}' AND userid IN ({userid_list})"
-        else:
-            where_clause = f"batch_id = '{batch_id}'"
-        
-        query = f"""
-            UPDATE {BATCH_STATUS_TABLE}
-            SET {', '.join(update_fields)}
-            WHERE {where_clause}
-        """
-        
-        cursor.execute(query)
+        # Send each transition's parameter rows to the server in one round-trip
+        cursor.fast_executemany = True
+
+        # Pooled connections autocommit, so start a transaction for the whole list
+        conn.autocommit = False
+
+        row_counts = []
+        for transition_status, query, rows in statements:
+            cursor.executemany(query, rows)
+            row_counts.append((transition_status, cursor.rowcount))
         conn.commit()
-        
-        row_count = cursor.rowcount
+
         cursor.close()
-        conn.close()
-        
-        logging.info(f"Updated status to '{status}' for batch {batch_id}, affected {row_count} records")
+        conn.autocommit = True
+        release_connection(conn)
+
+        for transition_status, row_count in row_counts:
+            logging.info(f"Updated status to '{transition_status}' for batch {batch_id}, affected {row_count} records")
         return True
-        
+
     except Exception as e:
         logging.error(f"Error updating batch status: {str(e)}")
+        if conn is not None:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            release_connection(conn, reusable=False)
         return False
 
+# Rate limiting and error handling for OpenAI API calls
+@retry(
+    wait=wait_random_exponential(min=1, max=60),
+    stop=stop_after_attempt(OPENAI_MAX_ATTEMPTS),
+    retry=retry_if_exception_type((
+        openai.RateLimitError,
+        openai.APIConnectionError,  # Includes APITimeoutError
+        openai.InternalServerError
+    )),
+    reraise=True
+)
+def call_openai_with_retry(func, *args, **kwargs):
+    """
+    Call an OpenAI SDK function, retrying transient errors with jittered exponential backoff
+    
+    Rate limits, timeouts, dropped connections and 5xx responses are retried;
+    anything else (bad request, auth) is raised straight away. After the last
+    attempt the error is re-raised for the caller's own error handling.
+    """
+    try:
+        return func(*args, **kwargs)
+    except (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError) as e:
+        logging.warning(f"Transient OpenAI error: {e}. Retrying...")
+        raise
+
+@retry(
+    wait=wait_random_exponential(min=1, max=60),
+    stop=stop_after_attempt(OPENAI_MAX_ATTEMPTS),
+    retry=retry_if_exception_type((
+        openai.RateLimitError,
+        openai.InternalServerError
+    )),
+    reraise=True
+)
+def call_openai_create_with_retry(func, *args, **kwargs):
+    """
+    Like call_openai_with_retry, for calls that must not run twice (batches.create)
+    
+    A timeout or dropped connection can happen after the server accepted the
+    request, so retrying it could create a duplicate, billed batch; those errors
+    are raised straight away. Rate limits and 5xx responses are still retried.
+    """
+    try:
+        return func(*args, **kwargs)
+    except (openai.RateLimitError, openai.InternalServerError) as e:
+        logging.warning(f"Transient OpenAI error: {e}. Retrying...")
+        raise
+
 def get_batch_status(batch_id: str) -> Dict:
     """Get the current status of a batch job from the OpenAI API"""
     try:
-        response = openai.batches.retrieve(batch_id=batch_id)
+        response = call_openai_with_retry(openai.batches.retrieve, batch_id=batch_id)
         return {
             "id": response.id,
             "status": response.status,
@@ -613,6 +591,36 @@ def get_batch_status(batch_id: str) -> Dict:
         logging.error(f"Error retrieving batch status: {str(e)}")
         return {}
 
+def list_batch_statuses() -> Dict[str, Dict]:
+    """
+    Get the status of the most recent batch jobs with a single list call
+    
+    Returns:
+        Dictionary mapping batch IDs to {"status", "created_at"}; empty if the call fails
+    """
+    try:
+        response = call_openai_with_retry(openai.batches.list, limit=BATCH_LIST_LIMIT)
+        return {batch.id: {"status": batch.status, "created_at": batch.created_at} for batch in response.data}
+    except Exception as e:
+        logging.error(f"Error listing batches: {str(e)}")
+        return {}
+
+def pending_batch_result(openai_batch_id: str, status: str, created_at=None) -> Dict:
+    """Build the check_and_process_batch result for a batch that is still running"""
+    if created_at:
+        # Add 24 hours to created_at for estimated completion
+        created_timestamp = datetime.fromtimestamp(created_at)
+        estimated_completion = created_timestamp + timedelta(hours=24)
+        now = datetime.now()
+        hours_remaining = (estimated_completion - now).total_seconds() / 3600
+        return {
+            "status": status,
+            "message": f"Batch job {openai_batch_id} status: {status}",
+            "hours_remaining": round(hours_remaining, 1)
+        }
+    else:
+        return {"status": status, "message": f"Batch job {openai_batch_id} status: {status}"}
+
 def generate_unified_request(userid: int, resume_text: str) -> Dict:
     """
     Generate a unified request for a single resume
@@ -627,7 +635,7 @@ def generate_unified_request(userid: int, resume_text: str) -> Dict:
     # Create unified prompt
     unified_messages = create_unified_prompt(resume_text, userid=userid)
 
-    # Don't add JSON formatting - use the original text format
+    # By default don't add JSON formatting - use the original text format
     # This ensures better field extraction as originally designed
     # The prompts already specify the exact text format to return
     
@@ -638,6 +646,10 @@ def generate_unified_request(userid: int, resume_text: str) -> Dict:
         "messages": unified_messages
     }
 
+    # Structured output returns the fields keyed by database column, skipping the text parser
+    if USE_STRUCTURED_OUTPUT:
+        body["response_format"] = UNIFIED_RESPONSE_FORMAT
+
     # Only add temperature if not using gpt-5 models (they only support default temp of 1)
     if "gpt-5" not in MODEL.lower():
         body["temperature"] = 0.2
@@ -651,6 +663,154 @@ def generate_unified_request(userid: int, resume_text: str) -> Dict:
         "body": body
     }
 
+def generate_multi_resume_request(resumes: List[Tuple[int, str]]) -> Dict:
+    """
+    Generate a single request covering several resumes
+
+    Args:
+        resumes: List of (userid, resume_text) tuples
+
+    Returns:
+        A dictionary with the request payload
+    """
+    body = {
+        "model": MODEL,
+        "messages": create_multi_resume_prompt(resumes, structured=USE_STRUCTURED_OUTPUT)
+    }
+
+    if USE_STRUCTURED_OUTPUT:
+        body["response_format"] = MULTI_RESUME_RESPONSE_FORMAT
+
+    # Same model handling as generate_unified_request
+    if "gpt-5" not in MODEL.lower():
+        body["temperature"] = 0.2
+        body["max_tokens"] = 16000
+
+    return {
+        "custom_id": "multi_" + "_".join(str(userid) for userid, _ in resumes),
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": body
+    }
+
+def dump_jsonl_line(record: Dict) -> bytes:
+    """Serialize one record as a newline-terminated JSONL line (UTF-8 bytes)"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+def load_jsonl_line(line: bytes) -> Dict:
+    """Parse one JSONL line (UTF-8 bytes) into a record"""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+def load_json(text: str) -> Any:
+    """
+    Parse JSON text from a model answer or response field
+
+    orjson's decode error subclasses json.JSONDecodeError, so callers keep
+    catching json.JSONDecodeError either way.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def dump_json(obj: Any) -> str:
+    """Serialize an object to a compact JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+def _init_prep_worker(use_structured_output: bool) -> None:
+    """Carry command-line settings into request-building worker processes"""
+    global USE_STRUCTURED_OUTPUT
+    USE_STRUCTURED_OUTPUT = use_structured_output
+
+def build_request_line(group: List[Tuple[int, str]]) -> bytes:
+    """Build one batch request for a group of resumes and serialize it as a JSONL line"""
+    if len(group) == 1:
+        userid, resume_text = group[0]
+        request = generate_unified_request(userid, resume_text)
+    else:
+        request = generate_multi_resume_request(group)
+    return dump_jsonl_line(request)
+
+def new_batch_file_path() -> Tuple[str, str]:
+    """Return a (batch_id, filepath) pair for a new batch input file"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    batch_id = f"batch_{timestamp}"
+    filename = f"batch_input_unified_{timestamp}.jsonl"
+    return batch_id, os.path.join(os.path.dirname(__file__), filename)
+
+def serialize_batch_requests(resume_batch: List[Tuple[int, str]]) -> Tuple[bytes, int, int]:
+    """
+    Serialize the requests for a batch into one JSONL payload
+    
+    The whole batch goes into one file so the provider can schedule it as a single
+    large job. If the requests would exceed MAX_BATCH_REQUESTS or MAX_BATCH_FILE_BYTES,
+    the remaining resumes are left out and released with release_resume_batch
+    (get_resume_batch already marked them processed), so the next batch fetches
+    them again. fetch_resume_batch sizes the fetch to the file limit, so this only
+    catches what its estimate let through.
+    
+    Args:
+        resume_batch: List of (userid, resume_text) tuples
+        
+    Returns:
+        Tuple of (payload, request_count, total_tokens)
+    """
+    # Pack resumes into groups when multi-resume requests are enabled
+    group_size = max(1, min(RESUMES_PER_REQUEST, MAX_RESUMES_PER_REQUEST))
+    groups = [resume_batch[i:i + group_size] for i in range(0, len(resume_batch), group_size)]
+
+    # Build requests in parallel (prompt assembly and serialization don't depend on
+    # each other), then collect them in order into one payload. Taxonomy scoring is
+    # regex work that holds the GIL, so worker processes scale further than threads.
+    # They are spawned rather than forked because polling threads may be running.
+    if PREP_USE_PROCESSES:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=PREP_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_prep_worker,
+            initargs=(USE_STRUCTURED_OUTPUT,)
+        )
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=PREP_WORKERS)
+
+    lines = []
+    payload_size = 0
+    with executor:
+        # chunksize only applies to the process pool, where it amortizes pickling
+        for line in executor.map(build_request_line, groups, chunksize=64):
+            if len(lines) >= MAX_BATCH_REQUESTS or payload_size + len(line) > MAX_BATCH_FILE_BYTES:
+                deferred = [userid for group in groups[len(lines):] for userid, _ in group]
+                logging.warning(f"Batch file limit reached at {len(lines)} requests ({payload_size} bytes), releasing {len(deferred)} resumes for the next batch")
+                release_resume_batch(deferred)
+                break
+            payload_size += len(line)
+            lines.append(line)
+
+    # The token total is only logged, so estimate it unless an exact count was asked for
+    if EXACT_TOKEN_COUNT:
+        # Tokenize every request in one call, reusing the serialized lines
+        total_tokens = sum(count_tokens_batch(line.decode('utf-8') for line in lines))
+    else:
+        total_tokens = payload_size // 4  # Approximate 4 chars per token
+
+    return b"".join(lines), len(lines), total_tokens
+
+def write_batch_payload(filepath: str, payload: bytes) -> None:
+    """Write a serialized batch payload to disk in a single pass"""
+    # O_BINARY keeps Windows from rewriting the line endings
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
 def create_batch_input_file(resume_batch: List[Tuple[int, str]]) -> str:
     """
     Create a JSONL file for batch processing
@@ -661,24 +821,11 @@ def create_batch_input_file(resume_batch: List[Tuple[int, str]]) -> str:
     Returns:
         Path to the created JSONL file
     """
-    # Create a unique filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    batch_id = f"batch_{timestamp}"
-    filename = f"batch_input_unified_{timestamp}.jsonl"
-    filepath = os.path.join(os.path.dirname(__file__), filename)
-    
-    # Track token usage for monitoring
-    total_tokens = 0
-    request_count = 0
+    batch_id, filepath = new_batch_file_path()
     
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            for userid, resume_text in resume_batch:
-                request = generate_unified_request(userid, resume_text)
-                token_count = count_tokens(json.dumps(request))
-                total_tokens += token_count
-                request_count += 1
-                f.write(json.dumps(request) + '\n')
+        payload, request_count, total_tokens = serialize_batch_requests(resume_batch)
+        write_batch_payload(filepath, payload)
             
         logging.info(f"Created batch input file {filepath} with {request_count} requests ({total_tokens} tokens)")
         return filepath, batch_id, request_count
@@ -686,22 +833,66 @@ def create_batch_input_file(resume_batch: List[Tuple[int, str]]) -> str:
         logging.error(f"Error creating batch input file: {str(e)}")
         return "", "", 0
 
-def upload_batch_file(filepath: str) -> str:
+def create_and_upload_batch_input(resume_batch: List[Tuple[int, str]]) -> Tuple[str, str, int, str]:
+    """
+    Create a batch input file and upload it straight from memory
+    
+    The local copy is written on a worker thread while the same payload is
+    uploaded, so the file never has to be read back from disk.
+    
+    Args:
+        resume_batch: List of (userid, resume_text) tuples
+        
+    Returns:
+        Tuple of (filepath, batch_id, request_count, input_file_id); input_file_id
+        is empty if the upload failed
+    """
+    batch_id, filepath = new_batch_file_path()
+    
+    try:
+        payload, request_count, total_tokens = serialize_batch_requests(resume_batch)
+    except Exception as e:
+        logging.error(f"Error creating batch input file: {str(e)}")
+        return "", "", 0, ""
+    
+    if request_count == 0:
+        logging.error("No requests were serialized for the batch input file")
+        return "", "", 0, ""
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        write_future = executor.submit(write_batch_payload, filepath, payload)
+        input_file_id = upload_batch_file(filepath, content=payload)
+        try:
+            write_future.result()
+            logging.info(f"Created batch input file {filepath} with {request_count} requests ({total_tokens} tokens)")
+        except Exception as e:
+            # The upload doesn't depend on the local copy, so keep going
+            logging.warning(f"Could not write local copy of batch input file {filepath}: {str(e)}")
+    
+    return filepath, batch_id, request_count, input_file_id
+
+def upload_batch_file(filepath: str, content: Optional[bytes] = None) -> str:
     """
     Upload a file to OpenAI for batch processing
     
     Args:
         filepath: Path to the JSONL file
+        content: Serialized file contents; when given it is uploaded directly
+            instead of reading the file back from disk
         
     Returns:
         File ID if successful, empty string otherwise
     """
     try:
-        with open(filepath, 'rb') as file:
-            response = openai.files.create(
-                file=file,
-                purpose="batch"
-            )
+        # Upload from bytes so a retried attempt sends the whole file again
+        if content is None:
+            with open(filepath, 'rb') as file:
+                content = file.read()
+        response = call_openai_with_retry(
+            openai.files.create,
+            file=(os.path.basename(filepath), content),
+            purpose="batch"
+        )
         file_id = response.id
         logging.info(f"Uploaded file {filepath} with ID {file_id}")
         return file_id
@@ -721,7 +912,8 @@ def submit_batch_job(file_id: str, endpoint: str = "/v1/chat/completions") -> st
         Batch ID if successful, empty string otherwise
     """
     try:
-        response = openai.batches.create(
+        response = call_openai_create_with_retry(
+            openai.batches.create,
             input_file_id=file_id,
             endpoint=endpoint,
             completion_window="24h"  # For 50% discount
@@ -733,6 +925,77 @@ def submit_batch_job(file_id: str, endpoint: str = "/v1/chat/completions") -> st
         logging.error(f"Error submitting batch job: {str(e)}")
         return ""
 
+def put_unless_stopped(line_chunks: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put item on the queue, giving up if stop is set while the queue is full; returns whether it was put"""
+    while not stop.is_set():
+        try:
+            line_chunks.put(item, timeout=DOWNLOAD_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def stream_file_lines(file_id: str, line_chunks: queue.Queue, stop: threading.Event) -> None:
+    """
+    Download a file from OpenAI in chunks, putting lists of complete lines on a queue
+
+    Runs on a reader thread for iter_file_content. Puts None when the download
+    finishes, or the exception if it fails. If stop is set (the parser finished
+    early or failed) the download is abandoned and the response closed.
+    """
+    try:
+        with contextlib.ExitStack() as stack:
+            # Opening the stream sends the request, so that is the step to retry
+            response = call_openai_with_retry(
+                lambda: stack.enter_context(openai.files.with_streaming_response.content(file_id))
+            )
+            pending = b""
+            for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                if not put_unless_stopped(line_chunks, lines, stop):
+                    return
+            if pending and not put_unless_stopped(line_chunks, [pending], stop):
+                return
+        put_unless_stopped(line_chunks, None, stop)
+    except Exception as e:
+        put_unless_stopped(line_chunks, e, stop)
+
+def iter_file_content(file_id: str):
+    """
+    Download a JSONL file from OpenAI and yield its records one line at a time
+    
+    A reader thread streams the file while lines already received are parsed
+    here, so parsing overlaps the download instead of waiting for all of it.
+    Lines are parsed from bytes without building a decoded copy of the file.
+    
+    Args:
+        file_id: ID of the file to download
+        
+    Returns:
+        Iterator of parsed JSON objects from the file
+    """
+    line_chunks = queue.Queue(maxsize=DOWNLOAD_QUEUE_CHUNKS)
+    stop = threading.Event()
+    reader = threading.Thread(target=stream_file_lines, args=(file_id, line_chunks, stop), name="file-reader", daemon=True)
+    reader.start()
+    try:
+        while True:
+            lines = line_chunks.get()
+            if lines is None:
+                break
+            if isinstance(lines, Exception):
+                raise lines
+            for line in lines:
+                if line.strip():
+                    try:
+                        yield load_jsonl_line(line)
+                    except json.JSONDecodeError as e:
+                        logging.error(f"Error parsing JSON line: {str(e)}")
+    finally:
+        # Closed early (or failed): let the reader drop the download instead of blocking on the queue
+        stop.set()
+
 def get_file_content(file_id: str) -> List[Dict]:
     """
     Download and parse a file from OpenAI
@@ -744,18 +1007,7 @@ def get_file_content(file_id: str) -> List[Dict]:
         List of parsed JSON objects from the file
     """
     try:
-        # Download the file
-        response = openai.files.content(file_id)
-        content = response.read().decode('utf-8')
-        
-        # Parse each line as JSON
-        results = []
-        for line in content.splitlines():
-            if line.strip():
-                try:
-                    results.append(json.loads(line))
-                except json.JSONDecodeError as e:
-                    logging.error(f"Error parsing JSON line: {str(e)}")
+        results = list(iter_file_content(file_id))
         
         logging.info(f"Downloaded and parsed file {file_id} with {len(results)} results")
         return results
@@ -763,6 +1015,335 @@ def get_file_content(file_id: str) -> List[Dict]:
         logging.error(f"Error downloading file: {str(e)}")
         return []
 
+def _build_old_json_field_paths() -> Dict[Tuple[str, ...], str]:
+    """Flatten the nested JSON layout the old unified prompt asked for into {path: result field}"""
+    paths = {
+        ('PERSONAL_INFORMATION', 'Name', 'FirstName'): 'FirstName',
+        ('PERSONAL_INFORMATION', 'Name', 'MiddleName'): 'MiddleName',
+        ('PERSONAL_INFORMATION', 'Name', 'LastName'): 'LastName',
+        ('PERSONAL_INFORMATION', 'Contact', 'Phone'): 'Phone1',
+        ('PERSONAL_INFORMATION', 'Contact', 'SecondaryPhone'): 'Phone2',
+        ('PERSONAL_INFORMATION', 'Contact', 'Email'): 'Email',
+        ('PERSONAL_INFORMATION', 'Contact', 'SecondaryEmail'): 'Email2',
+        ('PERSONAL_INFORMATION', 'Contact', 'LinkedIn'): 'LinkedIn',
+        ('PERSONAL_INFORMATION', 'Contact', 'Address'): 'Address',
+        ('PERSONAL_INFORMATION', 'Contact', 'City'): 'City',
+        ('PERSONAL_INFORMATION', 'Contact', 'State'): 'State',
+        ('PERSONAL_INFORMATION', 'Education', 'BachelorsDegree'): 'Bachelors',
+        ('PERSONAL_INFORMATION', 'Education', 'MastersDegree'): 'Masters',
+        ('PERSONAL_INFORMATION', 'Education', 'Certifications'): 'Certifications',
+    }
+
+    # Work history comes either as one object per company or as flat prefixed keys;
+    # flat keys come second so they win when both are present
+    prefixes = ['MostRecent', 'SecondMostRecent', 'ThirdMostRecent', 'FourthMostRecent',
+                'FifthMostRecent', 'SixthMostRecent', 'SeventhMostRecent']
+    for prefix in prefixes:
+        for suffix in ('Company', 'StartDate', 'EndDate', 'Location'):
+            paths[('WORK_HISTORY', prefix, suffix)] = f"{prefix}{suffix}"
+    for prefix in prefixes:
+        for suffix in ('Company', 'StartDate', 'EndDate', 'Location'):
+            paths[('WORK_HISTORY', f"{prefix}{suffix}")] = f"{prefix}{suffix}"
+
+    career_fields = {
+        'PrimaryTitle': 'PrimaryTitle',
+        'SecondaryTitle': 'SecondaryTitle',
+        'TertiaryTitle': 'TertiaryTitle',
+        'PrimaryIndustry': 'PrimaryIndustry',
+        'SecondaryIndustry': 'SecondaryIndustry',
+        'TopSkills': 'Top10Skills'
+    }
+    tech_fields = {
+        'PrimaryLanguage': 'PrimarySoftwareLanguage',
+        'SecondaryLanguage': 'SecondarySoftwareLanguage',
+        'TertiaryLanguage': 'TertiarySoftwareLanguage',
+        **{f"SoftwareApp{i}": f"SoftwareApp{i}" for i in range(1, 6)},
+        **{f"Hardware{i}": f"Hardware{i}" for i in range(1, 6)},
+        'PrimaryCategory': 'PrimaryCategory',
+        'SecondaryCategory': 'SecondaryCategory',
+        'ProjectTypes': 'ProjectTypes',
+        'Specialty': 'Specialty',
+        'Summary': 'Summary',
+        'LengthInUS': 'LengthinUS',
+        'YearsOfExperience': 'YearsofExperience',
+        'AvgTenure': 'AvgTenure'
+    }
+    paths.update({('CAREER_INFO', json_field): result_field for json_field, result_field in career_fields.items()})
+    paths.update({('TECHNICAL_INFO', json_field): result_field for json_field, result_field in tech_fields.items()})
+    return paths
+
+# Fields returned by OLD_parse_unified_response_DO_NOT_USE, in result order
+OLD_RESULT_FIELDS = (
+    # Step 1 fields - Personal Info
+    "FirstName",
+    "MiddleName",
+    "LastName",
+    "Phone1",
+    "Phone2",
+    "Email",
+    "Email2",
+    "LinkedIn",
+    "Address",
+    "City",
+    "State",
+    "Bachelors",
+    "Masters",
+    "Certifications",
+
+    # Step 1 fields - Work History
+    "MostRecentCompany",
+    "MostRecentStartDate",
+    "MostRecentEndDate",
+    "MostRecentLocation",
+    "SecondMostRecentCompany",
+    "SecondMostRecentStartDate",
+    "SecondMostRecentEndDate",
+    "SecondMostRecentLocation",
+    "ThirdMostRecentCompany",
+    "ThirdMostRecentStartDate",
+    "ThirdMostRecentEndDate",
+    "ThirdMostRecentLocation",
+    "FourthMostRecentCompany",
+    "FourthMostRecentStartDate",
+    "FourthMostRecentEndDate",
+    "FourthMostRecentLocation",
+    "FifthMostRecentCompany",
+    "FifthMostRecentStartDate",
+    "FifthMostRecentEndDate",
+    "FifthMostRecentLocation",
+    "SixthMostRecentCompany",
+    "SixthMostRecentStartDate",
+    "SixthMostRecentEndDate",
+    "SixthMostRecentLocation",
+    "SeventhMostRecentCompany",
+    "SeventhMostRecentStartDate",
+    "SeventhMostRecentEndDate",
+    "SeventhMostRecentLocation",
+
+    # Step 1 fields - Career/Job Info
+    "PrimaryTitle",
+    "SecondaryTitle",
+    "TertiaryTitle",
+    "PrimaryIndustry",
+    "SecondaryIndustry",
+    "Top10Skills",
+
+    # Step 2 fields - Technical Info
+    "PrimarySoftwareLanguage",
+    "SecondarySoftwareLanguage",
+    "TertiarySoftwareLanguage",
+    "SoftwareApp1",
+    "SoftwareApp2",
+    "SoftwareApp3",
+    "SoftwareApp4",
+    "SoftwareApp5",
+    "Hardware1",
+    "Hardware2",
+    "Hardware3",
+    "Hardware4",
+    "Hardware5",
+    "PrimaryCategory",
+    "SecondaryCategory",
+    "ProjectTypes",
+    "Specialty",
+    "Summary",
+    "LengthinUS",
+    "YearsofExperience",
+    "AvgTenure"
+)
+
+# Default result, copied per call; every field starts as "NULL"
+OLD_DEFAULT_RESULT = dict.fromkeys(OLD_RESULT_FIELDS, "NULL")
+
+# Question patterns for the text fallback in OLD_parse_unified_response_DO_NOT_USE
+_OLD_TEXT_PATTERN_SOURCES = {
+    # Step 1 patterns - Personal Info
+    "PrimaryTitle": [r"- Best job title that fit their primary experience:\s*(.+)"],
+    "SecondaryTitle": [r"- Best secondary job title that fits their secondary experience.*?:\s*(.+)"],
+    "TertiaryTitle": [r"- Best tertiary job title that fits their tertiary experience.*?:\s*(.+)"],
+    "Address": [r"- Their street address:\s*(.+)"],
+    "City": [r"- Their City:\s*(.+)"],
+    "State": [r"- Their State:\s*(.+)"],
+    "Certifications": [r"- Their Certifications Listed:\s*(.+)"],
+    "Bachelors": [r"- Their Bachelor's Degree:\s*(.+)"],
+    "Masters": [r"- Their Master's Degree:\s*(.+)"],
+    "Phone1": [r"- Their Phone Number:\s*(.+)"],
+    "Phone2": [r"- Their Second Phone Number:\s*(.+)"],
+    "Email": [r"- Their Email:\s*(.+)"],
+    "Email2": [r"- Their Second Email:\s*(.+)"],
+    "FirstName": [r"- Their First Name:\s*(.+)"],
+    "MiddleName": [r"- Their Middle Name:\s*(.+)"],
+    "LastName": [r"- Their Last Name:\s*(.+)"],
+    "LinkedIn": [r"- Their Linkedin URL:\s*(.+)"],
+    
+    # Step 1 patterns - Work History
+    "MostRecentCompany": [r"- Most Recent Company Worked for:\s*(.+)"],
+    "MostRecentStartDate": [r"- Most Recent Start Date.*?:\s*(.+)"],
+    "MostRecentEndDate": [r"- Most Recent End Date.*?:\s*(.+)"],
+    "MostRecentLocation": [r"- Most Recent Job Location.*?:\s*(.+)"],
+    "SecondMostRecentCompany": [r"- Second Most Recent Company Worked for:\s*(.+)"],
+    "SecondMostRecentStartDate": [r"- Second Most Recent Start Date.*?:\s*(.+)"],
+    "SecondMostRecentEndDate": [r"- Second Most Recent End Date.*?:\s*(.+)"],
+    "SecondMostRecentLocation": [r"- Second Most Recent Job Location.*?:\s*(.+)"],
+    "ThirdMostRecentCompany": [r"- Third Most Recent Company Worked for:\s*(.+)"],
+    "ThirdMostRecentStartDate": [r"- Third Most Recent Start Date.*?:\s*(.+)"],
+    "ThirdMostRecentEndDate": [r"- Third Most Recent End Date.*?:\s*(.+)"],
+    "ThirdMostRecentLocation": [r"- Third Most Recent Job Location.*?:\s*(.+)"],
+    "FourthMostRecentCompany": [r"- Fourth Most Recent Company Worked for:\s*(.+)"],
+    "FourthMostRecentStartDate": [r"- Fourth Most Recent Start Date.*?:\s*(.+)"],
+    "FourthMostRecentEndDate": [r"- Fourth Most Recent End Date.*?:\s*(.+)"],
+    "FourthMostRecentLocation": [r"- Fourth Most Recent Job Location.*?:\s*(.+)"],
+    "FifthMostRecentCompany": [r"- Fifth Most Recent Company Worked for:\s*(.+)"],
+    "FifthMostRecentStartDate": [r"- Fifth Most Recent Start Date.*?:\s*(.+)"],
+    "FifthMostRecentEndDate": [r"- Fifth Most Recent End Date.*?:\s*(.+)"],
+    "FifthMostRecentLocation": [r"- Fifth Most Recent Job Location.*?:\s*(.+)"],
+    "SixthMostRecentCompany": [r"- Sixth Most Recent Company Worked for:\s*(.+)"],
+    "SixthMostRecentStartDate": [r"- Sixth Most Recent Start Date.*?:\s*(.+)"],
+    "SixthMostRecentEndDate": [r"- Sixth Most Recent End Date.*?:\s*(.+)"],
+    "SixthMostRecentLocation": [r"- Sixth Most Recent Job Location.*?:\s*(.+)"],
+    "SeventhMostRecentCompany": [r"- Seventh Most Recent Company Worked for:\s*(.+)"],
+    "SeventhMostRecentStartDate": [r"- Seventh Most Recent Start Date.*?:\s*(.+)"],
+    "SeventhMostRecentEndDate": [r"- Seventh Most Recent End Date.*?:\s*(.+)"],
+    "SeventhMostRecentLocation": [r"- Seventh Most Recent Job Location.*?:\s*(.+)"],
+    
+    # Step 1 patterns - Industry and Skills
+    "PrimaryIndustry": [r"- Based on all 7 of their most recent companies above, what is the Primary industry they work in:\s*(.+)"],
+    "SecondaryIndustry": [r"- Based on all 7 of their most recent companies above, what is the Secondary industry they work in:\s*(.+)"],
+    "Top10Skills": [r"- Top 10 Technical Skills:\s*(.+)"],
+    
+    # Step 2 patterns - Technical Info
+    "PrimarySoftwareLanguage": [r"- What technical language do they use most often\?:\s*(.+)"],
+    "SecondarySoftwareLanguage": [r"- What technical language do they use second most often\?:\s*(.+)"],
+    "TertiarySoftwareLanguage": [r"- What technical language do they use third most often\?:\s*(.+)"],
+    "SoftwareApp1": [r"- What software do they talk about using the most\?:\s*(.+)"],
+    "SoftwareApp2": [r"- What software do they talk about using the second most\?:\s*(.+)"],
+    "SoftwareApp3": [r"- What software do they talk about using the third most\?:\s*(.+)"],
+    "SoftwareApp4": [r"- What software do they talk about using the fourth most\?:\s*(.+)"],
+    "SoftwareApp5": [r"- What software do they talk about using the fifth most\?:\s*(.+)"],
+    "Hardware1": [r"- What physical hardware do they talk about using the most\?:\s*(.+)"],
+    "Hardware2": [r"- What physical hardware do they talk about using the second most\?:\s*(.+)"],
+    "Hardware3": [r"- What physical hardware do they talk about using the third most\?:\s*(.+)"],
+    "Hardware4": [r"- What physical hardware do they talk about using the fourth most\?:\s*(.+)"],
+    "Hardware5": [r"- What physical hardware do they talk about using the fifth most\?:\s*(.+)"],
+    "PrimaryCategory": [r"- Based on their experience, put them in a primary technical category if they are technical or functional category if they are functional:\s*(.+)"],
+    "SecondaryCategory": [r"- Based on their experience, put them in a subsidiary technical category if they are technical or functional category if they are functional:\s*(.+)"],
+    "ProjectTypes": [r"- Types of projects they have worked on:\s*(.+)"],
+    "Specialty": [r"- Based on their skills, categories, certifications, and industries, determine what they specialize in:\s*(.+)"],
+    "Summary": [r"- Based on all this knowledge, write a summary of this candidate.*?:\s*(.+)"],
+    "LengthinUS": [r"- How long have they lived in the United States.*?:\s*(.+)"],
+    "YearsofExperience": [r"- Total years of professional experience.*?:\s*(.+)"],
+    "AvgTenure": [r"- Average tenure at companies in years.*?:\s*(.+)"]
+}
+
+OLD_TEXT_LINE_PATTERN = re.compile(r'^[^\S\n]*(-[^:\n]*):(.*)$', re.MULTILINE)  # "- question: answer" lines in text answers
+OLD_TEXT_PREFIX_BUCKET_LENGTH = 8  # Leading characters used to bucket wildcard question prefixes
+
+def _build_old_text_question_lookup() -> Tuple[Dict[str, str], Dict[str, List[Tuple[str, str]]]]:
+    r"""
+    Turn the text-fallback patterns into question lookups
+
+    Every pattern is a literal question followed by ':\s*(.+)', optionally with
+    a trailing '.*?' wildcard before the colon. Literal questions go into a dict
+    for an exact match. Wildcard ones become prefixes bucketed by their first
+    OLD_TEXT_PREFIX_BUCKET_LENGTH characters, so a line only checks the few
+    prefixes that share its start (in the original pattern order).
+
+    Returns:
+        Tuple of ({question: field}, {bucket key: [(question prefix, field), ...]})
+    """
+    exact = {}
+    prefix_buckets = {}
+    for field, pattern_list in _OLD_TEXT_PATTERN_SOURCES.items():
+        for pattern in pattern_list:
+            question = pattern[:-len(r":\s*(.+)")].replace(r"\?", "?")
+            if question.endswith(".*?"):
+                prefix = question[:-len(".*?")]
+                prefix_buckets.setdefault(prefix[:OLD_TEXT_PREFIX_BUCKET_LENGTH], []).append((prefix, field))
+            else:
+                exact.setdefault(question, field)
+    return exact, prefix_buckets
+
+# Built once at import so each response line costs a dict lookup and a few startswith
+# checks instead of a regex per field
+OLD_TEXT_QUESTION_FIELDS, OLD_TEXT_QUESTION_PREFIXES = _build_old_text_question_lookup()
+
+# Tuple of (path, result field) pairs so the parser iterates a shared immutable sequence
+OLD_JSON_FIELD_PATHS = tuple(_build_old_json_field_paths().items())
+OLD_STEP2_FIELDS = frozenset([  # Technical (step 2) fields, for the step 1/2 extraction counts
+    "PrimarySoftwareLanguage", "SecondarySoftwareLanguage", "TertiarySoftwareLanguage",
+    "SoftwareApp1", "SoftwareApp2", "SoftwareApp3", "SoftwareApp4", "SoftwareApp5",
+    "Hardware1", "Hardware2", "Hardware3", "Hardware4", "Hardware5",
+    "PrimaryCategory", "SecondaryCategory", "ProjectTypes",
+    "Specialty", "Summary", "LengthinUS", "YearsofExperience", "AvgTenure"
+])
+OLD_JSON_NULL_SECTIONS = ('CAREER_INFO', 'TECHNICAL_INFO')  # Explicit NULLs in these sections still set the field
+_MISSING = object()
+
+def _walk_json_path(data, path: Tuple[str, ...]):
+    """Follow path through nested dicts, returning _MISSING if any step is absent"""
+    for key in path:
+        if not isinstance(data, dict):
+            return _MISSING
+        data = data.get(key, _MISSING)
+        if data is _MISSING:
+            return _MISSING
+    return data
+
+def _build_unified_json_sections() -> Tuple[Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...]], ...]:
+    """Group the nested JSON paths by section as (section path, ((json field, result field), ...))"""
+    sections = {}
+    for path, result_field in _build_old_json_field_paths().items():
+        if path[0] == 'WORK_HISTORY' and len(path) == 2:
+            continue  # Flat prefixed work keys are only understood by the old parser
+        sections.setdefault(path[:-1], []).append((path[-1], result_field))
+    return tuple((section_path, tuple(fields)) for section_path, fields in sections.items())
+
+# Sections of the nested JSON answer mapped by map_unified_json_sections
+UNIFIED_JSON_SECTIONS = _build_unified_json_sections()
+
+def map_unified_json_sections(json_data: Dict) -> Dict:
+    """
+    Map a nested JSON answer (PERSONAL_INFORMATION, WORK_HISTORY, ...) to result fields
+
+    Every field of a section that is present is set, missing ones to None.
+    Top10Skills is also split into Skill1..Skill10, and "NULL" strings become None.
+
+    Args:
+        json_data: Decoded JSON answer
+
+    Returns:
+        Dictionary of result fields, empty if no known section is present
+    """
+    parsed_results = {}
+    for section_path, section_fields in UNIFIED_JSON_SECTIONS:
+        section = _walk_json_path(json_data, section_path)
+        if section and isinstance(section, dict):
+            for json_field, result_field in section_fields:
+                parsed_results[result_field] = section.get(json_field)
+
+    # Handle TopSkills - can be either array or comma-separated string
+    top_skills = parsed_results.pop("Top10Skills", None)
+    if top_skills:
+        if isinstance(top_skills, list):
+            # It's already an array
+            skills = top_skills
+            parsed_results["Top10Skills"] = ", ".join(skills[:10])
+        else:
+            # It's a string
+            parsed_results["Top10Skills"] = top_skills
+            skills = [s.strip() for s in top_skills.split(",")]
+
+        # Parse skills into individual fields
+        for i, skill in enumerate(skills[:10], 1):
+            parsed_results[f"Skill{i}"] = skill
+
+    # Clean up NULL values
+    for key, value in parsed_results.items():
+        if value == "NULL" or value == "null":
+            parsed_results[key] = None
+
+    return parsed_results
+
 def OLD_parse_unified_response_DO_NOT_USE(response_text, debug_mode=True, debug_limit=20, debug_counter=None):
     """
     Parse the LLM response from the unified prompt to extract structured data
@@ -777,25 +1358,15 @@ def OLD_parse_unified_response_DO_NOT_USE(response_text, debug_mode=True, debug_
     Returns:
         A dictionary of parsed fields
     """
-    # Make sure re module is imported
-    import re
-    import json
-    import uuid
-    
     # Save the full response to a debug file if debug mode is enabled
     # and we haven't exceeded the limit
-    debug_id = uuid.uuid4().hex[:8]
-    save_debug = False
-    
-    if debug_mode:
-        if debug_counter is not None:
-            if debug_counter.value < debug_limit:
-                save_debug = True
-                debug_counter.value += 1
-        else:
-            save_debug = True
+    save_debug = debug_mode and (debug_counter is None or debug_counter.value < debug_limit)
             
     if save_debug:
+        if debug_counter is not None:
+            debug_counter.value += 1
+        # Only 8 hex chars are needed to tell the debug files apart
+        debug_id = secrets.token_hex(4)
         debug_path = os.path.join(os.path.dirname(__file__), f"debug_response_{debug_id}.json")
         with open(debug_path, "w", encoding="utf-8") as debug_file:
             debug_file.write(response_text)
@@ -805,93 +1376,13 @@ def OLD_parse_unified_response_DO_NOT_USE(response_text, debug_mode=True, debug_
     logging.info(f"Unified response first 500 chars: {response_text[:500]}...")
     
     # Initialize result dictionary with default NULL values
-    result = {
-        # Step 1 fields - Personal Info
-        "FirstName": "NULL", 
-        "MiddleName": "NULL", 
-        "LastName": "NULL",
-        "Phone1": "NULL", 
-        "Phone2": "NULL", 
-        "Email": "NULL", 
-        "Email2": "NULL", 
-        "LinkedIn": "NULL",
-        "Address": "NULL", 
-        "City": "NULL", 
-        "State": "NULL",
-        "Bachelors": "NULL", 
-        "Masters": "NULL", 
-        "Certifications": "NULL",
-        
-        # Step 1 fields - Work History
-        "MostRecentCompany": "NULL", 
-        "MostRecentStartDate": "NULL", 
-        "MostRecentEndDate": "NULL", 
-        "MostRecentLocation": "NULL",
-        "SecondMostRecentCompany": "NULL", 
-        "SecondMostRecentStartDate": "NULL", 
-        "SecondMostRecentEndDate": "NULL", 
-        "SecondMostRecentLocation": "NULL",
-        "ThirdMostRecentCompany": "NULL", 
-        "ThirdMostRecentStartDate": "NULL", 
-        "ThirdMostRecentEndDate": "NULL", 
-        "ThirdMostRecentLocation": "NULL",
-        "FourthMostRecentCompany": "NULL", 
-        "FourthMostRecentStartDate": "NULL", 
-        "FourthMostRecentEndDate": "NULL", 
-        "FourthMostRecentLocation": "NULL",
-        "FifthMostRecentCompany": "NULL", 
-        "FifthMostRecentStartDate": "NULL", 
-        "FifthMostRecentEndDate": "NULL", 
-        "FifthMostRecentLocation": "NULL",
-        "SixthMostRecentCompany": "NULL", 
-        "SixthMostRecentStartDate": "NULL", 
-        "SixthMostRecentEndDate": "NULL", 
-        "SixthMostRecentLocation": "NULL",
-        "SeventhMostRecentCompany": "NULL", 
-        "SeventhMostRecentStartDate": "NULL", 
-        "SeventhMostRecentEndDate": "NULL", 
-        "SeventhMostRecentLocation": "NULL",
-        
-        # Step 1 fields - Career/Job Info
-        "PrimaryTitle": "NULL", 
-        "SecondaryTitle": "NULL", 
-        "TertiaryTitle": "NULL",
-        "PrimaryIndustry": "NULL", 
-        "SecondaryIndustry": "NULL",
-        "Top10Skills": "NULL",
-        
-        # Step 2 fields - Technical Info
-        "PrimarySoftwareLanguage": "NULL", 
-        "SecondarySoftwareLanguage": "NULL", 
-        "TertiarySoftwareLanguage": "NULL",
-        "SoftwareApp1": "NULL", 
-        "SoftwareApp2": "NULL", 
-        "SoftwareApp3": "NULL", 
-        "SoftwareApp4": "NULL", 
-        "SoftwareApp5": "NULL",
-        "Hardware1": "NULL", 
-        "Hardware2": "NULL", 
-        "Hardware3": "NULL", 
-        "Hardware4": "NULL", 
-        "Hardware5": "NULL",
-        "PrimaryCategory": "NULL", 
-        "SecondaryCategory": "NULL",
-        "ProjectTypes": "NULL",
-        "Specialty": "NULL",
-        "Summary": "NULL",
-        "LengthinUS": "NULL",
-        "YearsofExperience": "NULL",
-        "AvgTenure": "NULL"
-    }
+    result = OLD_DEFAULT_RESULT.copy()
     
     # Clean up content if it contains markdown code blocks
     if '```' in response_text:
         # Extract content from code blocks if present
-        code_block_pattern = r'```(?:json)?\s*([\s\S]*?)\s*```'
-        code_blocks = re.findall(code_block_pattern, response_text)
-        if code_blocks:
-            # Use the largest code block (assuming it's the most complete)
-            largest_block = max(code_blocks, key=len)
+        largest_block = largest_code_block(response_text)
+        if largest_block is not None:
             # Save the JSON from code block for analysis
             if save_debug:
                 code_path = os.path.join(os.path.dirname(__file__), f"debug_json_block_{debug_id}.json")
@@ -902,231 +1393,30 @@ def OLD_parse_unified_response_DO_NOT_USE(response_text, debug_mode=True, debug_
 
     # First, try to parse as JSON (which is our preferred format)
     try:
-        # Find JSON object in the response (look for everything between the first { and the last })
-        start_idx = response_text.find('{')
-        end_idx = response_text.rfind('}')
+        # Decode the JSON object starting at the first { in the response
+        # (plain-text answers without a { return None without raising)
+        parsed_json = extract_json_object(response_text)
         
-        if start_idx >= 0 and end_idx > start_idx:
-            json_str = response_text[start_idx:end_idx+1]
-            parsed_json = json.loads(json_str)
-            
+        if isinstance(parsed_json, dict):
             # Log the JSON structure
             top_level_keys = list(parsed_json.keys())
             logging.info(f"Successfully parsed JSON with top-level keys: {top_level_keys}")
             
-            # Look for direct matches first
-            for field in result.keys():
-                if field in parsed_json:
-                    # Only update if the JSON field has a value
-                    json_value = parsed_json[field]
-                    if json_value and json_value != "NULL":
-                        result[field] = json_value
-                        logging.info(f"Extracted '{field}' directly from JSON: '{json_value}'")
-
-            # Handle nested structure with PERSONAL_INFORMATION object
-            if 'PERSONAL_INFORMATION' in parsed_json:
-                logging.info("Found PERSONAL_INFORMATION in parsed JSON")
-                personal_info = parsed_json['PERSONAL_INFORMATION']
-                
-                # Handle Name object
-                if isinstance(personal_info, dict) and 'Name' in personal_info and isinstance(personal_info['Name'], dict):
-                    name_info = personal_info['Name']
-                    name_mapping = {
-                        'FirstName': 'FirstName',
-                        'MiddleName': 'MiddleName',
-                        'LastName': 'LastName'
-                    }
-                    for json_field, result_field in name_mapping.items():
-                        if json_field in name_info and name_info[json_field] and name_info[json_field] != "NULL":
-                            result[result_field] = name_info[json_field]
-                            logging.info(f"Extracted '{result_field}' from nested Name JSON: '{name_info[json_field]}'")
-                
-                # Handle Contact object
-                if isinstance(personal_info, dict) and 'Contact' in personal_info and isinstance(personal_info['Contact'], dict):
-                    contact_info = personal_info['Contact']
-                    contact_mapping = {
-                        'Phone': 'Phone1',
-                        'SecondaryPhone': 'Phone2',
-                        'Email': 'Email',
-                        'SecondaryEmail': 'Email2',
-                        'LinkedIn': 'LinkedIn',
-                        'Address': 'Address',
-                        'City': 'City',
-                        'State': 'State'
-                    }
-                    for json_field, result_field in contact_mapping.items():
-                        if json_field in contact_info and contact_info[json_field] and contact_info[json_field] != "NULL":
-                            result[result_field] = contact_info[json_field]
-                            logging.info(f"Extracted '{result_field}' from nested Contact JSON: '{contact_info[json_field]}'")
-                
-                # Handle Education object
-                if isinstance(personal_info, dict) and 'Education' in personal_info and isinstance(personal_info['Education'], dict):
-                    education_info = personal_info['Education']
-                    education_mapping = {
-                        'BachelorsDegree': 'Bachelors',
-                        'MastersDegree': 'Masters',
-                        'Certifications': 'Certifications'
-                    }
-                    for json_field, result_field in education_mapping.items():
-                        if json_field in education_info and education_info[json_field] and education_info[json_field] != "NULL":
-                            result[result_field] = education_info[json_field]
-                            logging.info(f"Extracted '{result_field}' from nested Education JSON: '{education_info[json_field]}'")
-            
-            # Handle WORK_HISTORY object
-            if 'WORK_HISTORY' in parsed_json and isinstance(parsed_json['WORK_HISTORY'], dict):
-                work_history = parsed_json['WORK_HISTORY']
-                
-                # Handle different company entries
-                company_prefixes = [
-                    ('MostRecent', 'MostRecent'),
-                    ('SecondMostRecent', 'SecondMostRecent'),
-                    ('ThirdMostRecent', 'ThirdMostRecent'),
-                    ('FourthMostRecent', 'FourthMostRecent'),
-                    ('FifthMostRecent', 'FifthMostRecent'),
-                    ('SixthMostRecent', 'SixthMostRecent'),
-                    ('SeventhMostRecent', 'SeventhMostRecent')
-                ]
-                
-                for json_prefix, result_prefix in company_prefixes:
-                    company_key = f"{json_prefix}Company"
-                    
-                    # Try to find either using the full key or within a nested object
-                    if company_key in work_history and work_history[company_key] and work_history[company_key] != "NULL":
-                        # Direct company entry
-                        result[f"{result_prefix}Company"] = work_history[company_key]
-                        logging.info(f"Extracted '{result_prefix}Company' from WORK_HISTORY: '{work_history[company_key]}'")
-                        
-                        # Look for related fields
-                        related_fields = {
-                            f"{json_prefix}StartDate": f"{result_prefix}StartDate",
-                            f"{json_prefix}EndDate": f"{result_prefix}EndDate",
-                            f"{json_prefix}Location": f"{result_prefix}Location"
-                        }
-                        
-                        for json_field, result_field in related_fields.items():
-                            if json_field in work_history and work_history[json_field] and work_history[json_field] != "NULL":
-                                result[result_field] = work_history[json_field]
-                                logging.info(f"Extracted '{result_field}' from WORK_HISTORY: '{work_history[json_field]}'")
-                    
-                    # Check if there's a nested object with the prefix
-                    elif json_prefix in work_history and isinstance(work_history[json_prefix], dict):
-                        company_info = work_history[json_prefix]
-                        field_mapping = {
-                            'Company': f"{result_prefix}Company",
-                            'StartDate': f"{result_prefix}StartDate",
-                            'EndDate': f"{result_prefix}EndDate",
-                            'Location': f"{result_prefix}Location"
-                        }
-                        
-                        for json_field, result_field in field_mapping.items():
-                            if json_field in company_info and company_info[json_field] and company_info[json_field] != "NULL":
-                                result[result_field] = company_info[json_field]
-                                logging.info(f"Extracted '{result_field}' from nested {json_prefix} JSON: '{company_info[json_field]}'")
-            
-            # Handle CAREER_INFO object
-            if 'CAREER_INFO' in parsed_json and isinstance(parsed_json['CAREER_INFO'], dict):
-                career_info = parsed_json['CAREER_INFO']
-                
-                # Handle job titles
-                title_mapping = {
-                    'PrimaryTitle': 'PrimaryTitle',
-                    'SecondaryTitle': 'SecondaryTitle',
-                    'TertiaryTitle': 'TertiaryTitle',
-                    'PrimaryIndustry': 'PrimaryIndustry',
-                    'SecondaryIndustry': 'SecondaryIndustry',
-                    'TopSkills': 'Top10Skills'
-                }
-                
-                for json_field, result_field in title_mapping.items():
-                    if json_field in career_info:
-                        if career_info[json_field] and career_info[json_field] != "NULL":
-                            result[result_field] = career_info[json_field]
-                            logging.info(f"Extracted '{result_field}' from CAREER_INFO: '{career_info[json_field]}'")
-                        else:
-                            # Still map the field even if it's NULL, to ensure the field exists in the result
-                            result[result_field] = "NULL"
-                            logging.info(f"Field '{json_field}' is NULL, mapping to '{result_field}'")
-            
-            # Handle TECHNICAL_INFO object
-            if 'TECHNICAL_INFO' in parsed_json and isinstance(parsed_json['TECHNICAL_INFO'], dict):
-                tech_info = parsed_json['TECHNICAL_INFO']
-                
-                # Handle programming languages
-                lang_mapping = {
-                    'PrimaryLanguage': 'PrimarySoftwareLanguage',
-                    'SecondaryLanguage': 'SecondarySoftwareLanguage',
-                    'TertiaryLanguage': 'TertiarySoftwareLanguage'
-                }
-                
-                for json_field, result_field in lang_mapping.items():
-                    if json_field in tech_info:
-                        if tech_info[json_field] and tech_info[json_field] != "NULL":
-                            result[result_field] = tech_info[json_field]
-                            logging.info(f"Extracted '{result_field}' from TECHNICAL_INFO: '{tech_info[json_field]}'")
-                        else:
-                            # Still map the field even if it's NULL, to ensure the field exists in the result
-                            result[result_field] = "NULL"
-                            logging.info(f"Field '{json_field}' is NULL, mapping to '{result_field}'")
-                
-                # Handle software applications
-                software_mapping = {
-                    'SoftwareApp1': 'SoftwareApp1',
-                    'SoftwareApp2': 'SoftwareApp2',
-                    'SoftwareApp3': 'SoftwareApp3',
-                    'SoftwareApp4': 'SoftwareApp4',
-                    'SoftwareApp5': 'SoftwareApp5'
-                }
-                
-                for json_field, result_field in software_mapping.items():
-                    if json_field in tech_info:
-                        if tech_info[json_field] and tech_info[json_field] != "NULL":
-                            result[result_field] = tech_info[json_field]
-                            logging.info(f"Extracted '{result_field}' from TECHNICAL_INFO: '{tech_info[json_field]}'")
-                        else:
-                            # Still map the field even if it's NULL, to ensure the field exists in the result
-                            result[result_field] = "NULL"
-                            logging.info(f"Field '{json_field}' is NULL, mapping to '{result_field}'")
-                
-                # Handle hardware
-                hardware_mapping = {
-                    'Hardware1': 'Hardware1',
-                    'Hardware2': 'Hardware2',
-                    'Hardware3': 'Hardware3',
-                    'Hardware4': 'Hardware4',
-                    'Hardware5': 'Hardware5'
-                }
-                
-                for json_field, result_field in hardware_mapping.items():
-                    if json_field in tech_info:
-                        if tech_info[json_field] and tech_info[json_field] != "NULL":
-                            result[result_field] = tech_info[json_field]
-                            logging.info(f"Extracted '{result_field}' from TECHNICAL_INFO: '{tech_info[json_field]}'")
-                        else:
-                            # Still map the field even if it's NULL, to ensure the field exists in the result
-                            result[result_field] = "NULL"
-                            logging.info(f"Field '{json_field}' is NULL, mapping to '{result_field}'")
-                
-                # Handle categories and other fields
-                other_tech_mapping = {
-                    'PrimaryCategory': 'PrimaryCategory',
-                    'SecondaryCategory': 'SecondaryCategory',
-                    'ProjectTypes': 'ProjectTypes',
-                    'Specialty': 'Specialty',
-                    'Summary': 'Summary',
-                    'LengthInUS': 'LengthinUS',
-                    'YearsOfExperience': 'YearsofExperience',
-                    'AvgTenure': 'AvgTenure'
-                }
-                
-                for json_field, result_field in other_tech_mapping.items():
-                    if json_field in tech_info:
-                        if tech_info[json_field] and tech_info[json_field] != "NULL":
-                            result[result_field] = tech_info[json_field]
-                            logging.info(f"Extracted '{result_field}' from TECHNICAL_INFO: '{tech_info[json_field]}'")
-                        else:
-                            # Still map the field even if it's NULL, to ensure the field exists in the result
-                            result[result_field] = "NULL"
-                            logging.info(f"Field '{json_field}' is NULL, mapping to '{result_field}'")
+            # Direct matches at the top level
+            for field, json_value in parsed_json.items():
+                if field in result and json_value and json_value != "NULL":
+                    result[field] = json_value
+
+            # Nested sections in one pass over the flattened path map
+            for path, result_field in OLD_JSON_FIELD_PATHS:
+                json_value = _walk_json_path(parsed_json, path)
+                if json_value is _MISSING:
+                    continue
+                if json_value and json_value != "NULL":
+                    result[result_field] = json_value
+                elif path[0] in OLD_JSON_NULL_SECTIONS:
+                    # Still map the field even if it's NULL, to ensure the field exists in the result
+                    result[result_field] = "NULL"
             
             # Count JSON fields
             json_fields_count = sum(1 for val in result.values() if val != "NULL")
@@ -1138,149 +1428,119 @@ def OLD_parse_unified_response_DO_NOT_USE(response_text, debug_mode=True, debug_
             else:
                 logging.warning("No fields extracted from JSON, falling back to text parsing")
                 
-    except (json.JSONDecodeError, Exception) as e:
+    except json.JSONDecodeError as e:
         logging.warning(f"JSON parsing failed: {str(e)}, falling back to text parsing")
     
     # If JSON parsing failed or no fields were extracted, fall back to text parsing
-    # Define patterns for extracting data from response
-    patterns = {
-        # (the rest of your patterns remain the same)
-        # Step 1 patterns - Personal Info
-        "PrimaryTitle": [r"- Best job title that fit their primary experience:\s*(.+)"],
-        "SecondaryTitle": [r"- Best secondary job title that fits their secondary experience.*?:\s*(.+)"],
-        "TertiaryTitle": [r"- Best tertiary job title that fits their tertiary experience.*?:\s*(.+)"],
-        "Address": [r"- Their street address:\s*(.+)"],
-        "City": [r"- Their City:\s*(.+)"],
-        "State": [r"- Their State:\s*(.+)"],
-        "Certifications": [r"- Their Certifications Listed:\s*(.+)"],
-        "Bachelors": [r"- Their Bachelor's Degree:\s*(.+)"],
-        "Masters": [r"- Their Master's Degree:\s*(.+)"],
-        "Phone1": [r"- Their Phone Number:\s*(.+)"],
-        "Phone2": [r"- Their Second Phone Number:\s*(.+)"],
-        "Email": [r"- Their Email:\s*(.+)"],
-        "Email2": [r"- Their Second Email:\s*(.+)"],
-        "FirstName": [r"- Their First Name:\s*(.+)"],
-        "MiddleName": [r"- Their Middle Name:\s*(.+)"],
-        "LastName": [r"- Their Last Name:\s*(.+)"],
-        "LinkedIn": [r"- Their Linkedin URL:\s*(.+)"],
-        
-        # Step 1 patterns - Work History
-        "MostRecentCompany": [r"- Most Recent Company Worked for:\s*(.+)"],
-        "MostRecentStartDate": [r"- Most Recent Start Date.*?:\s*(.+)"],
-        "MostRecentEndDate": [r"- Most Recent End Date.*?:\s*(.+)"],
-        "MostRecentLocation": [r"- Most Recent Job Location.*?:\s*(.+)"],
-        "SecondMostRecentCompany": [r"- Second Most Recent Company Worked for:\s*(.+)"],
-        "SecondMostRecentStartDate": [r"- Second Most Recent Start Date.*?:\s*(.+)"],
-        "SecondMostRecentEndDate": [r"- Second Most Recent End Date.*?:\s*(.+)"],
-        "SecondMostRecentLocation": [r"- Second Most Recent Job Location.*?:\s*(.+)"],
-        "ThirdMostRecentCompany": [r"- Third Most Recent Company Worked for:\s*(.+)"],
-        "ThirdMostRecentStartDate": [r"- Third Most Recent Start Date.*?:\s*(.+)"],
-        "ThirdMostRecentEndDate": [r"- Third Most Recent End Date.*?:\s*(.+)"],
-        "ThirdMostRecentLocation": [r"- Third Most Recent Job Location.*?:\s*(.+)"],
-        "FourthMostRecentCompany": [r"- Fourth Most Recent Company Worked for:\s*(.+)"],
-        "FourthMostRecentStartDate": [r"- Fourth Most Recent Start Date.*?:\s*(.+)"],
-        "FourthMostRecentEndDate": [r"- Fourth Most Recent End Date.*?:\s*(.+)"],
-        "FourthMostRecentLocation": [r"- Fourth Most Recent Job Location.*?:\s*(.+)"],
-        "FifthMostRecentCompany": [r"- Fifth Most Recent Company Worked for:\s*(.+)"],
-        "FifthMostRecentStartDate": [r"- Fifth Most Recent Start Date.*?:\s*(.+)"],
-        "FifthMostRecentEndDate": [r"- Fifth Most Recent End Date.*?:\s*(.+)"],
-        "FifthMostRecentLocation": [r"- Fifth Most Recent Job Location.*?:\s*(.+)"],
-        "SixthMostRecentCompany": [r"- Sixth Most Recent Company Worked for:\s*(.+)"],
-        "SixthMostRecentStartDate": [r"- Sixth Most Recent Start Date.*?:\s*(.+)"],
-        "SixthMostRecentEndDate": [r"- Sixth Most Recent End Date.*?:\s*(.+)"],
-        "SixthMostRecentLocation": [r"- Sixth Most Recent Job Location.*?:\s*(.+)"],
-        "SeventhMostRecentCompany": [r"- Seventh Most Recent Company Worked for:\s*(.+)"],
-        "SeventhMostRecentStartDate": [r"- Seventh Most Recent Start Date.*?:\s*(.+)"],
-        "SeventhMostRecentEndDate": [r"- Seventh Most Recent End Date.*?:\s*(.+)"],
-        "SeventhMostRecentLocation": [r"- Seventh Most Recent Job Location.*?:\s*(.+)"],
-        
-        # Step 1 patterns - Industry and Skills
-        "PrimaryIndustry": [r"- Based on all 7 of their most recent companies above, what is the Primary industry they work in:\s*(.+)"],
-        "SecondaryIndustry": [r"- Based on all 7 of their most recent companies above, what is the Secondary industry they work in:\s*(.+)"],
-        "Top10Skills": [r"- Top 10 Technical Skills:\s*(.+)"],
-        
-        # Step 2 patterns - Technical Info
-        "PrimarySoftwareLanguage": [r"- What technical language do they use most often\?:\s*(.+)"],
-        "SecondarySoftwareLanguage": [r"- What technical language do they use second most often\?:\s*(.+)"],
-        "TertiarySoftwareLanguage": [r"- What technical language do they use third most often\?:\s*(.+)"],
-        "SoftwareApp1": [r"- What software do they talk about using the most\?:\s*(.+)"],
-        "SoftwareApp2": [r"- What software do they talk about using the second most\?:\s*(.+)"],
-        "SoftwareApp3": [r"- What software do they talk about using the third most\?:\s*(.+)"],
-        "SoftwareApp4": [r"- What software do they talk about using the fourth most\?:\s*(.+)"],
-        "SoftwareApp5": [r"- What software do they talk about using the fifth most\?:\s*(.+)"],
-        "Hardware1": [r"- What physical hardware do they talk about using the most\?:\s*(.+)"],
-        "Hardware2": [r"- What physical hardware do they talk about using the second most\?:\s*(.+)"],
-        "Hardware3": [r"- What physical hardware do they talk about using the third most\?:\s*(.+)"],
-        "Hardware4": [r"- What physical hardware do they talk about using the fourth most\?:\s*(.+)"],
-        "Hardware5": [r"- What physical hardware do they talk about using the fifth most\?:\s*(.+)"],
-        "PrimaryCategory": [r"- Based on their experience, put them in a primary technical category if they are technical or functional category if they are functional:\s*(.+)"],
-        "SecondaryCategory": [r"- Based on their experience, put them in a subsidiary technical category if they are technical or functional category if they are functional:\s*(.+)"],
-        "ProjectTypes": [r"- Types of projects they have worked on:\s*(.+)"],
-        "Specialty": [r"- Based on their skills, categories, certifications, and industries, determine what they specialize in:\s*(.+)"],
-        "Summary": [r"- Based on all this knowledge, write a summary of this candidate.*?:\s*(.+)"],
-        "LengthinUS": [r"- How long have they lived in the United States.*?:\s*(.+)"],
-        "YearsofExperience": [r"- Total years of professional experience.*?:\s*(.+)"],
-        "AvgTenure": [r"- Average tenure at companies in years.*?:\s*(.+)"]
-    }
-    
-    # Process the response line by line to cleanly extract each field
-    lines = response_text.split('\n')
-    
-    # Process each line of the response
-    for line in lines:
-        line = line.strip()
-        if not line or not line.startswith('-'):
-            continue
-        
-        # Extract the question and answer parts
-        parts = line.split(':', 1)  # Split only on the first colon
-        if len(parts) != 2:
-            continue
-            
-        question = parts[0].strip()
-        answer = parts[1].strip()
+    # Find every "- question: answer" line in one scan of the response
+    for line_match in OLD_TEXT_LINE_PATTERN.finditer(response_text):
+        # The question runs up to the first colon on the line
+        question = line_match.group(1).strip()
+        answer = line_match.group(2).strip()
         
         # Skip empty or NULL answers
         if not answer or answer.upper() == 'NULL':
             continue
             
         # Match the question to the correct field
-        matched = False
-        for field, pattern_list in patterns.items():
-            for pattern in pattern_list:
-                if re.search(pattern, question, re.DOTALL):
-                    result[field] = answer
-                    logging.info(f"Extracted '{field}': '{answer}'")
-                    matched = True
+        field = OLD_TEXT_QUESTION_FIELDS.get(question)
+        if field is None:
+            for prefix, prefix_field in OLD_TEXT_QUESTION_PREFIXES.get(question[:OLD_TEXT_PREFIX_BUCKET_LENGTH], ()):
+                if question.startswith(prefix):
+                    field = prefix_field
                     break
-            if matched:
-                break
+        if field is not None:
+            result[field] = answer
+            logging.info("Extracted '%s': '%s'", field, answer)
     
     # Count how many fields we successfully extracted
     populated_fields = sum(1 for val in result.values() if val != "NULL")
     logging.info(f"Successfully extracted {populated_fields} fields out of {len(result)} fields")
     
-    # Additional logging to help diagnose field extraction issues
-    step1_fields_count = sum(1 for field, val in result.items() 
-                          if val != "NULL" and field not in ["PrimarySoftwareLanguage", "SecondarySoftwareLanguage", 
-                                                            "TertiarySoftwareLanguage", "SoftwareApp1", "SoftwareApp2", 
-                                                            "SoftwareApp3", "SoftwareApp4", "SoftwareApp5",
-                                                            "Hardware1", "Hardware2", "Hardware3", "Hardware4", "Hardware5",
-                                                            "PrimaryCategory", "SecondaryCategory", "ProjectTypes", 
-                                                            "Specialty", "Summary", "LengthinUS", "YearsofExperience", "AvgTenure"])
-    step2_fields_count = sum(1 for field, val in result.items() 
-                          if val != "NULL" and field in ["PrimarySoftwareLanguage", "SecondarySoftwareLanguage", 
-                                                        "TertiarySoftwareLanguage", "SoftwareApp1", "SoftwareApp2", 
-                                                        "SoftwareApp3", "SoftwareApp4", "SoftwareApp5",
-                                                        "Hardware1", "Hardware2", "Hardware3", "Hardware4", "Hardware5",
-                                                        "PrimaryCategory", "SecondaryCategory", "ProjectTypes", 
-                                                        "Specialty", "Summary", "LengthinUS", "YearsofExperience", "AvgTenure"])
-    
-    logging.info(f"Step 1 fields extracted: {step1_fields_count}, Step 2 fields extracted: {step2_fields_count}")
+    # Additional logging to help diagnose field extraction issues (skipped when INFO is filtered out)
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        step1_fields_count = 0
+        step2_fields_count = 0
+        for field, val in result.items():
+            if val != "NULL":
+                if field in OLD_STEP2_FIELDS:
+                    step2_fields_count += 1
+                else:
+                    step1_fields_count += 1
+        
+        logging.info(f"Step 1 fields extracted: {step1_fields_count}, Step 2 fields extracted: {step2_fields_count}")
     
     return result
 
-def process_unified_results(results: List[Dict], resume_map: Dict[int, str], debug_mode=True, debug_limit=20) -> Dict[int, Dict]:
+# Where the answer text can sit in a batch output record, most common layout first
+RESPONSE_CONTENT_PATHS = (
+    ("response", "body", "choices", 0, "message", "content"),
+    ("response", "body", "choices", 0, "content"),
+    ("response", "body", "content"),
+    ("response", "content"),
+    ("response", "message", "content"),
+    ("content",),
+)
+
+def _content_at_path(data, path: Tuple) -> Optional[str]:
+    """Follow path through nested dicts and lists, returning the string found there or None"""
+    for key in path:
+        if isinstance(key, int):
+            if not isinstance(data, list) or len(data) <= key:
+                return None
+            data = data[key]
+        elif isinstance(data, dict):
+            data = data.get(key, _MISSING)
+            if data is _MISSING:
+                return None
+        else:
+            return None
+    return data if isinstance(data, str) else None
+
+def parse_text_answer(userid: int, text: str) -> Optional[Dict]:
+    """Parse one labeled-text answer, logging and returning None if it fails"""
+    try:
+        return parse_unified_response(text)
+    except Exception as e:
+        logging.error(f"Error parsing text answer for UserID {userid}: {str(e)}")
+        return None
+
+def parse_text_answers(answers: List[Tuple[int, str]]) -> Dict[int, Dict]:
+    """
+    Parse labeled-text answers with parse_unified_response
+    
+    Parsing is pure CPU work in the interpreter, so results files with at least
+    TEXT_PARSE_PROCESS_MIN text answers are spread over PREP_WORKERS processes.
+    The workers are spawned rather than forked because this process already
+    runs thread pools.
+    
+    Args:
+        answers: List of (userid, answer text) pairs
+        
+    Returns:
+        Dictionary mapping userids to extracted fields. Answers that fail to
+        parse are logged and left out.
+    """
+    userids = [userid for userid, _ in answers]
+    texts = [text for _, text in answers]
+    parsed = None
+    
+    if len(texts) >= TEXT_PARSE_PROCESS_MIN and PREP_WORKERS > 1:
+        chunksize = max(1, len(texts) // (PREP_WORKERS * 4))
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=PREP_WORKERS,
+                                                        mp_context=multiprocessing.get_context("spawn")) as executor:
+                parsed = list(executor.map(parse_text_answer, userids, texts, chunksize=chunksize))
+        except concurrent.futures.process.BrokenProcessPool as e:
+            logging.warning(f"Text parser worker processes failed ({e}), parsing in this process")
+    
+    if parsed is None:
+        parsed = list(map(parse_text_answer, userids, texts))
+    
+    return {userid: fields for userid, fields in zip(userids, parsed) if fields is not None}
+
+def process_unified_results(results: List[Dict], resume_map: Dict[int, str], debug_mode=True, debug_limit=20,
+                            missing_userids: Optional[List[int]] = None) -> Dict[int, Dict]:
     """
     Process the results from unified batch processing
     
@@ -1289,33 +1549,42 @@ def process_unified_results(results: List[Dict], resume_map: Dict[int, str], deb
         resume_map: Dictionary mapping userids to resume texts
         debug_mode: Whether to generate debug files
         debug_limit: Maximum number of debug files to generate per batch
+        missing_userids: Optional list that collects the userids of multi-resume
+            requests that came back without an answer for them (failed requests
+            and missing blocks), so the caller can resend them
         
     Returns:
-        Dictionary mapping userids to processed results
+        Dictionary mapping userids to aicandidate update rows (see candidate_update_row)
     """
     processed_results = {}
+    text_answers = []  # (userid, answer text) pairs for parse_text_answers
+    if missing_userids is None:
+        missing_userids = []
     
     for result in results:
         try:
-            # Extract userid from custom_id (format: unified_<userid>)
+            # Extract userids from custom_id (format: unified_<userid> or multi_<userid>_<userid>...)
             custom_id = result.get("custom_id", "")
-            if not custom_id.startswith("unified_"):
+            userids = userids_from_custom_id(custom_id)
+            if not userids:
                 logging.warning(f"Unexpected custom_id format: {custom_id}")
                 continue
                 
-            userid = int(custom_id.split("_")[1])
+            userid = userids[0]
             
             # Check for errors
             error = result.get("error")
             if error:
-                logging.error(f"Error in unified processing for UserID {userid}: {error}")
+                logging.error(f"Error in unified processing for UserIDs {userids}: {error}")
+                if len(userids) > 1:
+                    missing_userids.extend(userids)
                 continue
                 
             # Extract the response content
             # Extract content from batch API response
             try:
                 # Log the raw result structure for debugging
-                logging.info(f"Response structure for UserID {userid}: {json.dumps(list(result.keys()))}")
+                logging.debug("Response structure for UserID %s: %s", userid, result.keys())
                 
                 # The API response structure is typically:
                 # {
@@ -1329,114 +1598,49 @@ def process_unified_results(results: List[Dict], resume_map: Dict[int, str], deb
                 #    }
                 # }
                 
-                # Initialize content
+                # Batch output may carry the response or its body as a JSON string;
+                # decode those once so the content paths can walk plain dicts
                 content = ""
+                parsed_response = None
+                response_obj = result.get("response")
+                if isinstance(response_obj, str):
+                    try:
+                        parsed_response = load_json(response_obj)
+                        response_obj = {"body": parsed_response}
+                    except json.JSONDecodeError:
+                        content = response_obj
+                        logging.info(f"Using response_obj string directly as content for UserID {userid}")
+                elif isinstance(response_obj, dict) and isinstance(response_obj.get("body"), str):
+                    try:
+                        response_obj = {**response_obj, "body": load_json(response_obj["body"])}
+                    except json.JSONDecodeError:
+                        content = response_obj["body"]
+                        logging.info(f"Body is a direct string for UserID {userid}")
                 
-                # First, try the typical OpenAI response structure
-                if "response" in result:
-                    response_obj = result.get("response", {})
-                    
-                    if isinstance(response_obj, dict):
-                        # Standard OpenAI API format for batch API
-                        if "body" in response_obj:
-                            body = response_obj.get("body", {})
-                            
-                            # The body might be a string that needs parsing
-                            if isinstance(body, str):
-                                try:
-                                    # Try to parse it as JSON
-                                    body_obj = json.loads(body)
-                                    body = body_obj
-                                    logging.info(f"Successfully parsed body string as JSON for UserID {userid}")
-                                except json.JSONDecodeError:
-                                    # Keep it as a string if it's not JSON
-                                    content = body
-                                    logging.info(f"Body is a direct string for UserID {userid}")
-                            
-                            # Extract content from parsed body
-                            if isinstance(body, dict):
-                                # Standard OpenAI format with choices
-                                if "choices" in body:
-                                    choices = body.get("choices", [])
-                                    if choices and len(choices) > 0:
-                                        # Standard OpenAI response format
-                                        choice = choices[0]
-                                        
-                                        if isinstance(choice, dict):
-                                            if "message" in choice:
-                                                message = choice.get("message", {})
-                                                if isinstance(message, dict) and "content" in message:
-                                                    content = message.get("content", "")
-                                                    logging.info(f"Found content in choices[0].message.content for UserID {userid}")
-                                            elif "content" in choice:
-                                                # Direct content in choice
-                                                content = choice.get("content", "")
-                                                logging.info(f"Found content in choices[0].content for UserID {userid}")
-                                
-                                # Another format: content directly in body
-                                elif "content" in body:
-                                    content = body.get("content", "")
-                                    logging.info(f"Found content directly in body for UserID {userid}")
-                        
-                        # Try to find content directly in response_obj
-                        elif not content and "content" in response_obj:
-                            content = response_obj.get("content", "")
-                            logging.info(f"Found content directly in response_obj for UserID {userid}")
-                        
-                        # Try message format directly in response_obj
-                        elif not content and "message" in response_obj:
-                            message = response_obj.get("message", {})
-                            if isinstance(message, dict) and "content" in message:
-                                content = message.get("content", "")
-                                logging.info(f"Found content in response_obj.message.content for UserID {userid}")
-                    
-                    # If response_obj itself is a string
-                    elif isinstance(response_obj, str):
-                        # Try to parse it as JSON
-                        try:
-                            response_json = json.loads(response_obj)
-                            # Log the keys to help diagnose
-                            logging.info(f"Parsed response_obj string as JSON with keys: {list(response_json.keys())}")
-                            
-                            # Try standard OpenAI response structure
-                            if "choices" in response_json:
-                                choices = response_json.get("choices", [])
-                                if choices and len(choices) > 0:
-                                    choice = choices[0]
-                                    if isinstance(choice, dict) and "message" in choice:
-                                        message = choice.get("message", {})
-                                        if isinstance(message, dict) and "content" in message:
-                                            content = message.get("content", "")
-                                            logging.info(f"Found content in parsed response string for UserID {userid}")
-                            
-                            # If we still don't have content, try to use the whole object
-                            if not content:
-                                content = json.dumps(response_json)
-                                logging.info(f"Using entire parsed response object as content for UserID {userid}")
-                        except json.JSONDecodeError:
-                            # If it's not JSON, use it directly
-                            content = response_obj
-                            logging.info(f"Using response_obj string directly as content for UserID {userid}")
+                if not content:
+                    envelope = {**result, "response": response_obj}
+                    for path in RESPONSE_CONTENT_PATHS:
+                        found = _content_at_path(envelope, path)
+                        if found:
+                            content = found
+                            logging.info("Found content at %s for UserID %s", path, userid)
+                            break
                 
-                # If we don't have content yet, look for any "content" key in the result
                 if not content:
-                    # Try to find content field anywhere in the result
-                    if "content" in result:
-                        content = result.get("content", "")
-                        logging.info(f"Found content directly in result for UserID {userid}")
+                    if parsed_response is not None:
+                        content = dump_json(parsed_response)
+                        logging.info(f"Using entire parsed response object as content for UserID {userid}")
                     else:
                         # Last resort: use the entire result
-                        content = json.dumps(result)
+                        content = dump_json(result)
                         logging.warning(f"Using entire result as content for UserID {userid}")
                 
                 # Clean up content if it contains markdown code blocks
                 if content.startswith('```') and '```' in content:
                     # Extract content from code blocks
-                    code_block_pattern = r'```(?:json)?\s*([\s\S]*?)\s*```'
-                    code_blocks = re.findall(code_block_pattern, content)
-                    if code_blocks:
-                        # Use the largest code block (assuming it's the most complete)
-                        content = max(code_blocks, key=len)
+                    largest_block = largest_code_block(content)
+                    if largest_block is not None:
+                        content = largest_block
                         logging.info(f"Extracted content from markdown code block for UserID {userid}")
                 
                 # Debugging is now handled by parse_unified_response based on debug settings
@@ -1456,112 +1660,45 @@ def process_unified_results(results: List[Dict], resume_map: Dict[int, str], deb
             
             if not content:
                 logging.error(f"No content found in unified result for UserID {userid}")
+                if len(userids) > 1:
+                    missing_userids.extend(userids)
+                continue
+
+            # Multi-resume requests: split into per-resume blocks and parse each one
+            if len(userids) > 1:
+                structured_blocks = split_multi_resume_json(content, userids)
+                if structured_blocks is not None:
+                    missing_userids.extend(userid for userid in userids if userid not in structured_blocks)
+                    for block_userid, structured_results in structured_blocks.items():
+                        processed_results[block_userid] = finish_candidate_result(block_userid, structured_results, "structured multi-resume result")
+                    continue
+                blocks = split_multi_resume_content(content, userids)
+                missing_userids.extend(userid for userid in userids if userid not in blocks)
+                text_answers.extend(blocks.items())
                 continue
+
+            # Structured-output responses are already keyed by database field
+            if content.lstrip().startswith('{'):
+                structured_results = parse_unified_json_response(content)
+                if structured_results is not None:
+                    processed_results[userid] = finish_candidate_result(userid, structured_results, "structured result")
+                    continue
                 
             # Since we're not using JSON format instruction anymore,
             # we expect text-based responses, not JSON
             # But still try JSON parsing in case the model returns JSON anyway
-            content_fixed = re.sub(r'\bNULL\b', '"NULL"', content)
-
-            # Try to parse as JSON if the model returns it
-            parsed_results = {}
             json_parsed = False
 
             if content.strip().startswith('{'):
                 try:
-                    json_data = json.loads(content_fixed)
+                    # Quote bare NULLs only for JSON-looking answers; text answers don't need it
+                    content_fixed = BARE_NULL_PATTERN.sub('"NULL"', content) if 'NULL' in content else content
+                    json_data = load_json(content_fixed)
                     logging.info(f"Successfully parsed JSON response for UserID {userid}")
                     json_parsed = True
 
                     # Map the nested JSON structure to database fields
-                    if isinstance(json_data, dict):
-                        # Personal Information
-                        if "PERSONAL_INFORMATION" in json_data:
-                            personal = json_data["PERSONAL_INFORMATION"]
-                        if "Name" in personal:
-                            parsed_results["FirstName"] = personal["Name"].get("FirstName")
-                            parsed_results["MiddleName"] = personal["Name"].get("MiddleName")
-                            parsed_results["LastName"] = personal["Name"].get("LastName")
-                        if "Contact" in personal:
-                            parsed_results["Phone1"] = personal["Contact"].get("Phone")
-                            parsed_results["Phone2"] = personal["Contact"].get("SecondaryPhone")
-                            parsed_results["Email"] = personal["Contact"].get("Email")
-                            parsed_results["Email2"] = personal["Contact"].get("SecondaryEmail")
-                            parsed_results["LinkedIn"] = personal["Contact"].get("LinkedIn")
-                            parsed_results["Address"] = personal["Contact"].get("Address")
-                            parsed_results["City"] = personal["Contact"].get("City")
-                            parsed_results["State"] = personal["Contact"].get("State")
-                        if "Education" in personal:
-                            parsed_results["Bachelors"] = personal["Education"].get("BachelorsDegree")
-                            parsed_results["Masters"] = personal["Education"].get("MastersDegree")
-                            parsed_results["Certifications"] = personal["Education"].get("Certifications")
-
-                    # Work History
-                    if "WORK_HISTORY" in json_data:
-                        work = json_data["WORK_HISTORY"]
-                        work_fields = [
-                            ("MostRecent", "MostRecent"),
-                            ("SecondMostRecent", "SecondMostRecent"),
-                            ("ThirdMostRecent", "ThirdMostRecent"),
-                            ("FourthMostRecent", "FourthMostRecent"),
-                            ("FifthMostRecent", "FifthMostRecent"),
-                            ("SixthMostRecent", "SixthMostRecent"),
-                            ("SeventhMostRecent", "SeventhMostRecent")
-                        ]
-                        for json_key, db_prefix in work_fields:
-                            if json_key in work and work[json_key]:
-                                parsed_results[f"{db_prefix}Company"] = work[json_key].get("Company")
-                                parsed_results[f"{db_prefix}StartDate"] = work[json_key].get("StartDate")
-                                parsed_results[f"{db_prefix}EndDate"] = work[json_key].get("EndDate")
-                                parsed_results[f"{db_prefix}Location"] = work[json_key].get("Location")
-
-                    # Career Info
-                    if "CAREER_INFO" in json_data:
-                        career = json_data["CAREER_INFO"]
-                        parsed_results["PrimaryTitle"] = career.get("PrimaryTitle")
-                        parsed_results["SecondaryTitle"] = career.get("SecondaryTitle")
-                        parsed_results["TertiaryTitle"] = career.get("TertiaryTitle")
-                        parsed_results["PrimaryIndustry"] = career.get("PrimaryIndustry")
-                        parsed_results["SecondaryIndustry"] = career.get("SecondaryIndustry")
-
-                        # Handle TopSkills - can be either array or comma-separated string
-                        top_skills = career.get("TopSkills")
-                        if top_skills:
-                            if isinstance(top_skills, list):
-                                # It's already an array
-                                skills = top_skills
-                                parsed_results["Top10Skills"] = ", ".join(skills[:10])
-                            else:
-                                # It's a string
-                                parsed_results["Top10Skills"] = top_skills
-                                skills = [s.strip() for s in top_skills.split(",")]
-
-                            # Parse skills into individual fields
-                            for i, skill in enumerate(skills[:10], 1):
-                                parsed_results[f"Skill{i}"] = skill
-
-                    # Technical Info
-                    if "TECHNICAL_INFO" in json_data:
-                        tech = json_data["TECHNICAL_INFO"]
-                        parsed_results["PrimarySoftwareLanguage"] = tech.get("PrimaryLanguage")
-                        parsed_results["SecondarySoftwareLanguage"] = tech.get("SecondaryLanguage")
-                        parsed_results["TertiarySoftwareLanguage"] = tech.get("TertiaryLanguage")
-                        for i in range(1, 6):
-                            parsed_results[f"SoftwareApp{i}"] = tech.get(f"SoftwareApp{i}")
-                            parsed_results[f"Hardware{i}"] = tech.get(f"Hardware{i}")
-                        parsed_results["PrimaryCategory"] = tech.get("PrimaryCategory")
-                        parsed_results["SecondaryCategory"] = tech.get("SecondaryCategory")
-                        parsed_results["ProjectTypes"] = tech.get("ProjectTypes")
-                        parsed_results["Specialty"] = tech.get("Specialty")
-                        parsed_results["Summary"] = tech.get("Summary")
-                        parsed_results["LengthinUS"] = tech.get("LengthInUS")
-                        parsed_results["YearsofExperience"] = tech.get("YearsOfExperience")
-                        parsed_results["AvgTenure"] = tech.get("AvgTenure")
-
-                    # Clean up NULL values
-                    for key, value in parsed_results.items():
-                        if value == "NULL" or value == "null":
-                            parsed_results[key] = None
+                    parsed_results = map_unified_json_sections(json_data) if isinstance(json_data, dict) else {}
 
                     logging.info(f"Extracted {len(parsed_results)} fields from JSON for UserID {userid}")
 
@@ -1569,211 +1706,206 @@ def process_unified_results(results: List[Dict], resume_map: Dict[int, str], deb
                     logging.warning(f"JSON parsing failed for UserID {userid}: {e}")
                     json_parsed = False
 
-            # If JSON parsing didn't work or wasn't attempted, use text parser
+            # If JSON parsing didn't work or wasn't attempted, queue the answer for the text parser
             if not json_parsed:
-                logging.info(f"Using text parser for UserID {userid}")
-
-                # Use the EXACT SAME parser as single_step_processor
-                # Already imported at the top of the file!
-                parsed_results = parse_unified_response(content)
-
-                logging.info(f"Extracted {len(parsed_results)} fields from unified parser for UserID {userid}")
+                text_answers.append((userid, content))
+                continue
 
-            # Apply enhanced date processing
-            enhanced_results = process_resume_with_enhanced_dates(userid, parsed_results)
-            
-            # Store the final results
-            processed_results[userid] = enhanced_results
-            
-            logging.info(f"Processed unified results for UserID {userid}: {len(enhanced_results)} fields extracted")
+            # Apply enhanced date processing and store the update row
+            processed_results[userid] = finish_candidate_result(userid, parsed_results, "unified results")
             
         except Exception as e:
             userid_info = f"UserID {userid}" if 'userid' in locals() else "Unknown UserID"
             logging.error(f"Error processing unified result for {userid_info}: {str(e)}")
     
-    return processed_results
+    # Labeled-text answers are parsed together so large files can use worker processes
+    if text_answers:
+        logging.info(f"Using text parser for {len(text_answers)} answers")
+        for userid, parsed_results in parse_text_answers(text_answers).items():
+            try:
+                processed_results[userid] = finish_candidate_result(userid, parsed_results, "unified results")
+            except Exception as e:
+                logging.error(f"Error processing unified result for UserID {userid}: {str(e)}")
+    
+    return processed_results
+
+# Columns written by update_database_with_results, in update order
+_UPDATE_JOB_PREFIXES = ('MostRecent', 'SecondMostRecent', 'ThirdMostRecent', 'FourthMostRecent',
+                        'FifthMostRecent', 'SixthMostRecent', 'SeventhMostRecent')
+SKILL_FIELDS = tuple(f"Skill{i}" for i in range(1, 11))
+CANDIDATE_UPDATE_FIELDS = (
+    "PrimaryTitle", "SecondaryTitle", "TertiaryTitle",
+    "Address", "City", "State",
+    "Certifications", "Bachelors", "Masters",
+    "Phone1", "Phone2", "Email", "Email2",
+    "FirstName", "MiddleName", "LastName", "Linkedin",
+    *(f"{prefix}{suffix}" for prefix in _UPDATE_JOB_PREFIXES
+      for suffix in ("Company", "StartDate", "EndDate", "Location")),
+    "PrimaryIndustry", "SecondaryIndustry",
+    *SKILL_FIELDS,
+    "PrimarySoftwareLanguage", "SecondarySoftwareLanguage", "TertiarySoftwareLanguage",
+    *(f"SoftwareApp{i}" for i in range(1, 6)),
+    *(f"Hardware{i}" for i in range(1, 6)),
+    "PrimaryCategory", "SecondaryCategory", "ProjectTypes",
+    "Specialty", "Summary", "LengthinUS", "YearsofExperience", "AvgTenure"
+)
+CANDIDATE_DATE_FIELDS = frozenset(
+    f"{prefix}{suffix}" for prefix in _UPDATE_JOB_PREFIXES for suffix in ("StartDate", "EndDate")
+)
+
+def normalize_update_value(value, is_date: bool):
+    """
+    Normalize one column value for the aicandidate update
+    
+    Empty and "NULL" strings become None (SQL NULL). Date values that say
+    present/current also become None, and quotes around dates are removed.
+    """
+    if not isinstance(value, str):
+        return value
+    if not value.strip() or value.upper() == "NULL":
+        return None
+    if is_date:
+        lowered = value.lower()
+        if "present" in lowered or "current" in lowered:
+            return None
+        value = value.strip("'").strip('"')
+        if value.upper() == "NULL":
+            return None
+    return value
+
+def candidate_update_row(userid: int, data: Dict) -> Dict:
+    """
+    Build the aicandidate update row for one processed result
+    
+    Splits Top10Skills into the ten skill columns and normalizes every column
+    with normalize_update_value, so the row can be written as-is.
+    
+    Args:
+        userid: User ID the result belongs to (for logging)
+        data: Fields after process_resume_with_enhanced_dates
+        
+    Returns:
+        Dictionary of CANDIDATE_UPDATE_FIELDS to column values (None for SQL NULL)
+    """
+    # Extract skills for database format
+    if "Top10Skills" in data:
+        if data.get("Top10Skills") and data.get("Top10Skills") != "NULL":
+            # If skills exist and aren't NULL, split them; only ten columns exist, so
+            # stop after the tenth (the eleventh item holds the unused remainder)
+            skills_list = data.get("Top10Skills", "").split(", ", len(SKILL_FIELDS))
+        else:
+            # If skills are NULL, use an empty list
+            skills_list = []
+            logging.debug("UserID %s: Top10Skills is NULL or empty", userid)
+    else:
+        # Field doesn't exist in data, use empty list
+        skills_list = []
+        logging.debug("UserID %s: Top10Skills field not found in data", userid)
+    
+    # Per-row skill logs are debug only; update_database_with_results logs the batch summary
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(f"UserID {userid}: Skills extracted - {', '.join([s for s in skills_list if s])}")
+    
+    # Normalize every column in one pass; missing skills are padded with "" (NULL)
+    skill_values = dict(zip(SKILL_FIELDS, skills_list + [""] * (10 - len(skills_list))))
+    return {
+        field: normalize_update_value(
+            skill_values[field] if field in skill_values else data.get(field),
+            field in CANDIDATE_DATE_FIELDS
+        )
+        for field in CANDIDATE_UPDATE_FIELDS
+    }
+
+def finish_candidate_result(userid: int, fields: Dict, source: str) -> Dict:
+    """Apply enhanced date processing to parsed fields and turn them into the update row"""
+    row = candidate_update_row(userid, process_resume_with_enhanced_dates(userid, fields))
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(f"Processed {source} for UserID {userid}: {sum(value is not None for value in row.values())} fields extracted")
+    return row
 
 def update_database_with_results(results: Dict[int, Dict]) -> Dict[int, bool]:
     """
     Update the database with the processed results
 
     Args:
-        results: Dictionary mapping userids to processed results
+        results: Dictionary mapping userids to rows from candidate_update_row
 
     Returns:
         Dictionary mapping userids to success status
     """
     update_status = {}
 
-    # Log all userids being updated
-    userid_list = list(results.keys())
-    logging.info(f"Starting database updates for {len(userid_list)} UserIDs: {userid_list}")
-
-    for userid, data in results.items():
-        try:
-            # Extract skills for database format
-            if "Top10Skills" in data:
-                if data.get("Top10Skills") and data.get("Top10Skills") != "NULL":
-                    # If skills exist and aren't NULL, split them
-                    skills_list = data.get("Top10Skills", "").split(", ")
-                else:
-                    # If skills are NULL, use an empty list but log it
-                    skills_list = []
-                    logging.info(f"UserID {userid}: Top10Skills is NULL or empty")
-            else:
-                # Field doesn't exist in data, use empty list
-                skills_list = []
-                logging.info(f"UserID {userid}: Top10Skills field not found in data")
-                
-            # Ensure we have 10 skills
-            skills_list.extend([""] * (10 - len(skills_list)))
-            Skill1, Skill2, Skill3, Skill4, Skill5, Skill6, Skill7, Skill8, Skill9, Skill10 = skills_list[:10]
-            
-            # Debug log skills
-            logging.info(f"UserID {userid}: Skills extracted - {', '.join([s for s in skills_list if s])}")
-            if not any(skills_list):
-                logging.info(f"UserID {userid}: No skills found in data")
-            
-            # Function to convert "NULL" string to None for SQL NULL
-            def convert_null(value):
-                if value is None or value == "" or value == "NULL":
-                    return None
-                return value
-                
-            # Create update data dictionary
-            update_data = {
-                "PrimaryTitle": convert_null(data.get("PrimaryTitle")),
-                "SecondaryTitle": convert_null(data.get("SecondaryTitle")),
-                "TertiaryTitle": convert_null(data.get("TertiaryTitle")),
-                "Address": convert_null(data.get("Address")),
-                "City": convert_null(data.get("City")),
-                "State": convert_null(data.get("State")),
-                "Certifications": convert_null(data.get("Certifications")),
-                "Bachelors": convert_null(data.get("Bachelors")),
-                "Masters": convert_null(data.get("Masters")),
-                "Phone1": convert_null(data.get("Phone1")),
-                "Phone2": convert_null(data.get("Phone2")),
-                "Email": convert_null(data.get("Email")),
-                "Email2": convert_null(data.get("Email2")),
-                "FirstName": convert_null(data.get("FirstName")),
-                "MiddleName": convert_null(data.get("MiddleName")),
-                "LastName": convert_null(data.get("LastName")),
-                "Linkedin": convert_null(data.get("Linkedin")),
-                "MostRecentCompany": convert_null(data.get("MostRecentCompany")),
-                "MostRecentStartDate": convert_null(data.get("MostRecentStartDate")),
-                "MostRecentEndDate": convert_null(data.get("MostRecentEndDate")),
-                "MostRecentLocation": convert_null(data.get("MostRecentLocation")),
-                "SecondMostRecentCompany": convert_null(data.get("SecondMostRecentCompany")),
-                "SecondMostRecentStartDate": convert_null(data.get("SecondMostRecentStartDate")),
-                "SecondMostRecentEndDate": convert_null(data.get("SecondMostRecentEndDate")),
-                "SecondMostRecentLocation": convert_null(data.get("SecondMostRecentLocation")),
-                "ThirdMostRecentCompany": convert_null(data.get("ThirdMostRecentCompany")),
-                "ThirdMostRecentStartDate": convert_null(data.get("ThirdMostRecentStartDate")),
-                "ThirdMostRecentEndDate": convert_null(data.get("ThirdMostRecentEndDate")),
-                "ThirdMostRecentLocation": convert_null(data.get("ThirdMostRecentLocation")),
-                "FourthMostRecentCompany": convert_null(data.get("FourthMostRecentCompany")),
-                "FourthMostRecentStartDate": convert_null(data.get("FourthMostRecentStartDate")),
-                "FourthMostRecentEndDate": convert_null(data.get("FourthMostRecentEndDate")),
-                "FourthMostRecentLocation": convert_null(data.get("FourthMostRecentLocation")),
-                "FifthMostRecentCompany": convert_null(data.get("FifthMostRecentCompany")),
-                "FifthMostRecentStartDate": convert_null(data.get("FifthMostRecentStartDate")),
-                "FifthMostRecentEndDate": convert_null(data.get("FifthMostRecentEndDate")),
-                "FifthMostRecentLocation": convert_null(data.get("FifthMostRecentLocation")),
-                "SixthMostRecentCompany": convert_null(data.get("SixthMostRecentCompany")),
-                "SixthMostRecentStartDate": convert_null(data.get("SixthMostRecentStartDate")),
-                "SixthMostRecentEndDate": convert_null(data.get("SixthMostRecentEndDate")),
-                "SixthMostRecentLocation": convert_null(data.get("SixthMostRecentLocation")),
-                "SeventhMostRecentCompany": convert_null(data.get("SeventhMostRecentCompany")),
-                "SeventhMostRecentStartDate": convert_null(data.get("SeventhMostRecentStartDate")),
-                "SeventhMostRecentEndDate": convert_null(data.get("SeventhMostRecentEndDate")),
-                "SeventhMostRecentLocation": convert_null(data.get("SeventhMostRecentLocation")),
-                "PrimaryIndustry": convert_null(data.get("PrimaryIndustry")),
-                "SecondaryIndustry": convert_null(data.get("SecondaryIndustry")),
-                "Skill1": convert_null(Skill1),
-                "Skill2": convert_null(Skill2),
-                "Skill3": convert_null(Skill3),
-                "Skill4": convert_null(Skill4),
-                "Skill5": convert_null(Skill5),
-                "Skill6": convert_null(Skill6),
-                "Skill7": convert_null(Skill7),
-                "Skill8": convert_null(Skill8),
-                "Skill9": convert_null(Skill9),
-                "Skill10": convert_null(Skill10),
-                "PrimarySoftwareLanguage": convert_null(data.get("PrimarySoftwareLanguage")),
-                "SecondarySoftwareLanguage": convert_null(data.get("SecondarySoftwareLanguage")),
-                "TertiarySoftwareLanguage": convert_null(data.get("TertiarySoftwareLanguage")),
-                "SoftwareApp1": convert_null(data.get("SoftwareApp1")),
-                "SoftwareApp2": convert_null(data.get("SoftwareApp2")),
-                "SoftwareApp3": convert_null(data.get("SoftwareApp3")),
-                "SoftwareApp4": convert_null(data.get("SoftwareApp4")),
-                "SoftwareApp5": convert_null(data.get("SoftwareApp5")),
-                "Hardware1": convert_null(data.get("Hardware1")),
-                "Hardware2": convert_null(data.get("Hardware2")),
-                "Hardware3": convert_null(data.get("Hardware3")),
-                "Hardware4": convert_null(data.get("Hardware4")),
-                "Hardware5": convert_null(data.get("Hardware5")),
-                "PrimaryCategory": convert_null(data.get("PrimaryCategory")),
-                "SecondaryCategory": convert_null(data.get("SecondaryCategory")),
-                "ProjectTypes": convert_null(data.get("ProjectTypes")),
-                "Specialty": convert_null(data.get("Specialty")),
-                "Summary": convert_null(data.get("Summary")),
-                "LengthinUS": convert_null(data.get("LengthinUS")),
-                "YearsofExperience": convert_null(data.get("YearsofExperience")),
-                "AvgTenure": convert_null(data.get("AvgTenure"))
-            }
-            
-            # Log what we're about to update
-            logging.info(f"Updating database for UserID {userid} with {len(update_data)} fields")
-            
-            # Define date fields to handle specially
-            date_fields = [
-                "MostRecentStartDate", "MostRecentEndDate",
-                "SecondMostRecentStartDate", "SecondMostRecentEndDate",
-                "ThirdMostRecentStartDate", "ThirdMostRecentEndDate",
-                "FourthMostRecentStartDate", "FourthMostRecentEndDate",
-                "FifthMostRecentStartDate", "FifthMostRecentEndDate",
-                "SixthMostRecentStartDate", "SixthMostRecentEndDate",
-                "SeventhMostRecentStartDate", "SeventhMostRecentEndDate"
-            ]
-            
-            # Clean up data with special handling for date fields
-            for key, value in update_data.items():
-                if key in date_fields:
-                    # Special handling for date fields
-                    if value is None or (isinstance(value, str) and (value.upper() == "NULL" or not value.strip() or "present" in value.lower() or "current" in value.lower())):
-                        # Set to NULL for empty or present/current dates
-                        update_data[key] = None
-                        logging.info(f"Setting date field '{key}' to NULL")
-                    elif isinstance(value, str):
-                        # Remove any quotes that might be in the date string
-                        cleaned_value = value.strip("'").strip('"')
-                        # Check for "NULL" string returned from process_resume_with_enhanced_dates
-                        if cleaned_value.upper() == "NULL":
-                            update_data[key] = None
-                            logging.info(f"Converting 'NULL' string to NULL for date field '{key}'")
-                        elif cleaned_value != value:
-                            logging.info(f"Cleaned date value for {key}: '{value}' -> '{cleaned_value}'")
-                            update_data[key] = cleaned_value
-                else:
-                    # Standard handling for non-date fields
-                    if isinstance(value, str) and (value.upper() == "NULL" or not value.strip()):
-                        update_data[key] = None  # Use None instead of empty string for proper SQL NULL values
-            
-            # Update database
-            success = update_candidate_record_with_retry(userid, update_data)
-            update_status[userid] = success
-            
-            if success:
-                logging.info(f"Successfully updated database for UserID {userid}")
-            else:
-                logging.error(f"Failed to update database for UserID {userid}")
-                
-        except Exception as e:
-            logging.error(f"Error updating database for UserID {userid}: {str(e)}")
+    # Rows where extraction produced nothing would only write NULLs; skip them
+    empty_userids = [userid for userid, row in results.items() if all(value is None for value in row.values())]
+    if empty_userids:
+        logging.warning(f"Skipping {len(empty_userids)} UserIDs with no extracted fields: {empty_userids[:20]}")
+        for userid in empty_userids:
             update_status[userid] = False
+        results = {userid: row for userid, row in results.items() if userid not in update_status}
+    if not results:
+        return update_status
+
+    # One summary line for the batch; per-row details are debug only
+    without_skills = sum(1 for row in results.values() if row.get("Skill1") is None)
+    logging.info(f"Starting database updates for {len(results)} UserIDs ({without_skills} without skills)")
+    logging.debug("UserIDs being updated: %s", list(results))
+
+    # Write all records in chunks; anything the bulk path misses is retried one row at a time
+    for userid, success in update_candidate_records_with_retry(results).items():
+        update_status[userid] = success
+        if success:
+            logging.debug("Successfully updated database for UserID %s", userid)
+        else:
+            logging.error(f"Failed to update database for UserID {userid}")
     
+    logging.info(f"Updated {sum(1 for success in update_status.values() if success)}/{len(update_status)} records in the database")
     return update_status
 
+def fetch_resume_batch(batch_size: int) -> List[Tuple[int, str]]:
+    """
+    Fetch resumes in pages until batch_size is reached or their requests would fill a batch file
+    
+    get_resume_batch marks every row it returns as processed, so only what fits
+    MAX_BATCH_FILE_BYTES is fetched. The request size is estimated from one built
+    request plus each resume's length; serialize_batch_requests still enforces the
+    exact limits and releases anything the estimate let through.
+    
+    Args:
+        batch_size: Most resumes to fetch
+        
+    Returns:
+        List of (userid, resume_text) tuples
+    """
+    group_size = max(1, min(RESUMES_PER_REQUEST, MAX_RESUMES_PER_REQUEST))
+    batch_size = min(batch_size, MAX_BATCH_REQUESTS * group_size)
+    resume_batch = []
+    estimated_bytes = 0
+    request_overhead = None  # Serialized bytes of one request besides its resume text
+    
+    while len(resume_batch) < batch_size:
+        page_size = min(RESUME_FETCH_PAGE_SIZE, batch_size - len(resume_batch))
+        if resume_batch:
+            # Size the next page to the bytes left, at the average request size so far
+            average_bytes = estimated_bytes / len(resume_batch)
+            page_size = min(page_size, int((MAX_BATCH_FILE_BYTES - estimated_bytes) / average_bytes))
+            if page_size < 1:
+                break
+        
+        page = get_resume_batch(batch_size=page_size)
+        if not page:
+            break
+        
+        if request_overhead is None:
+            request_overhead = len(build_request_line(page[:1])) - len(page[0][1].encode('utf-8'))
+        estimated_bytes += sum(len(resume_text.encode('utf-8')) + request_overhead / group_size for _, resume_text in page)
+        resume_batch.extend(page)
+        
+        if len(page) < page_size:
+            break  # No more unprocessed resumes
+    
+    logging.info(f"Fetched {len(resume_batch)} resumes for the batch (about {int(estimated_bytes)} request bytes)")
+    return resume_batch
+
 def run_unified_processing(batch_size=BATCH_SIZE, debug_mode=True, debug_limit=20):
     """
     Main function to run the unified batch processing pipeline
@@ -1785,38 +1917,46 @@ def run_unified_processing(batch_size=BATCH_SIZE, debug_mode=True, debug_limit=2
     """
     logging.info(f"Starting unified batch processing using OpenAI Batch API (debug_mode={debug_mode}, debug_limit={debug_limit})")
     
-    # Get unprocessed resume batch
-    resume_batch = get_resume_batch(batch_size=batch_size)
+    # Get unprocessed resumes, only as many as fit in one batch file
+    resume_batch = fetch_resume_batch(batch_size)
     
     if not resume_batch:
         logging.info("No resumes to process, exiting")
         return
     
-    # Create batch input file
-    batch_filepath, batch_id, request_count = create_batch_input_file(resume_batch)
+    # Create batch input file (and upload it from memory unless disabled)
+    if UPLOAD_FROM_MEMORY:
+        batch_filepath, batch_id, request_count, input_file_id = create_and_upload_batch_input(resume_batch)
+    else:
+        batch_filepath, batch_id, request_count = create_batch_input_file(resume_batch)
+        input_file_id = None
+    
+    # Extract userids
+    userids = [userid for userid, _ in resume_batch]
     
     if not batch_filepath or request_count == 0:
         logging.error("Failed to create batch input file, aborting")
+        release_resume_batch(userids)
         return
     
-    # Extract userids
-    userids = [userid for userid, _ in resume_batch]
-    
     # Create a mapping of userids to resume texts for later use
     resume_map = {userid: resume_text for userid, resume_text in resume_batch}
     
     logging.info(f"Processing batch {batch_id} with {len(resume_batch)} resumes")
     
     # Upload the file to OpenAI
-    input_file_id = upload_batch_file(batch_filepath)
+    if input_file_id is None:
+        input_file_id = upload_batch_file(batch_filepath)
     if not input_file_id:
         logging.error("Failed to upload batch input file, aborting")
+        release_resume_batch(userids)
         return
     
     # Submit the batch job
     openai_batch_id = submit_batch_job(input_file_id)
     if not openai_batch_id:
         logging.error("Failed to submit batch job, aborting")
+        release_resume_batch(userids)
         return
     
     logging.info(f"Submitted unified batch job {openai_batch_id}, waiting for completion (up to 24 hours)")
@@ -1834,6 +1974,138 @@ def run_unified_processing(batch_size=BATCH_SIZE, debug_mode=True, debug_limit=2
         "next_check_time": next_check_time
     }
 
+def result_token_usage(result: Dict) -> Optional[Dict]:
+    """Return the usage block OpenAI reported for one batch result, or None if it has no prompt token count"""
+    usage = _walk_json_path(result, ("response", "body", "usage"))
+    if isinstance(usage, dict) and isinstance(usage.get("prompt_tokens"), int):
+        return usage
+    return None
+
+@functools.lru_cache(maxsize=1)
+def unified_prompt_static_tokens() -> int:
+    """
+    Count the tokens of the unified prompt parts that are the same for every resume
+    
+    Used by the batch cost estimate, which then only has to encode each resume.
+    The per-resume taxonomy context is left out of the estimate.
+    """
+    encoding = get_token_encoding()
+    static_texts = [
+        "Based on this resume, give the user the information they need: \n",
+        UNIFIED_BASE_INSTRUCTIONS,
+        TAXONOMY_GUIDANCE,
+        UNIFIED_USER_CONTENT,
+        "IMPORTANT: Format your response as JSON...",  # Abbreviated format instruction, as before
+    ]
+    static_texts.extend(msg["content"] for msg in UNIFIED_RULE_MESSAGES + UNIFIED_TECH_MESSAGES)
+    return sum(len(encoding.encode(text, disallowed_special=())) for text in static_texts)
+
+def tally_token_usage(results, totals: Dict[str, int], unreported: List[Dict]):
+    """
+    Pass batch results through while adding up the token usage OpenAI reported
+    
+    Args:
+        results: Iterable of batch result records
+        totals: Counters updated in place ("records", "input", "output")
+        unreported: Results without a usage block are appended here for estimation
+        
+    Returns:
+        Iterator over the same results
+    """
+    for result in results:
+        totals["records"] += 1
+        usage = result_token_usage(result)
+        if usage is None:
+            unreported.append(result)
+        else:
+            totals["input"] += usage["prompt_tokens"]
+            totals["output"] += usage.get("completion_tokens", 0)
+        yield result
+
+def fetch_resume_texts(userids: List[int]) -> Dict[int, str]:
+    """
+    Fetch markdown resumes for the given userids, one IN (...) query per chunk
+    
+    Args:
+        userids: User IDs to look up (duplicates are fetched once)
+        
+    Returns:
+        Dictionary mapping userids to resume texts; empty if the lookup fails
+    """
+    resume_map = {}
+    try:
+        conn, success, message = create_pyodbc_connection()
+        if not success:
+            logging.error(f"Failed to connect to database: {message}")
+            return resume_map
+        cursor = conn.cursor()
+        
+        unique_userids = list(dict.fromkeys(userids))
+        for start in range(0, len(unique_userids), RESUME_FETCH_CHUNK_SIZE):
+            chunk = unique_userids[start:start + RESUME_FETCH_CHUNK_SIZE]
+            # Key rows by the userid we asked for, whatever type the driver returns
+            requested = {str(userid): userid for userid in chunk}
+            markers = ", ".join("?" * len(chunk))
+            cursor.execute(f"SELECT userid, markdownResume FROM dbo.aicandidate WHERE userid IN ({markers})", chunk)
+            for row_userid, resume_text in cursor.fetchall():
+                userid = requested.get(str(row_userid))
+                if userid is not None:
+                    resume_map[userid] = resume_text
+        
+        cursor.close()
+        conn.close()
+    except Exception as e:
+        logging.error(f"Error fetching resume texts: {str(e)}")
+        return {}
+    return resume_map
+
+def resend_missing_resumes(openai_batch_id: str, userids: List[int]) -> str:
+    """
+    Resend resumes that a multi-resume batch answered without, as single-resume requests
+    
+    Runs once per batch: handled batches are listed in RESENT_BATCHES_FILE, so
+    checking an old batch again doesn't resend (and bill) rows that a later batch
+    may have filled since. If the new batch can't be submitted the resumes are
+    released instead, so a later batch fetches them again.
+    
+    Args:
+        openai_batch_id: The batch the answers were missing from
+        userids: Userids without an answer
+        
+    Returns:
+        OpenAI batch ID of the resend batch, or an empty string if none was submitted
+    """
+    try:
+        with open(RESENT_BATCHES_FILE, "r", encoding="utf-8") as f:
+            if openai_batch_id in f.read().split():
+                logging.info(f"Missing resumes of batch {openai_batch_id} were already resent, skipping")
+                return ""
+    except FileNotFoundError:
+        pass
+    
+    resend_batch_id = ""
+    resume_map = fetch_resume_texts(userids)
+    if resume_map:
+        try:
+            payload = b"".join(build_request_line([(userid, resume_text)]) for userid, resume_text in resume_map.items())
+            filepath = os.path.join(os.path.dirname(__file__), f"batch_input_resend_{openai_batch_id}.jsonl")
+            write_batch_payload(filepath, payload)
+            input_file_id = upload_batch_file(filepath, content=payload)
+            if input_file_id:
+                resend_batch_id = submit_batch_job(input_file_id)
+        except Exception as e:
+            logging.error(f"Error resending missing resumes of batch {openai_batch_id}: {str(e)}")
+    
+    if resend_batch_id:
+        logging.info(f"Resent {len(resume_map)} resumes missing from batch {openai_batch_id} as single-resume requests in batch {resend_batch_id}")
+    else:
+        logging.error(f"Could not resend {len(userids)} resumes missing from batch {openai_batch_id}, releasing them for a later batch")
+        release_resume_batch(userids)
+    
+    with open(RESENT_BATCHES_FILE, "a", encoding="utf-8") as f:
+        f.write(f"{openai_batch_id}\n")
+    return resend_batch_id
+
 def check_and_process_batch(openai_batch_id: str, debug_mode=True, debug_limit=20):
     """
     Check a specific batch job and process the results if completed
@@ -1865,52 +2137,33 @@ def check_and_process_batch(openai_batch_id: str, debug_mode=True, debug_limit=2
             logging.error(f"No output file ID found for batch job {openai_batch_id}")
             return {"status": "error", "message": f"No output file ID found for batch job {openai_batch_id}"}
         
-        # Download and parse the results
-        results = get_file_content(output_file_id)
-        if not results:
-            logging.error(f"No results found in output file {output_file_id}")
-            return {"status": "error", "message": f"No results found in output file {output_file_id}"}
-        
-        # Get the affected userids from the results
-        userids = []
-        for result in results:
-            custom_id = result.get("custom_id", "")
-            if custom_id.startswith("unified_"):
-                userid = int(custom_id.split("_")[1])
-                userids.append(userid)
-        
-        # Get resume texts for these userids
+        # Stream the results straight into the parser, tallying reported token
+        # usage on the way, so the output file is never held in memory as a whole
+        token_totals = {"records": 0, "input": 0, "output": 0}
+        unreported_results = []
+        missing_userids = []
+        records = iter_file_content(output_file_id)
         try:
-            # Connect to the database using the robust connection function
-            conn_result = create_pyodbc_connection()
-            # Handle the tuple return from create_pyodbc_connection
-            if isinstance(conn_result, tuple):
-                conn, success, message = conn_result
-                if not success:
-                    logging.error(f"Failed to connect to database: {message}")
-                    resume_map = {}
-                else:
-                    cursor = conn.cursor()
-            else:
-                conn = conn_result
-                cursor = conn.cursor()
-            
-            # Get resumes for all userids
-            resume_map = {}
-            for userid in userids:
-                cursor.execute("SELECT markdownResume FROM dbo.aicandidate WHERE userid = ?", userid)
-                row = cursor.fetchone()
-                if row:
-                    resume_map[userid] = row[0]
-            
-            cursor.close()
-            conn.close()
+            processed_results = process_unified_results(
+                tally_token_usage(records, token_totals, unreported_results),
+                {},  # Resume texts are not needed to parse answers
+                debug_mode=debug_mode,
+                debug_limit=debug_limit,
+                missing_userids=missing_userids
+            )
         except Exception as e:
-            logging.error(f"Error fetching resume texts: {str(e)}")
-            resume_map = {}
+            logging.error(f"Error downloading file: {str(e)}")
+            return {"status": "error", "message": f"Error reading output file {output_file_id}: {str(e)}"}
+        finally:
+            records.close()  # Stops the download thread if parsing ended early
+        
+        if not token_totals["records"]:
+            logging.error(f"No results found in output file {output_file_id}")
+            return {"status": "error", "message": f"No results found in output file {output_file_id}"}
         
-        # Process the unified results with debug parameters
-        processed_results = process_unified_results(results, resume_map, debug_mode=debug_mode, debug_limit=debug_limit)
+        # LastProcessed was set when the batch was fetched, so resumes a multi-resume
+        # answer left out are sent again, one per request
+        resend_batch_id = resend_missing_resumes(openai_batch_id, missing_userids) if missing_userids else ""
         
         if not processed_results:
             logging.error(f"No processed results for batch job {openai_batch_id}")
@@ -1922,58 +2175,40 @@ def check_and_process_batch(openai_batch_id: str, debug_mode=True, debug_limit=2
         success_count = sum(1 for status in update_status.values() if status)
         
         # Calculate cost estimates based on actual token counts
-        total_unified_requests = len(results)
-        
-        # Load model encoding (use gpt-4 encoding for gpt-5 models)
-        model_for_encoding = MODEL
-        if "gpt-5" in MODEL.lower():
-            model_for_encoding = "gpt-4"  # Use gpt-4 encoding for gpt-5 models
-        encoding = tiktoken.encoding_for_model(model_for_encoding)
-        
-        # Get actual token count for each resume's request and response
-        input_tokens = 0
-        output_tokens = 0
-        
-        # First pass to collect actual token counts
-        for result in results:
+        total_unified_requests = token_totals["records"]
+        input_tokens = token_totals["input"]
+        output_tokens = token_totals["output"]
+        
+        # Estimate tokens for results that came back without usage; only their
+        # resumes are fetched
+        resume_map = {}
+        if unreported_results:
+            unreported_userids = []
+            for result in unreported_results:
+                unreported_userids.extend(userids_from_custom_id(result.get("custom_id", "")))
+            resume_map = fetch_resume_texts(unreported_userids)
+        
+        for result in unreported_results:
             try:
+                # Tokenizer is cached; gpt-5 models use the gpt-4 encoding
+                encoding = get_token_encoding()
+                
                 # Get the request tokens from the input file if available
                 # This will give a more accurate count than estimation
                 custom_id = result.get("custom_id", "")
-                if custom_id.startswith("unified_"):
-                    userid = int(custom_id.split("_")[1])
-                    if userid in resume_map:
-                        # Count tokens in the messages array (more accurate)
-                        resume_text = resume_map.get(userid, "")
-                        messages = create_unified_prompt(resume_text, userid=userid)
-                        # Add the JSON formatting instruction
-                        format_instruction = {
-                            "role": "system",
-                            "content": "IMPORTANT: Format your response as JSON..."  # Abbreviated for counting
-                        }
-                        messages.append(format_instruction)
-                        
-                        # Count actual tokens in the messages
-                        for msg in messages:
-                            if isinstance(msg, dict) and "content" in msg:
-                                input_tokens += len(encoding.encode(msg["content"]))
+                resume_texts = [resume_map[userid] for userid in userids_from_custom_id(custom_id) if userid in resume_map]
+                if resume_texts:
+                    # Only the resumes vary between prompts; the rest is counted once per request,
+                    # however many resumes a multi-resume request packs
+                    input_tokens += unified_prompt_static_tokens() + sum(
+                        len(encoding.encode(resume_text, disallowed_special=())) for resume_text in resume_texts
+                    )
                 
                 # Count actual tokens in the response content
-                content = ""
-                if "response" in result:
-                    response_obj = result.get("response", {})
-                    body = response_obj.get("body", {})
-                    if isinstance(body, dict) and "choices" in body:
-                        choices = body.get("choices", [])
-                        if choices and len(choices) > 0:
-                            choice = choices[0]
-                            if isinstance(choice, dict) and "message" in choice:
-                                message = choice.get("message", {})
-                                if isinstance(message, dict) and "content" in message:
-                                    content = message.get("content", "")
+                content = _content_at_path(result, RESPONSE_CONTENT_PATHS[0])
                 
                 if content:
-                    output_tokens += len(encoding.encode(content))
+                    output_tokens += len(encoding.encode(content, disallowed_special=()))
                 else:
                     # Fallback to estimate if we couldn't get actual content
                     output_tokens += 1000  # Default estimate
@@ -1991,34 +2226,14 @@ def check_and_process_batch(openai_batch_id: str, debug_mode=True, debug_limit=2
         if output_tokens == 0:
             output_tokens = total_unified_requests * 1000  # Estimate 1000 tokens per response
         
-        # Calculate costs using OpenAI pricing based on the model
-        # Get the pricing for the current model
-        pricing = {
-            # GPT-4 models
-            "gpt-4": {"input": 0.00003, "output": 0.00006},  # $30/M input, $60/M output
-            "gpt-4-32k": {"input": 0.00006, "output": 0.00012},  # $60/M input, $120/M output
-            "gpt-4-turbo": {"input": 0.00001, "output": 0.00003},  # $10/M input, $30/M output
-            "gpt-4o": {"input": 0.00001, "output": 0.00003},  # $10/M input, $30/M output
-            
-            # GPT-4 mini/micro models
-            "gpt-4o-mini": {"input": 0.000000075, "output": 0.0000003},  # $0.075/M input, $0.30/M output
-            "gpt-4o-mini-2024-07-18": {"input": 0.000000075, "output": 0.0000003},  # $0.075/M input, $0.30/M output
-            
-            # Fallback to default pricing
-            "default": {"input": 0.000000075, "output": 0.0000003}  # Default to gpt-4o-mini pricing
-        }
-        
         # Get rates for the current model or fall back to default
-        model_pricing = pricing.get(MODEL, pricing["default"])
+        model_pricing = MODEL_PRICING.get(MODEL, MODEL_PRICING["default"])
         standard_input_rate = model_pricing["input"]
         standard_output_rate = model_pricing["output"]
         
-        # Batch API provides a 50% discount
-        batch_discount = 0.5  # 50% discount for batch API
-        
         # Calculate costs with batch discount
-        input_cost = input_tokens * standard_input_rate * batch_discount
-        output_cost = output_tokens * standard_output_rate * batch_discount
+        input_cost = input_tokens * standard_input_rate * BATCH_DISCOUNT
+        output_cost = output_tokens * standard_output_rate * BATCH_DISCOUNT
         total_cost = input_cost + output_cost
         
         # Calculate what it would have cost with standard API
@@ -2057,6 +2272,7 @@ def check_and_process_batch(openai_batch_id: str, debug_mode=True, debug_limit=2
             "failure_count": len(processed_results) - success_count,
             "successful_userids": successful_userids,
             "failed_userids": failed_userids,
+            "resend_batch_id": resend_batch_id,
             "cost_estimates": {
                 "total_cost": total_cost,
                 "standard_cost": standard_cost,
@@ -2081,32 +2297,91 @@ def check_and_process_batch(openai_batch_id: str, debug_mode=True, debug_limit=2
     
     else:
         # Batch job still processing
-        created_at = batch_status.get("created_at")
-        if created_at:
-            # Add 24 hours to created_at for estimated completion
-            created_timestamp = datetime.fromtimestamp(created_at)
-            estimated_completion = created_timestamp + timedelta(hours=24)
-            now = datetime.now()
-            hours_remaining = (estimated_completion - now).total_seconds() / 3600
-            return {
-                "status": status,
-                "message": f"Batch job {openai_batch_id} status: {status}",
-                "hours_remaining": round(hours_remaining, 1)
-            }
+        return pending_batch_result(openai_batch_id, status, batch_status.get("created_at"))
+
+def next_poll_delay(delay: float, check_interval: float) -> float:
+    """
+    Back off the delay before the next status check of a batch that hasn't changed
+    
+    Args:
+        delay: Current polling delay in seconds
+        check_interval: Configured polling interval, used as the floor
+        
+    Returns:
+        The next delay: grown by POLL_BACKOFF_FACTOR up to MAX_POLL_DELAY, plus jitter
+    """
+    delay = min(delay * POLL_BACKOFF_FACTOR, max(MAX_POLL_DELAY, check_interval))
+    return delay + random.uniform(0, delay * POLL_JITTER)
+
+def check_batches_concurrently(batch_ids: List[str], debug_mode=True, debug_limit=20) -> Dict[str, Dict]:
+    """
+    Check several batch jobs at once and process any that have completed
+
+    One batches.list call gets every status first; batches it shows as still
+    running are reported from the listing without a request of their own.
+    The rest (finished, or too old to be in the listing) are checked with
+    check_and_process_batch, which is mostly waiting on the OpenAI API (and on
+    the database for completed batches), so those checks run in a thread pool
+    instead of one after another.
+
+    Args:
+        batch_ids: The OpenAI batch IDs to check
+        debug_mode: Whether to generate debug files
+        debug_limit: Maximum number of debug files to generate per batch
+
+    Returns:
+        Dictionary mapping each distinct batch ID to the result of check_and_process_batch
+    """
+    results = {}
+    if not batch_ids:
+        return results
+
+    listing = list_batch_statuses()
+    to_check = []
+    # A batch listed twice is checked (and its results written) only once
+    for batch_id in dict.fromkeys(batch_ids):
+        listed = listing.get(batch_id)
+        if listed and listed["status"] in ACTIVE_BATCH_STATUSES:
+            results[batch_id] = pending_batch_result(batch_id, listed["status"], listed["created_at"])
         else:
-            return {"status": status, "message": f"Batch job {openai_batch_id} status: {status}"}
+            to_check.append(batch_id)
+    logging.info(f"{len(results)} batch(es) still running, checking {len(to_check)}")
+    if not to_check:
+        return results
+
+    max_workers = min(MAX_POLL_WORKERS, len(to_check))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_batch = {
+            executor.submit(check_and_process_batch, batch_id, debug_mode=debug_mode, debug_limit=debug_limit): batch_id
+            for batch_id in to_check
+        }
+        for future in concurrent.futures.as_completed(future_to_batch):
+            batch_id = future_to_batch[future]
+            try:
+                results[batch_id] = future.result()
+            except Exception as e:
+                logging.error(f"Error checking batch {batch_id}: {str(e)}")
+                results[batch_id] = None
+
+    return results
 
-def run_parallel_processing(batch_size: int, num_batches: int = 1, batch_delay: int = 600, check_interval: int = 600, debug_mode=True, debug_limit=20):
+def run_parallel_processing(batch_size: int, num_batches: int = 1, batch_delay: int = 600, check_interval: int = 600, debug_mode=True, debug_limit=20, verbose=False):
     """
     Run batch processing in parallel with automatic processing of results
     
+    Batches are submitted on a background thread while earlier ones are
+    polled. Each batch is checked on its own schedule (a heap of next check
+    times), so the loop sleeps until the earliest check is due instead of a
+    fixed interval after all submissions.
+    
     Args:
         batch_size: Number of records to process in each batch
         num_batches: Number of batches to process in total
         batch_delay: Seconds to wait between submitting batches
-        check_interval: How often to check for batch completion in seconds
+        check_interval: Seconds between status checks of each batch
         debug_mode: Whether to generate debug files
         debug_limit: Maximum number of debug files to generate per batch
+        verbose: Print a line for every batch still running on each check, not just a count
     """
     logging.info(f"Starting parallel batch processing with {num_batches} batches of {batch_size} records each")
     print(f"Starting parallel batch processing with {num_batches} batches of {batch_size} records each")
@@ -2114,103 +2389,123 @@ def run_parallel_processing(batch_size: int, num_batches: int = 1, batch_delay:
     print(f"Will check batch status every {check_interval} seconds")
     
     # Track all batch IDs
-    submitted_batches = []
     completed_batches = []
     batch_start_times = {}
-    
-    # Phase 1: Submit all batches with delay
-    for i in range(num_batches):
-        print(f"\nSubmitting batch {i+1}/{num_batches}...")
-        logging.info(f"Submitting batch {i+1}/{num_batches}")
+    check_schedule = []  # Heap of (next check time, batch ID)
+    poll_delays = {}  # Batch ID -> (last status, current polling delay)
+    submitted_count = 0
+    
+    # Phase 1 runs in the background: every submission slot is free, so the
+    # submitter only waits batch_delay between batches
+    new_batches = queue.Queue()
+    submitter = threading.Thread(
+        target=submit_batches_worker,
+        args=(new_batches, threading.BoundedSemaphore(max(num_batches, 1)), num_batches, batch_size, debug_mode, debug_limit),
+        kwargs={"submit_delay": batch_delay, "retry_failed": False},
+        name="batch-submitter",
+        daemon=True
+    )
+    submitter.start()
+    submitter_done = num_batches <= 0
+    
+    # Phase 2: Monitor and process completed batches as their checks come due
+    while check_schedule or not submitter_done:
+        # Wait for the earliest check, picking up newly submitted batches meanwhile
+        while True:
+            wait = check_schedule[0][0] - time.time() if check_schedule else None
+            if wait is not None and wait <= 0:
+                break
+            if submitter_done:
+                if wait is not None:
+                    time.sleep(wait)
+                break
+            try:
+                batch_id = new_batches.get(timeout=wait)
+            except queue.Empty:
+                break
+            if batch_id is None:
+                submitter_done = True
+                print(f"\nAll {submitted_count} batches submitted")
+                continue
+            submitted_count += 1
+            batch_start_times[batch_id] = time.time()
+            heapq.heappush(check_schedule, (batch_start_times[batch_id] + check_interval, batch_id))
+            logging.info(f"Successfully submitted batch {submitted_count}/{num_batches}: {batch_id}")
+            print(f"✓ Batch {submitted_count}/{num_batches}: OpenAI batch ID {batch_id}")
         
-        result = run_unified_processing(
-            batch_size=batch_size,
+        if not check_schedule:
+            continue
+        
+        # Check every batch that is due in parallel
+        now = time.time()
+        due_batches = []
+        while check_schedule and check_schedule[0][0] <= now:
+            due_batches.append(heapq.heappop(check_schedule)[1])
+        
+        # Everything reported for this check is printed in one write at the end
+        lines = [f"\nChecking status of {len(due_batches)} due batches..."]
+        logging.info(f"Checking status of {len(due_batches)} due batches")
+        
+        if verbose:
+            for batch_id in due_batches:
+                elapsed_time = (now - batch_start_times[batch_id]) / 60
+                lines.append(f"Checking batch {batch_id} (running for {elapsed_time:.1f} minutes)")
+        
+        check_results = check_batches_concurrently(
+            due_batches,
             debug_mode=debug_mode,
             debug_limit=debug_limit
         )
-        if result and "openai_batch_id" in result:
-            batch_id = result["openai_batch_id"]
-            submitted_batches.append(batch_id)
-            batch_start_times[batch_id] = time.time()
-            
-            logging.info(f"Successfully submitted batch {i+1}/{num_batches}: {batch_id}")
-            print(f"✓ Batch {i+1}/{num_batches}: OpenAI batch ID {batch_id}")
-            print(f"  Processing {result['request_count']} records")
-            print(f"  Expected completion: {result['next_check_time'].strftime('%Y-%m-%d %H:%M:%S')}")
-        else:
-            logging.error(f"Failed to submit batch {i+1}/{num_batches}")
-            print(f"✗ Failed to submit batch {i+1}/{num_batches}. Check logs for details.")
-        
-        # Wait before submitting next batch (unless it's the last one)
-        if i < num_batches - 1:
-            print(f"Waiting {batch_delay} seconds before submitting next batch...")
-            time.sleep(batch_delay)
-    
-    print(f"\nAll {len(submitted_batches)} batches submitted successfully")
-    print(f"Checking batch status every {check_interval} seconds until all complete")
-    
-    # Phase 2: Monitor and process completed batches
-    while submitted_batches:
-        print(f"\nChecking status of {len(submitted_batches)} active batches...")
-        logging.info(f"Checking status of {len(submitted_batches)} active batches")
-        
-        still_processing = []
-        newly_completed = []
         
-        for batch_id in submitted_batches:
-            elapsed_time = (time.time() - batch_start_times[batch_id]) / 60
-            print(f"Checking batch {batch_id} (running for {elapsed_time:.1f} minutes)")
-            
-            result = check_and_process_batch(
-                batch_id,
-                debug_mode=debug_mode,
-                debug_limit=debug_limit
-            )
+        for batch_id in due_batches:
+            result = check_results.get(batch_id)
             if result and result['status'] == 'completed':
                 logging.info(f"Batch {batch_id} completed successfully")
-                print(f"✓ Batch {batch_id} completed successfully")
+                lines.append(f"✓ Batch {batch_id} completed successfully")
                 if 'total_records' in result:
-                    print(f"  Processed {result['total_records']} records")
-                    print(f"  Success: {result['success_count']}, Failed: {result['failure_count']}")
+                    lines.append(f"  Processed {result['total_records']} records")
+                    lines.append(f"  Success: {result['success_count']}, Failed: {result['failure_count']}")
                     if 'cost_estimates' in result:
-                        print(f"  Cost: ${result['cost_estimates']['total_cost']:.4f}")
-                        print(f"  Cost per record: ${result['cost_estimates']['cost_per_record']:.6f}")
+                        lines.append(f"  Cost: ${result['cost_estimates']['total_cost']:.4f}")
+                        lines.append(f"  Cost per record: ${result['cost_estimates']['cost_per_record']:.6f}")
                 
                 # Mark as completed
                 completed_batches.append(batch_id)
-                newly_completed.append(batch_id)
+                
+                # Follow the batch that resends resumes this one answered without
+                resend_batch_id = result.get('resend_batch_id')
+                if resend_batch_id:
+                    lines.append(f"  Resent missing resumes in batch {resend_batch_id}")
+                    batch_start_times[resend_batch_id] = time.time()
+                    heapq.heappush(check_schedule, (batch_start_times[resend_batch_id] + check_interval, resend_batch_id))
                 
             elif result and result['status'] == 'failed':
                 logging.error(f"Batch {batch_id} failed: {result.get('message', 'Unknown error')}")
-                print(f"✗ Batch {batch_id} FAILED: {result.get('message', 'Unknown error')}")
+                lines.append(f"✗ Batch {batch_id} FAILED: {result.get('message', 'Unknown error')}")
                 
                 # Consider it completed (failed)
                 completed_batches.append(batch_id)
-                newly_completed.append(batch_id)
                 
             else:
-                # Still processing
-                still_processing.append(batch_id)
+                # Still processing; back off while its status stays the same
                 status = result.get('status', 'unknown') if result else 'unknown'
-                print(f"⏳ Batch {batch_id} still processing (status: {status})")
-                if result and 'hours_remaining' in result:
-                    hours = result['hours_remaining']
-                    print(f"  Estimated time remaining: {hours:.1f} hours")
-        
-        # Update tracking lists
-        submitted_batches = [b for b in submitted_batches if b not in newly_completed]
+                last_status, delay = poll_delays.get(batch_id, (status, check_interval))
+                delay = next_poll_delay(delay, check_interval) if status == last_status else check_interval
+                poll_delays[batch_id] = (status, delay)
+                heapq.heappush(check_schedule, (time.time() + delay, batch_id))
+                logging.debug("Batch %s still processing (status: %s)", batch_id, status)
+                if verbose:
+                    lines.append(f"⏳ Batch {batch_id} still processing (status: {status})")
+                    if result and 'hours_remaining' in result:
+                        hours = result['hours_remaining']
+                        lines.append(f"  Estimated time remaining: {hours:.1f} hours")
         
         # Summary
+        if not verbose:
+            lines.append(f"⏳ {len(check_schedule)} batch(es) still processing")
         if completed_batches:
-            print(f"\nProgress: {len(completed_batches)}/{len(completed_batches) + len(submitted_batches)} batches completed")
-        
-        # Exit if all done
-        if not submitted_batches:
-            break
-            
-        # Wait before checking again
-        print(f"\nWaiting {check_interval} seconds before checking again...")
-        time.sleep(check_interval)
+            lines.append(f"\nProgress: {len(completed_batches)}/{len(completed_batches) + len(check_schedule)} batches completed")
+        print("\n".join(lines))
     
     # Final report
     print(f"\n✅ All {len(completed_batches)} batches completed!")
@@ -2219,6 +2514,27 @@ def run_parallel_processing(batch_size: int, num_batches: int = 1, batch_delay:
     
     return completed_batches
 
+def iter_debug_files(debug_dir: str, prefix: str = "debug_response_", suffix: str = ".json"):
+    """
+    Yield debug files in a directory with a single os.scandir pass
+    
+    Args:
+        debug_dir: Directory to scan
+        prefix: Required filename prefix
+        suffix: Required filename suffix
+    
+    Returns:
+        Iterator of os.DirEntry objects for matching regular files
+    """
+    try:
+        with os.scandir(debug_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(prefix) and name.endswith(suffix) and entry.is_file(follow_symlinks=False):
+                    yield entry
+    except FileNotFoundError:
+        logging.warning(f"Debug directory not found: {debug_dir}")
+
 def recover_failed_records(batch_id: str = None, debug_dir: str = None, debug_mode=True, debug_limit=20):
     """
     Recover records that failed processing due to permission issues
@@ -2242,97 +2558,95 @@ def recover_failed_records(batch_id: str = None, debug_dir: str = None, debug_mo
     logging.info(f"Starting recovery process for failed records")
     
     # Get list of debug response files
-    debug_file_pattern = "debug_response_*.json"
     if batch_id:
         # If we have a batch ID, we'd need a way to filter files by batch
         # For now we'll process all debug files
         pass
     
-    debug_files = glob.glob(os.path.join(debug_dir, debug_file_pattern))
-    logging.info(f"Found {len(debug_files)} debug response files to analyze")
-    
     recovered_count = 0
     failed_count = 0
     
-    for debug_file in debug_files:
+    # Read the responses first, streaming the directory listing. Structured
+    # answers are decoded once here; text answers are CPU work and are parsed
+    # in parallel below
+    parsed_by_userid = {}
+    answers = []
+    file_count = 0
+    for entry in iter_debug_files(debug_dir):
+        file_count += 1
         try:
-            # Extract user ID from filename
-            filename = os.path.basename(debug_file)
-            if filename.startswith("debug_response_") and filename.endswith(".json"):
-                user_id_str = filename[len("debug_response_"):-len(".json")]
+            # Extract user ID from filename, if it's a numeric one
+            name_match = DEBUG_RESPONSE_NAME_PATTERN.fullmatch(entry.name)
+            if name_match:
+                userid = int(name_match.group(1))
+                # Load the debug response file; text answers are recognized
+                # from the first bytes and never read in full
+                with open(entry.path, 'rb') as f:
+                    head = f.read(DEBUG_FILE_PEEK_BYTES)
+                    if not head.lstrip().startswith(b'{'):
+                        continue
+                    raw = head + f.read()
                 
-                # Check if it's a numeric user ID
-                if user_id_str.isdigit():
-                    userid = int(user_id_str)
-                    
-                    # Load the debug response file
-                    with open(debug_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Check if it's a valid JSON response
-                    if content and content.strip().startswith('{') and content.strip().endswith('}'):
-                        # Parse the response with debug parameters
-                        import threading
-                        if not hasattr(recover_failed_records, 'debug_counter'):
-                            recover_failed_records.debug_counter = threading.local()
-                            recover_failed_records.debug_counter.value = 0
-                            
-                        parsed_results = parse_unified_response(
-                            content, 
-                            debug_mode=debug_mode, 
-                            debug_limit=debug_limit, 
-                            debug_counter=recover_failed_records.debug_counter
-                        )
-                        
-                        # Check if it has technical content but NULL skills
-                        has_technical_content = False
-                        has_null_skills = True
-                        
-                        # Check for technical indicators
-                        tech_indicators = [
-                            "Software", "Developer", "Engineer", "DevOps", "AWS", "Azure", 
-                            "Cloud", "Docker", "Kubernetes", "Python", "Java", "C#", "JavaScript",
-                            "SQL", "Database", "Programming", "Coding", "API", "Backend", "Frontend"
-                        ]
-                        
-                        # Check summary and other fields for technical indicators
-                        if "Summary" in parsed_results and parsed_results["Summary"] and parsed_results["Summary"] != "NULL":
-                            summary = parsed_results["Summary"]
-                            if any(tech in summary for tech in tech_indicators):
-                                has_technical_content = True
-                        
-                        # Also check job titles
-                        for title_field in ["PrimaryTitle", "SecondaryTitle", "TertiaryTitle"]:
-                            if title_field in parsed_results and parsed_results[title_field] and parsed_results[title_field] != "NULL":
-                                title = parsed_results[title_field]
-                                if any(tech in title for tech in tech_indicators):
-                                    has_technical_content = True
-                        
-                        # Check if skills are NULL
-                        if "Top10Skills" in parsed_results and parsed_results["Top10Skills"] and parsed_results["Top10Skills"] != "NULL":
-                            has_null_skills = False
-                        
-                        # If it has technical content but NULL skills, reprocess it
-                        if has_technical_content and has_null_skills:
-                            logging.info(f"Found technical record with NULL skills: UserID {userid}")
-                            
-                            # Apply enhanced date processing
-                            enhanced_results = process_resume_with_enhanced_dates(userid, parsed_results)
-                            
-                            # Create a mapping from userid to results for database update
-                            results_to_update = {userid: enhanced_results}
-                            
-                            # Update database
-                            update_status = update_database_with_results(results_to_update)
-                            
-                            if update_status.get(userid, False):
-                                recovered_count += 1
-                                logging.info(f"Successfully recovered record for UserID {userid}")
-                            else:
-                                failed_count += 1
-                                logging.error(f"Failed to recover record for UserID {userid}")
+                # Check if it's a valid JSON response
+                if raw.rstrip().endswith(b'}'):
+                    text = raw.decode('utf-8')
+                    try:
+                        json_data = load_json(text)
+                    except ValueError:
+                        # Older answers may carry bare NULLs; quote them and try once more
+                        try:
+                            json_data = load_json(BARE_NULL_PATTERN.sub('"NULL"', text)) if 'NULL' in text else None
+                        except ValueError:
+                            json_data = None
+
+                    # Flat structured-output answers first, then the nested section layout;
+                    # only answers that are not JSON or map to nothing go to the text parser
+                    structured_results = None
+                    if isinstance(json_data, dict):
+                        structured_results = extract_unified_json_fields(json_data)
+                        if structured_results is None:
+                            structured_results = map_unified_json_sections(json_data) or None
+                    if structured_results is not None:
+                        parsed_by_userid[userid] = structured_results
+                    else:
+                        answers.append((userid, text))
         except Exception as e:
-            logging.error(f"Error processing debug file {debug_file}: {str(e)}")
+            logging.error(f"Error processing debug file {entry.path}: {str(e)}")
+    logging.info(f"Analyzing {len(parsed_by_userid) + len(answers)} responses from {file_count} debug response files")
+    parsed_by_userid.update(parse_text_answers(answers))
+    
+    results_to_update = {}
+    for userid, parsed_results in parsed_by_userid.items():
+        # Only records with NULL skills need recovery; skip the scan for the rest
+        if parsed_results.get("Top10Skills") and parsed_results["Top10Skills"] != "NULL":
+            continue
+        
+        # Check summary and job titles for technical indicators in one pass
+        tech_text = " ".join(
+            parsed_results[field] for field in TECH_CONTENT_FIELDS
+            if parsed_results.get(field) and parsed_results[field] != "NULL"
+        )
+        
+        # If it has technical content but NULL skills, reprocess it
+        if TECH_INDICATOR_PATTERN.search(tech_text) is not None:
+            logging.info(f"Found technical record with NULL skills: UserID {userid}")
+            
+            # Apply enhanced date processing and build the update row
+            try:
+                results_to_update[userid] = finish_candidate_result(userid, parsed_results, "recovered result")
+            except Exception as e:
+                logging.error(f"Error preparing recovered record for UserID {userid}: {str(e)}")
+    
+    # Write every recovered record in one bulk update
+    if results_to_update:
+        update_status = update_database_with_results(results_to_update)
+        for userid in results_to_update:
+            if update_status.get(userid, False):
+                recovered_count += 1
+                logging.info(f"Successfully recovered record for UserID {userid}")
+            else:
+                failed_count += 1
+                logging.error(f"Failed to recover record for UserID {userid}")
     
     logging.info(f"Recovery completed: Recovered {recovered_count} records, Failed {failed_count} records")
     return recovered_count
@@ -2351,7 +2665,7 @@ def monitor_all_batches(check_interval: int = 30):
         while True:
             # Get list of all batches from OpenAI
             try:
-                all_batches = openai.batches.list(limit=100)
+                all_batches = call_openai_with_retry(openai.batches.list, limit=BATCH_LIST_LIMIT)
 
                 # Track active batches
                 active_count = 0
@@ -2406,7 +2720,60 @@ def monitor_all_batches(check_interval: int = 30):
     except KeyboardInterrupt:
         logging.info("Batch monitoring stopped by user")
 
-def run_continuous_processing(batch_size: int, num_batches: int = 1, check_interval: int = 20, debug_mode=True, debug_limit=20):
+def submit_batches_worker(new_batches: queue.Queue, in_flight: threading.BoundedSemaphore, num_batches: int,
+                          batch_size: int, debug_mode=True, debug_limit=20,
+                          submit_delay: int = 10, retry_failed: bool = True) -> None:
+    """
+    Submit batches one after another, putting each OpenAI batch ID on a queue
+
+    Runs on its own thread for run_continuous_processing and
+    run_parallel_processing. A slot in in_flight is taken before each
+    submission and released by the caller once the batch finishes, so at most
+    that many batches run at once. Submissions are spaced submit_delay seconds
+    apart; a failed one is retried after a minute, or skipped when retry_failed
+    is False. None is put on the queue when all batches have been submitted.
+    """
+    try:
+        submitted = 0
+        skipped = 0
+        while submitted + skipped < num_batches:
+            in_flight.acquire()
+            result = run_unified_processing(
+                batch_size=batch_size,
+                debug_mode=debug_mode,
+                debug_limit=debug_limit
+            )
+            if result:
+                batch_id = result['openai_batch_id']
+                logging.info(f"Submitted new batch: {batch_id}")
+                new_batches.put(batch_id)
+                submitted += 1
+                # Space submissions out to avoid rate limits
+                if submitted + skipped < num_batches:
+                    time.sleep(submit_delay)
+            elif retry_failed:
+                in_flight.release()
+                logging.warning("Failed to submit new batch, will retry")
+                time.sleep(60)  # Wait a minute before retrying
+            else:
+                in_flight.release()
+                skipped += 1
+                logging.error(f"Failed to submit batch {submitted + skipped}/{num_batches}, skipping it")
+    except Exception as e:
+        logging.error(f"Batch submitter stopped: {str(e)}")
+    finally:
+        new_batches.put(None)
+
+def finish_continuous_batch(batch_id: str, completed_batches: List[str], resend_batches: set,
+                            in_flight: threading.BoundedSemaphore) -> None:
+    """Record a finished batch in continuous mode, freeing its submission slot unless it was a resend batch"""
+    if batch_id in resend_batches:
+        resend_batches.discard(batch_id)
+        return
+    completed_batches.append(batch_id)
+    in_flight.release()
+
+def run_continuous_processing(batch_size: int, num_batches: int = 1, check_interval: int = 20, debug_mode=True, debug_limit=20, verbose=False):
     """
     Run continuous batch processing without manual intervention
     
@@ -2416,101 +2783,116 @@ def run_continuous_processing(batch_size: int, num_batches: int = 1, check_inter
         check_interval: How often to check for batch completion in seconds (default: 1 hour)
         debug_mode: Whether to generate debug files
         debug_limit: Maximum number of debug files to generate per batch
+        verbose: Print a line for every batch still running on each check, not just a count
     """
     logging.info(f"Starting continuous processing with batch size {batch_size}, {num_batches} batches")
     
     # Track batches we've submitted
     submitted_batches = []
     completed_batches = []
-    batches_to_submit = num_batches
     
-    # First, submit the initial batch
-    if batches_to_submit > 0:
-        result = run_unified_processing(
-            batch_size=batch_size,
-            debug_mode=debug_mode,
-            debug_limit=debug_limit
-        )
-        if result:
-            batch_id = result['openai_batch_id']
-            submitted_batches.append(batch_id)
-            logging.info(f"Submitted initial batch: {batch_id}")
-            print(f"Submitted batch {len(submitted_batches)}/{num_batches} with ID: {batch_id}")
-            batches_to_submit -= 1
+    # Submit batches on a background thread so building and uploading the next
+    # batch overlaps with polling the ones already running
+    new_batches = queue.Queue()
+    in_flight = threading.BoundedSemaphore(MAX_IN_FLIGHT_BATCHES)
+    submitter = threading.Thread(
+        target=submit_batches_worker,
+        args=(new_batches, in_flight, num_batches, batch_size, debug_mode, debug_limit),
+        name="batch-submitter",
+        daemon=True
+    )
+    submitter.start()
+    submitter_done = num_batches <= 0
+    poll_delay = check_interval
+    last_statuses = {}
+    resend_batches = set()  # Batches resending missing resumes; they hold no submission slot
     
     # Enter the main loop
-    while submitted_batches or batches_to_submit > 0:
-        # Submit any new batches if we have capacity
-        while batches_to_submit > 0:
-            # Don't submit too many at once, leave some headroom
-            if len(submitted_batches) < 5:  # Limit concurrent batches to 5
-                result = run_unified_processing(
-                    batch_size=batch_size,
-                    debug_mode=debug_mode,
-                    debug_limit=debug_limit
-                )
-                if result:
-                    batch_id = result['openai_batch_id']
-                    submitted_batches.append(batch_id)
-                    logging.info(f"Submitted new batch: {batch_id}")
-                    print(f"Submitted batch {len(submitted_batches) + len(completed_batches)}/{num_batches} with ID: {batch_id}")
-                    batches_to_submit -= 1
-                    # Sleep briefly to avoid rate limits
-                    time.sleep(10)
-                else:
-                    logging.warning("Failed to submit new batch, will retry")
-                    time.sleep(60)  # Wait a minute before retrying
-            else:
-                # We have 5+ batches in flight, wait for some to complete
+    while submitted_batches or not submitter_done:
+        # Pick up batches submitted since the last check; wait for one if nothing is running yet
+        changed = False
+        while not submitter_done:
+            try:
+                batch_id = new_batches.get(block=not submitted_batches)
+            except queue.Empty:
                 break
+            if batch_id is None:
+                submitter_done = True
+                break
+            submitted_batches.append(batch_id)
+            changed = True
+            print(f"Submitted batch {len(submitted_batches) + len(completed_batches)}/{num_batches} with ID: {batch_id}")
+        
+        if not submitted_batches:
+            break
         
-        # Check status of all submitted batches
+        # Check status of all submitted batches in parallel; the report is printed in one write
         still_processing = []
+        lines = []
+        logging.info(f"Checking batches {submitted_batches}")
+        check_results = check_batches_concurrently(
+            submitted_batches,
+            debug_mode=debug_mode,
+            debug_limit=debug_limit
+        )
         for batch_id in submitted_batches:
-            logging.info(f"Checking batch {batch_id}")
-            result = check_and_process_batch(
-                batch_id,
-                debug_mode=debug_mode,
-                debug_limit=debug_limit
-            )
+            result = check_results.get(batch_id)
             
             if result and result['status'] == 'completed':
                 logging.info(f"Batch {batch_id} completed successfully")
-                print(f"Batch {batch_id} completed")
-                print(f"Processed {result['total_records']} records")
-                print(f"Success: {result['success_count']}, Failure: {result['failure_count']}")
+                lines.append(f"Batch {batch_id} completed")
+                lines.append(f"Processed {result['total_records']} records")
+                lines.append(f"Success: {result['success_count']}, Failure: {result['failure_count']}")
                 
                 # Move to completed list
-                completed_batches.append(batch_id)
+                finish_continuous_batch(batch_id, completed_batches, resend_batches, in_flight)
+                changed = True
+                
+                # Keep polling the batch that resends resumes this one answered without
+                if result.get('resend_batch_id'):
+                    lines.append(f"Resent missing resumes in batch {result['resend_batch_id']}")
+                    resend_batches.add(result['resend_batch_id'])
+                    still_processing.append(result['resend_batch_id'])
             elif result and result['status'] == 'failed':
                 logging.error(f"Batch {batch_id} failed: {result.get('message', 'Unknown error')}")
-                print(f"Batch {batch_id} failed: {result.get('message', 'Unknown error')}")
+                lines.append(f"Batch {batch_id} failed: {result.get('message', 'Unknown error')}")
                 
                 # Still consider it completed for our purposes
-                completed_batches.append(batch_id)
+                finish_continuous_batch(batch_id, completed_batches, resend_batches, in_flight)
+                changed = True
             else:
                 # Batch is still processing
                 still_processing.append(batch_id)
+                status = result['status'] if result else None
+                if last_statuses.get(batch_id) != status:
+                    last_statuses[batch_id] = status
+                    changed = True
                 if result and 'hours_remaining' in result:
-                    logging.info(f"Batch {batch_id} still processing, ~{result['hours_remaining']} hours remaining")
-                    print(f"Batch {batch_id} still processing, ~{result['hours_remaining']} hours remaining")
+                    message = f"Batch {batch_id} still processing, ~{result['hours_remaining']} hours remaining"
                 else:
-                    logging.info(f"Batch {batch_id} still processing")
-                    print(f"Batch {batch_id} status: {result['status'] if result else 'unknown'}")
+                    message = f"Batch {batch_id} status: {result['status'] if result else 'unknown'}"
+                logging.debug(message)
+                if verbose:
+                    lines.append(message)
         
         # Update our tracking list
         submitted_batches = still_processing
+        if still_processing:
+            logging.info(f"{len(still_processing)} batch(es) still processing")
+        if lines:
+            print("\n".join(lines))
         
         # If we're done, break out of the loop
-        if not submitted_batches and batches_to_submit == 0:
+        if not submitted_batches and submitter_done:
             break
             
-        # Wait before checking again
+        # Wait before checking again, backing off while nothing changes
         if submitted_batches:
-            logging.info(f"Waiting {check_interval} seconds before checking batches again")
-            print(f"Waiting {check_interval/60:.1f} minutes before checking {len(submitted_batches)} active batch(es) again")
-            print(f"Progress: {len(completed_batches)}/{num_batches} batches completed")
-            time.sleep(check_interval)
+            poll_delay = check_interval if changed else next_poll_delay(poll_delay, check_interval)
+            logging.info(f"Waiting {poll_delay:.0f} seconds before checking batches again")
+            print(f"Waiting {poll_delay/60:.1f} minutes before checking {len(submitted_batches)} active batch(es) again\n"
+                  f"Progress: {len(completed_batches)}/{num_batches} batches completed")
+            time.sleep(poll_delay)
     
     # Final report
     logging.info(f"All {len(completed_batches)} batches completed")
@@ -2533,6 +2915,9 @@ if __name__ == "__main__":
     parser.add_argument('--recover', action='store_true', help='Recover failed records by reprocessing debug files')
     parser.add_argument('--recover-batch', type=str, help='Recover failed records from a specific batch ID')
     parser.add_argument('--tech-focus', action='store_true', help='Focus recovery on technical records with NULL skills')
+    parser.add_argument('--resumes-per-request', type=int, default=RESUMES_PER_REQUEST, help=f'Resumes packed into each request, 1-{MAX_RESUMES_PER_REQUEST} (default: {RESUMES_PER_REQUEST})')
+    parser.add_argument('--verbose', action='store_true', help='Print every running batch on each status check in --continuous/--multi-batch mode')
+    parser.add_argument('--structured-output', action='store_true', help='Request JSON schema output instead of labeled text')
     
     args = parser.parse_args()
     
@@ -2542,6 +2927,20 @@ if __name__ == "__main__":
         debug_mode = False
     elif args.debug_mode:
         debug_mode = True
+
+    # Pack several resumes into each request if requested
+    if args.resumes_per_request != RESUMES_PER_REQUEST:
+        RESUMES_PER_REQUEST = max(1, min(args.resumes_per_request, MAX_RESUMES_PER_REQUEST))
+        logging.info(f"Packing {RESUMES_PER_REQUEST} resumes per request")
+
+    if args.structured_output:
+        USE_STRUCTURED_OUTPUT = True
+        logging.info("Requesting structured JSON output for each resume")
+
+    # Override batch size if provided
+    if args.batch_size != BATCH_SIZE:
+        BATCH_SIZE = args.batch_size
+        logging.info(f"Using custom batch size: {BATCH_SIZE}")
         
     if args.recover or args.recover_batch:
         # Run the recovery process
@@ -2555,38 +2954,27 @@ if __name__ == "__main__":
         
     elif args.multi_batch:
         # Run multiple batches in parallel with automatic processing
-        if args.batch_size != BATCH_SIZE:
-            BATCH_SIZE = args.batch_size
-            logging.info(f"Using custom batch size: {BATCH_SIZE}")
-            
         run_parallel_processing(
             batch_size=BATCH_SIZE,
             num_batches=args.num_batches,
             batch_delay=args.batch_delay,
             check_interval=args.check_interval,
             debug_mode=debug_mode,
-            debug_limit=args.debug_limit
+            debug_limit=args.debug_limit,
+            verbose=args.verbose
         )
         
     elif args.continuous:
         # Run in continuous mode
-        if args.batch_size != BATCH_SIZE:
-            BATCH_SIZE = args.batch_size
-            logging.info(f"Using custom batch size: {BATCH_SIZE}")
-        
         run_continuous_processing(
             batch_size=BATCH_SIZE, 
             num_batches=args.num_batches, 
             check_interval=args.check_interval,
             debug_mode=debug_mode,
-            debug_limit=args.debug_limit
+            debug_limit=args.debug_limit,
+            verbose=args.verbose
         )
     elif args.submit:
-        # Override batch size if provided
-        if args.batch_size != BATCH_SIZE:
-            BATCH_SIZE = args.batch_size
-            logging.info(f"Using custom batch size: {BATCH_SIZE}")
-        
         # Submit a new unified batch job
         result = run_unified_processing(
             batch_size=BATCH_SIZE,
@@ -22,6 +22,268 @@ logging.basicConfig(
     ]
 )
 
+# "- question: answer" lines; the question runs up to the first colon
+ANSWER_LINE_PATTERN = re.compile(r'^[^\S\n]*(-[^:\n]*):(.*)$', re.MULTILINE)
+
+# Skeleton of the structured output; every field starts as "NULL"
+RESULT_TEMPLATE = {
+    "PERSONAL_INFORMATION": {
+        "Name": {
+            "FirstName": "NULL",
+            "MiddleName": "NULL",
+            "LastName": "NULL"
+        },
+        "Contact": {
+            "Phone": "NULL",
+            "SecondaryPhone": "NULL",
+            "Email": "NULL",
+            "SecondaryEmail": "NULL",
+            "LinkedIn": "NULL",
+            "Address": "NULL",
+            "City": "NULL",
+            "State": "NULL"
+        },
+        "Education": {
+            "BachelorsDegree": "NULL",
+            "MastersDegree": "NULL",
+            "Certifications": "NULL"
+        }
+    },
+    "WORK_HISTORY": {
+        "MostRecent": {
+            "Company": "NULL",
+            "StartDate": "NULL",
+            "EndDate": "NULL",
+            "Location": "NULL"
+        },
+        "SecondMostRecent": {
+            "Company": "NULL",
+            "StartDate": "NULL",
+            "EndDate": "NULL",
+            "Location": "NULL"
+        },
+        "ThirdMostRecent": {
+            "Company": "NULL",
+            "StartDate": "NULL",
+            "EndDate": "NULL",
+            "Location": "NULL"
+        },
+        "FourthMostRecent": {
+            "Company": "NULL",
+            "StartDate": "NULL",
+            "EndDate": "NULL",
+            "Location": "NULL"
+        },
+        "FifthMostRecent": {
+            "Company": "NULL",
+            "StartDate": "NULL",
+            "EndDate": "NULL",
+            "Location": "NULL"
+        },
+        "SixthMostRecent": {
+            "Company": "NULL",
+            "StartDate": "NULL",
+            "EndDate": "NULL",
+            "Location": "NULL"
+        },
+        "SeventhMostRecent": {
+            "Company": "NULL",
+            "StartDate": "NULL",
+            "EndDate": "NULL",
+            "Location": "NULL"
+        }
+    },
+    "CAREER_INFO": {
+        "PrimaryTitle": "NULL",
+        "SecondaryTitle": "NULL",
+        "TertiaryTitle": "NULL",
+        "PrimaryIndustry": "NULL",
+        "SecondaryIndustry": "NULL",
+        "TopSkills": "NULL"
+    },
+    "TECHNICAL_INFO": {
+        "PrimaryLanguage": "NULL",
+        "SecondaryLanguage": "NULL",
+        "TertiaryLanguage": "NULL",
+        "SoftwareApp1": "NULL",
+        "SoftwareApp2": "NULL",
+        "SoftwareApp3": "NULL",
+        "SoftwareApp4": "NULL",
+        "SoftwareApp5": "NULL",
+        "Hardware1": "NULL",
+        "Hardware2": "NULL",
+        "Hardware3": "NULL",
+        "Hardware4": "NULL",
+        "Hardware5": "NULL",
+        "PrimaryCategory": "NULL",
+        "SecondaryCategory": "NULL",
+        "ProjectTypes": "NULL",
+        "Specialty": "NULL",
+        "Summary": "NULL",
+        "LengthInUS": "NULL",
+        "YearsOfExperience": "NULL",
+        "AvgTenure": "NULL"
+    }
+}
+
+# Answer labels (old and new prompt wording) mapped to their place in RESULT_TEMPLATE;
+# a leading "Their " and a trailing "?" are ignored (see _canonical_label)
+FIELD_MAPPING = {
+    # Personal information
+    "First Name": "PERSONAL_INFORMATION.Name.FirstName",
+    "Middle Name": "PERSONAL_INFORMATION.Name.MiddleName",
+    "Last Name": "PERSONAL_INFORMATION.Name.LastName",
+    "Phone Number": "PERSONAL_INFORMATION.Contact.Phone",
+    "Second Phone Number": "PERSONAL_INFORMATION.Contact.SecondaryPhone",
+    "Email": "PERSONAL_INFORMATION.Contact.Email",
+    "Second Email": "PERSONAL_INFORMATION.Contact.SecondaryEmail",
+    "Their Linkedin URL": "PERSONAL_INFORMATION.Contact.LinkedIn",
+    "LinkedIn URL": "PERSONAL_INFORMATION.Contact.LinkedIn",
+    "Their street address": "PERSONAL_INFORMATION.Contact.Address",
+    "Street Address": "PERSONAL_INFORMATION.Contact.Address",
+    "City": "PERSONAL_INFORMATION.Contact.City",
+    "State": "PERSONAL_INFORMATION.Contact.State",
+    "Bachelor's Degree": "PERSONAL_INFORMATION.Education.BachelorsDegree",
+    "Master's Degree": "PERSONAL_INFORMATION.Education.MastersDegree",
+    "Their Certifications Listed": "PERSONAL_INFORMATION.Education.Certifications",
+    "Certifications": "PERSONAL_INFORMATION.Education.Certifications",
+    
+    # Jobs
+    "Most Recent Company Worked for": "WORK_HISTORY.MostRecent.Company",
+    "Most Recent Company": "WORK_HISTORY.MostRecent.Company",
+    "Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.MostRecent.StartDate",
+    "Most Recent Start Date": "WORK_HISTORY.MostRecent.StartDate",
+    "Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.MostRecent.EndDate",
+    "Most Recent End Date": "WORK_HISTORY.MostRecent.EndDate",
+    "Most Recent Job Location": "WORK_HISTORY.MostRecent.Location",
+    
+    "Second Most Recent Company Worked for": "WORK_HISTORY.SecondMostRecent.Company",
+    "Second Most Recent Company": "WORK_HISTORY.SecondMostRecent.Company",
+    "Second Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.SecondMostRecent.StartDate",
+    "Second Most Recent Start Date": "WORK_HISTORY.SecondMostRecent.StartDate",
+    "Second Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.SecondMostRecent.EndDate",
+    "Second Most Recent End Date": "WORK_HISTORY.SecondMostRecent.EndDate",
+    "Second Most Recent Job Location": "WORK_HISTORY.SecondMostRecent.Location",
+    
+    "Third Most Recent Company Worked for": "WORK_HISTORY.ThirdMostRecent.Company",
+    "Third Most Recent Company": "WORK_HISTORY.ThirdMostRecent.Company",
+    "Third Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.ThirdMostRecent.StartDate",
+    "Third Most Recent Start Date": "WORK_HISTORY.ThirdMostRecent.StartDate", 
+    "Third Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.ThirdMostRecent.EndDate",
+    "Third Most Recent End Date": "WORK_HISTORY.ThirdMostRecent.EndDate",
+    "Third Most Recent Job Location": "WORK_HISTORY.ThirdMostRecent.Location",
+    
+    "Fourth Most Recent Company Worked for": "WORK_HISTORY.FourthMostRecent.Company",
+    "Fourth Most Recent Company": "WORK_HISTORY.FourthMostRecent.Company",
+    "Fourth Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.FourthMostRecent.StartDate",
+    "Fourth Most Recent Start Date": "WORK_HISTORY.FourthMostRecent.StartDate",
+    "Fourth Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.FourthMostRecent.EndDate",
+    "Fourth Most Recent End Date": "WORK_HISTORY.FourthMostRecent.EndDate",
+    "Fourth Most Recent Job Location": "WORK_HISTORY.FourthMostRecent.Location",
+    
+    "Fifth Most Recent Company Worked for": "WORK_HISTORY.FifthMostRecent.Company",
+    "Fifth Most Recent Company": "WORK_HISTORY.FifthMostRecent.Company",
+    "Fifth Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.FifthMostRecent.StartDate",
+    "Fifth Most Recent Start Date": "WORK_HISTORY.FifthMostRecent.StartDate",
+    "Fifth Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.FifthMostRecent.EndDate",
+    "Fifth Most Recent End Date": "WORK_HISTORY.FifthMostRecent.EndDate",
+    "Fifth Most Recent Job Location": "WORK_HISTORY.FifthMostRecent.Location",
+    
+    "Sixth Most Recent Company Worked for": "WORK_HISTORY.SixthMostRecent.Company",
+    "Sixth Most Recent Company": "WORK_HISTORY.SixthMostRecent.Company",
+    "Sixth Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.SixthMostRecent.StartDate",
+    "Sixth Most Recent Start Date": "WORK_HISTORY.SixthMostRecent.StartDate",
+    "Sixth Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.SixthMostRecent.EndDate",
+    "Sixth Most Recent End Date": "WORK_HISTORY.SixthMostRecent.EndDate",
+    "Sixth Most Recent Job Location": "WORK_HISTORY.SixthMostRecent.Location",
+    
+    "Seventh Most Recent Company Worked for": "WORK_HISTORY.SeventhMostRecent.Company",
+    "Seventh Most Recent Company": "WORK_HISTORY.SeventhMostRecent.Company",
+    "Seventh Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.SeventhMostRecent.StartDate",
+    "Seventh Most Recent Start Date": "WORK_HISTORY.SeventhMostRecent.StartDate",
+    "Seventh Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.SeventhMostRecent.EndDate",
+    "Seventh Most Recent End Date": "WORK_HISTORY.SeventhMostRecent.EndDate",
+    "Seventh Most Recent Job Location": "WORK_HISTORY.SeventhMostRecent.Location",
+    
+    # Career info
+    "Best job title that fit their primary experience": "CAREER_INFO.PrimaryTitle",
+    "Best job title that fits their primary experience": "CAREER_INFO.PrimaryTitle",
+    "Primary Job Title": "CAREER_INFO.PrimaryTitle",
+    
+    "Best secondary job title that fits their secondary experience": "CAREER_INFO.SecondaryTitle",
+    "Secondary Job Title": "CAREER_INFO.SecondaryTitle",
+    
+    "Best tertiary job title that fits their tertiary experience": "CAREER_INFO.TertiaryTitle",
+    "Tertiary Job Title": "CAREER_INFO.TertiaryTitle",
+    
+    "Based on all 7 of their most recent companies above, what is the Primary industry they work in": "CAREER_INFO.PrimaryIndustry",
+    "Primary Industry": "CAREER_INFO.PrimaryIndustry",
+    
+    "Based on all 7 of their most recent companies above, what is the Secondary industry they work in": "CAREER_INFO.SecondaryIndustry",
+    "Secondary Industry": "CAREER_INFO.SecondaryIndustry",
+    
+    "Top 10 Technical Skills": "CAREER_INFO.TopSkills",
+    
+    # Technical info
+    "What technical language do they use most often": "TECHNICAL_INFO.PrimaryLanguage",
+    
+    "What technical language do they use second most often": "TECHNICAL_INFO.SecondaryLanguage",
+    
+    "What technical language do they use third most often": "TECHNICAL_INFO.TertiaryLanguage",
+    
+    "What software do they talk about using the most": "TECHNICAL_INFO.SoftwareApp1",
+    
+    "What software do they talk about using the second most": "TECHNICAL_INFO.SoftwareApp2",
+    
+    "What software do they talk about using the third most": "TECHNICAL_INFO.SoftwareApp3",
+    
+    "What software do they talk about using the fourth most": "TECHNICAL_INFO.SoftwareApp4",
+    
+    "What software do they talk about using the fifth most": "TECHNICAL_INFO.SoftwareApp5",
+    
+    "What physical hardware do they talk about using the most": "TECHNICAL_INFO.Hardware1",
+    
+    "What physical hardware do they talk about using the second most": "TECHNICAL_INFO.Hardware2",
+    
+    "What physical hardware do they talk about using the third most": "TECHNICAL_INFO.Hardware3",
+    
+    "What physical hardware do they talk about using the fourth most": "TECHNICAL_INFO.Hardware4",
+    
+    "What physical hardware do they talk about using the fifth most": "TECHNICAL_INFO.Hardware5",
+    
+    "Based on their experience, put them in a primary technical category if they are technical or functional category if they are functional": "TECHNICAL_INFO.PrimaryCategory",
+    
+    "Based on their experience, put them in a subsidiary technical category if they are technical or functional category if they are functional": "TECHNICAL_INFO.SecondaryCategory",
+    
+    "Types of projects they have worked on": "TECHNICAL_INFO.ProjectTypes",
+    
+    "Based on their skills, categories, certifications, and industries, determine what they specialize in": "TECHNICAL_INFO.Specialty",
+    
+    "Based on all this knowledge, write a summary of this candidate that could be sellable to an employer": "TECHNICAL_INFO.Summary",
+    
+    "How long have they lived in the United States(numerical answer only)": "TECHNICAL_INFO.LengthInUS",
+    
+    "Total years of professional experience (numerical answer only)": "TECHNICAL_INFO.YearsOfExperience",
+    
+    "Average tenure at companies in years (numerical answer only)": "TECHNICAL_INFO.AvgTenure"
+}
+
+def _canonical_label(label: str) -> str:
+    """Drop the "Their " prefix and trailing "?" that only some prompt versions use"""
+    if label.startswith("Their "):
+        label = label[6:]
+    if label.endswith("?"):
+        label = label[:-1]
+    return label
+
+# FIELD_MAPPING keyed by canonical label, paths split once into
+# (category, leaf) or (category, group, leaf) tuples
+FIELD_PATHS = {_canonical_label(label): tuple(path.split('.')) for label, path in FIELD_MAPPING.items()}
+
+def _copy_template(template: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy the nested template dicts; the leaf values are immutable strings"""
+    return {key: _copy_template(value) if isinstance(value, dict) else value for key, value in template.items()}
+
 def extract_fields_from_response(response_text: str) -> Dict[str, str]:
     """
     Extract fields from the raw API response
@@ -34,22 +296,10 @@ def extract_fields_from_response(response_text: str) -> Dict[str, str]:
     """
     extracted = {}
     
-    # Split the response into lines
-    lines = response_text.strip().split('\n')
-    
-    # Process each line
-    for line in lines:
-        line = line.strip()
-        if not line or not line.startswith('-'):
-            continue
-        
-        # Extract the question and answer parts
-        parts = line.split(':', 1)  # Split only on the first colon
-        if len(parts) != 2:
-            continue
-            
-        question = parts[0].strip('- \t')
-        answer = parts[1].strip()
+    # One regex pass finds every "- question: answer" line
+    for match in ANSWER_LINE_PATTERN.finditer(response_text):
+        question = match.group(1).strip('- \t')
+        answer = match.group(2).strip()
         
         # Skip empty answers
         if not answer or answer.upper() == 'NULL':
@@ -70,283 +320,19 @@ def map_fields_to_db_structure(extracted: Dict[str, str]) -> Dict[str, Any]:
         Dictionary with fields organized by category
     """
     # Initialize result structure
-    result = {
-        "PERSONAL_INFORMATION": {
-            "Name": {
-                "FirstName": "NULL",
-                "MiddleName": "NULL",
-                "LastName": "NULL"
-            },
-            "Contact": {
-                "Phone": "NULL",
-                "SecondaryPhone": "NULL",
-                "Email": "NULL",
-                "SecondaryEmail": "NULL",
-                "LinkedIn": "NULL",
-                "Address": "NULL",
-                "City": "NULL",
-                "State": "NULL"
-            },
-            "Education": {
-                "BachelorsDegree": "NULL",
-                "MastersDegree": "NULL",
-                "Certifications": "NULL"
-            }
-        },
-        "WORK_HISTORY": {
-            "MostRecent": {
-                "Company": "NULL",
-                "StartDate": "NULL",
-                "EndDate": "NULL",
-                "Location": "NULL"
-            },
-            "SecondMostRecent": {
-                "Company": "NULL",
-                "StartDate": "NULL",
-                "EndDate": "NULL",
-                "Location": "NULL"
-            },
-            "ThirdMostRecent": {
-                "Company": "NULL",
-                "StartDate": "NULL",
-                "EndDate": "NULL",
-                "Location": "NULL"
-            },
-            "FourthMostRecent": {
-                "Company": "NULL",
-                "StartDate": "NULL",
-                "EndDate": "NULL",
-                "Location": "NULL"
-            },
-            "FifthMostRecent": {
-                "Company": "NULL",
-                "StartDate": "NULL",
-                "EndDate": "NULL",
-                "Location": "NULL"
-            },
-            "SixthMostRecent": {
-                "Company": "NULL",
-                "StartDate": "NULL",
-                "EndDate": "NULL",
-                "Location": "NULL"
-            },
-            "SeventhMostRecent": {
-                "Company": "NULL",
-                "StartDate": "NULL",
-                "EndDate": "NULL",
-                "Location": "NULL"
-            }
-        },
-        "CAREER_INFO": {
-            "PrimaryTitle": "NULL",
-            "SecondaryTitle": "NULL",
-            "TertiaryTitle": "NULL",
-            "PrimaryIndustry": "NULL",
-            "SecondaryIndustry": "NULL",
-            "TopSkills": "NULL"
-        },
-        "TECHNICAL_INFO": {
-            "PrimaryLanguage": "NULL",
-            "SecondaryLanguage": "NULL",
-            "TertiaryLanguage": "NULL",
-            "SoftwareApp1": "NULL",
-            "SoftwareApp2": "NULL",
-            "SoftwareApp3": "NULL",
-            "SoftwareApp4": "NULL",
-            "SoftwareApp5": "NULL",
-            "Hardware1": "NULL",
-            "Hardware2": "NULL",
-            "Hardware3": "NULL",
-            "Hardware4": "NULL",
-            "Hardware5": "NULL",
-            "PrimaryCategory": "NULL",
-            "SecondaryCategory": "NULL",
-            "ProjectTypes": "NULL",
-            "Specialty": "NULL",
-            "Summary": "NULL",
-            "LengthInUS": "NULL",
-            "YearsOfExperience": "NULL",
-            "AvgTenure": "NULL"
-        }
-    }
-    
-    # Map personal information
-    field_mapping = {
-        # Personal information
-        "Their First Name": "PERSONAL_INFORMATION.Name.FirstName",
-        "First Name": "PERSONAL_INFORMATION.Name.FirstName",
-        "Their Middle Name": "PERSONAL_INFORMATION.Name.MiddleName",
-        "Middle Name": "PERSONAL_INFORMATION.Name.MiddleName",
-        "Their Last Name": "PERSONAL_INFORMATION.Name.LastName",
-        "Last Name": "PERSONAL_INFORMATION.Name.LastName",
-        "Their Phone Number": "PERSONAL_INFORMATION.Contact.Phone",
-        "Phone Number": "PERSONAL_INFORMATION.Contact.Phone",
-        "Their Second Phone Number": "PERSONAL_INFORMATION.Contact.SecondaryPhone",
-        "Second Phone Number": "PERSONAL_INFORMATION.Contact.SecondaryPhone",
-        "Their Email": "PERSONAL_INFORMATION.Contact.Email",
-        "Email": "PERSONAL_INFORMATION.Contact.Email",
-        "Their Second Email": "PERSONAL_INFORMATION.Contact.SecondaryEmail",
-        "Second Email": "PERSONAL_INFORMATION.Contact.SecondaryEmail",
-        "Their Linkedin URL": "PERSONAL_INFORMATION.Contact.LinkedIn",
-        "LinkedIn URL": "PERSONAL_INFORMATION.Contact.LinkedIn",
-        "Their street address": "PERSONAL_INFORMATION.Contact.Address",
-        "Street Address": "PERSONAL_INFORMATION.Contact.Address",
-        "Their City": "PERSONAL_INFORMATION.Contact.City",
-        "City": "PERSONAL_INFORMATION.Contact.City",
-        "Their State": "PERSONAL_INFORMATION.Contact.State",
-        "State": "PERSONAL_INFORMATION.Contact.State",
-        "Their Bachelor's Degree": "PERSONAL_INFORMATION.Education.BachelorsDegree",
-        "Bachelor's Degree": "PERSONAL_INFORMATION.Education.BachelorsDegree",
-        "Their Master's Degree": "PERSONAL_INFORMATION.Education.MastersDegree",
-        "Master's Degree": "PERSONAL_INFORMATION.Education.MastersDegree",
-        "Their Certifications Listed": "PERSONAL_INFORMATION.Education.Certifications",
-        "Certifications": "PERSONAL_INFORMATION.Education.Certifications",
-        
-        # Jobs
-        "Most Recent Company Worked for": "WORK_HISTORY.MostRecent.Company",
-        "Most Recent Company": "WORK_HISTORY.MostRecent.Company",
-        "Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.MostRecent.StartDate",
-        "Most Recent Start Date": "WORK_HISTORY.MostRecent.StartDate",
-        "Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.MostRecent.EndDate",
-        "Most Recent End Date": "WORK_HISTORY.MostRecent.EndDate",
-        "Most Recent Job Location": "WORK_HISTORY.MostRecent.Location",
-        
-        "Second Most Recent Company Worked for": "WORK_HISTORY.SecondMostRecent.Company",
-        "Second Most Recent Company": "WORK_HISTORY.SecondMostRecent.Company",
-        "Second Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.SecondMostRecent.StartDate",
-        "Second Most Recent Start Date": "WORK_HISTORY.SecondMostRecent.StartDate",
-        "Second Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.SecondMostRecent.EndDate",
-        "Second Most Recent End Date": "WORK_HISTORY.SecondMostRecent.EndDate",
-        "Second Most Recent Job Location": "WORK_HISTORY.SecondMostRecent.Location",
-        
-        "Third Most Recent Company Worked for": "WORK_HISTORY.ThirdMostRecent.Company",
-        "Third Most Recent Company": "WORK_HISTORY.ThirdMostRecent.Company",
-        "Third Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.ThirdMostRecent.StartDate",
-        "Third Most Recent Start Date": "WORK_HISTORY.ThirdMostRecent.StartDate", 
-        "Third Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.ThirdMostRecent.EndDate",
-        "Third Most Recent End Date": "WORK_HISTORY.ThirdMostRecent.EndDate",
-        "Third Most Recent Job Location": "WORK_HISTORY.ThirdMostRecent.Location",
-        
-        "Fourth Most Recent Company Worked for": "WORK_HISTORY.FourthMostRecent.Company",
-        "Fourth Most Recent Company": "WORK_HISTORY.FourthMostRecent.Company",
-        "Fourth Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.FourthMostRecent.StartDate",
-        "Fourth Most Recent Start Date": "WORK_HISTORY.FourthMostRecent.StartDate",
-        "Fourth Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.FourthMostRecent.EndDate",
-        "Fourth Most Recent End Date": "WORK_HISTORY.FourthMostRecent.EndDate",
-        "Fourth Most Recent Job Location": "WORK_HISTORY.FourthMostRecent.Location",
-        
-        "Fifth Most Recent Company Worked for": "WORK_HISTORY.FifthMostRecent.Company",
-        "Fifth Most Recent Company": "WORK_HISTORY.FifthMostRecent.Company",
-        "Fifth Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.FifthMostRecent.StartDate",
-        "Fifth Most Recent Start Date": "WORK_HISTORY.FifthMostRecent.StartDate",
-        "Fifth Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.FifthMostRecent.EndDate",
-        "Fifth Most Recent End Date": "WORK_HISTORY.FifthMostRecent.EndDate",
-        "Fifth Most Recent Job Location": "WORK_HISTORY.FifthMostRecent.Location",
-        
-        "Sixth Most Recent Company Worked for": "WORK_HISTORY.SixthMostRecent.Company",
-        "Sixth Most Recent Company": "WORK_HISTORY.SixthMostRecent.Company",
-        "Sixth Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.SixthMostRecent.StartDate",
-        "Sixth Most Recent Start Date": "WORK_HISTORY.SixthMostRecent.StartDate",
-        "Sixth Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.SixthMostRecent.EndDate",
-        "Sixth Most Recent End Date": "WORK_HISTORY.SixthMostRecent.EndDate",
-        "Sixth Most Recent Job Location": "WORK_HISTORY.SixthMostRecent.Location",
-        
-        "Seventh Most Recent Company Worked for": "WORK_HISTORY.SeventhMostRecent.Company",
-        "Seventh Most Recent Company": "WORK_HISTORY.SeventhMostRecent.Company",
-        "Seventh Most Recent Start Date (YYYY-MM-DD)": "WORK_HISTORY.SeventhMostRecent.StartDate",
-        "Seventh Most Recent Start Date": "WORK_HISTORY.SeventhMostRecent.StartDate",
-        "Seventh Most Recent End Date (YYYY-MM-DD)": "WORK_HISTORY.SeventhMostRecent.EndDate",
-        "Seventh Most Recent End Date": "WORK_HISTORY.SeventhMostRecent.EndDate",
-        "Seventh Most Recent Job Location": "WORK_HISTORY.SeventhMostRecent.Location",
-        
-        # Career info
-        "Best job title that fit their primary experience": "CAREER_INFO.PrimaryTitle",
-        "Best job title that fits their primary experience": "CAREER_INFO.PrimaryTitle",
-        "Primary Job Title": "CAREER_INFO.PrimaryTitle",
-        
-        "Best secondary job title that fits their secondary experience": "CAREER_INFO.SecondaryTitle",
-        "Secondary Job Title": "CAREER_INFO.SecondaryTitle",
-        
-        "Best tertiary job title that fits their tertiary experience": "CAREER_INFO.TertiaryTitle",
-        "Tertiary Job Title": "CAREER_INFO.TertiaryTitle",
-        
-        "Based on all 7 of their most recent companies above, what is the Primary industry they work in": "CAREER_INFO.PrimaryIndustry",
-        "Primary Industry": "CAREER_INFO.PrimaryIndustry",
-        
-        "Based on all 7 of their most recent companies above, what is the Secondary industry they work in": "CAREER_INFO.SecondaryIndustry",
-        "Secondary Industry": "CAREER_INFO.SecondaryIndustry",
-        
-        "Top 10 Technical Skills": "CAREER_INFO.TopSkills",
-        
-        # Technical info
-        "What technical language do they use most often?": "TECHNICAL_INFO.PrimaryLanguage",
-        "What technical language do they use most often": "TECHNICAL_INFO.PrimaryLanguage",
-        
-        "What technical language do they use second most often?": "TECHNICAL_INFO.SecondaryLanguage",
-        "What technical language do they use second most often": "TECHNICAL_INFO.SecondaryLanguage",
-        
-        "What technical language do they use third most often?": "TECHNICAL_INFO.TertiaryLanguage",
-        "What technical language do they use third most often": "TECHNICAL_INFO.TertiaryLanguage",
-        
-        "What software do they talk about using the most?": "TECHNICAL_INFO.SoftwareApp1",
-        "What software do they talk about using the most": "TECHNICAL_INFO.SoftwareApp1",
-        
-        "What software do they talk about using the second most?": "TECHNICAL_INFO.SoftwareApp2",
-        "What software do they talk about using the second most": "TECHNICAL_INFO.SoftwareApp2",
-        
-        "What software do they talk about using the third most?": "TECHNICAL_INFO.SoftwareApp3",
-        "What software do they talk about using the third most": "TECHNICAL_INFO.SoftwareApp3",
-        
-        "What software do they talk about using the fourth most?": "TECHNICAL_INFO.SoftwareApp4",
-        "What software do they talk about using the fourth most": "TECHNICAL_INFO.SoftwareApp4",
-        
-        "What software do they talk about using the fifth most?": "TECHNICAL_INFO.SoftwareApp5",
-        "What software do they talk about using the fifth most": "TECHNICAL_INFO.SoftwareApp5",
-        
-        "What physical hardware do they talk about using the most?": "TECHNICAL_INFO.Hardware1",
-        "What physical hardware do they talk about using the most": "TECHNICAL_INFO.Hardware1",
-        
-        "What physical hardware do they talk about using the second most?": "TECHNICAL_INFO.Hardware2",
-        "What physical hardware do they talk about using the second most": "TECHNICAL_INFO.Hardware2",
-        
-        "What physical hardware do they talk about using the third most?": "TECHNICAL_INFO.Hardware3",
-        "What physical hardware do they talk about using the third most": "TECHNICAL_INFO.Hardware3",
-        
-        "What physical hardware do they talk about using the fourth most?": "TECHNICAL_INFO.Hardware4",
-        "What physical hardware do they talk about using the fourth most": "TECHNICAL_INFO.Hardware4",
-        
-        "What physical hardware do they talk about using the fifth most?": "TECHNICAL_INFO.Hardware5",
-        "What physical hardware do they talk about using the fifth most": "TECHNICAL_INFO.Hardware5",
-        
-        "Based on their experience, put them in a primary technical category if they are technical or functional category if they are functional": "TECHNICAL_INFO.PrimaryCategory",
-        
-        "Based on their experience, put them in a subsidiary technical category if they are technical or functional category if they are functional": "TECHNICAL_INFO.SecondaryCategory",
-        
-        "Types of projects they have worked on": "TECHNICAL_INFO.ProjectTypes",
-        
-        "Based on their skills, categories, certifications, and industries, determine what they specialize in": "TECHNICAL_INFO.Specialty",
-        
-        "Based on all this knowledge, write a summary of this candidate that could be sellable to an employer": "TECHNICAL_INFO.Summary",
-        
-        "How long have they lived in the United States(numerical answer only)": "TECHNICAL_INFO.LengthInUS",
-        
-        "Total years of professional experience (numerical answer only)": "TECHNICAL_INFO.YearsOfExperience",
-        
-        "Average tenure at companies in years (numerical answer only)": "TECHNICAL_INFO.AvgTenure"
-    }
+    result = _copy_template(RESULT_TEMPLATE)
     
     # Apply the mapping
     for field, value in extracted.items():
-        if field in field_mapping:
-            path = field_mapping[field].split('.')
-            
-            # Navigate to the correct part of the structure
-            current = result
-            for part in path[:-1]:
-                current = current[part]
-                
-            # Set the value
-            current[path[-1]] = value
+        path = FIELD_PATHS.get(_canonical_label(field))
+        if path is None:
+            continue
+        
+        # Paths are category.leaf or category.group.leaf; set the value directly
+        if len(path) == 3:
+            result[path[0]][path[1]][path[2]] = value
+        else:
+            result[path[0]][path[1]] = value
     
     return result
 
@@ -71,9 +71,9 @@ def submit_batch(batch_size: int = 25) -> Optional[str]:
 
         # Write to JSONL file
         batch_file = f"batch_input_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
-        with open(batch_file, 'w') as f:
+        with open(batch_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
             for request in requests:
-                f.write(json.dumps(request) + '\n')
+                f.write(json.dumps(request, ensure_ascii=False, separators=(',', ':')) + '\n')
 
         logging.info(f"Created batch file: {batch_file}")
 
@@ -10,6 +10,7 @@ This module reads the newSkills.csv taxonomy and provides functions to:
 import csv
 import re
 import os
+import functools
 from collections import Counter, defaultdict
 import logging
 
@@ -70,6 +71,8 @@ def load_skills_taxonomy():
                 
                 row_idx += 1
                 
+        # Taxonomy contents changed, so cached category sections are stale
+        get_category_section.cache_clear()
         logging.info(f"Loaded {len(skill_categories)} skill categories from taxonomy")
         return True
         
@@ -191,8 +194,19 @@ def get_top_categories(resume_text, max_categories=3):
     Returns:
         List of category names
     """
-    categories = detect_skill_categories(resume_text)
+    return select_top_categories(detect_skill_categories(resume_text), max_categories)
+
+def select_top_categories(categories, max_categories=3):
+    """
+    Pick the top categories from already-scored results using an adaptive threshold
     
+    Args:
+        categories: List of (category_name, relevance_score) tuples from detect_skill_categories
+        max_categories: Maximum number of categories to return
+        
+    Returns:
+        List of category names
+    """
     if not categories:
         return []
     
@@ -213,6 +227,43 @@ def get_top_categories(resume_text, max_categories=3):
     
     return top_categories
 
+@functools.lru_cache(maxsize=None)
+def get_category_section(category):
+    """
+    Build the prompt section for one taxonomy category
+    
+    The section depends only on the loaded taxonomy, so it is cached per category
+    instead of being rebuilt for every resume.
+    
+    Args:
+        category: Name of the skill category
+        
+    Returns:
+        Tuple of (section_text, job_sample, skill_sample)
+    """
+    section = f"## {category}\n"
+    
+    # Add job titles
+    jobs = category_jobs.get(category, [])
+    job_sample = tuple(jobs[:10])  # Limit to first 10 for brevity
+    if jobs:
+        section += "Relevant job titles: " + ", ".join(job_sample)
+        if len(jobs) > 10:
+            section += f", and {len(jobs)-10} more"
+        section += "\n"
+    
+    # Add skills
+    skills = category_skills.get(category, [])
+    skill_sample = tuple(skills[:20])  # Limit to first 20 for brevity
+    if skills:
+        section += "Skills in this category: " + ", ".join(skill_sample)
+        if len(skills) > 20:
+            section += f", and {len(skills)-20} more"
+        section += "\n"
+    
+    section += "\n"
+    return section, job_sample, skill_sample
+
 def get_taxonomy_context(resume_text, max_categories=2, userid=None):
     """
     Generate prompt context with the most relevant skills taxonomy sections
@@ -225,7 +276,9 @@ def get_taxonomy_context(resume_text, max_categories=2, userid=None):
     Returns:
         Formatted string with relevant skills taxonomy sections
     """
-    top_categories = get_top_categories(resume_text, max_categories)
+    # Score the resume once and reuse the result for selection and logging
+    categories_with_scores = detect_skill_categories(resume_text)
+    top_categories = select_top_categories(categories_with_scores, max_categories)
     
     if not top_categories:
         logging.warning("No relevant skill categories detected")
@@ -237,7 +290,6 @@ def get_taxonomy_context(resume_text, max_categories=2, userid=None):
     if userid is None:
         userid = "Unknown"
     
-    categories_with_scores = detect_skill_categories(resume_text)
     # Calculate threshold for logging
     if categories_with_scores:
         highest_score = categories_with_scores[0][1]
@@ -273,30 +325,13 @@ def get_taxonomy_context(resume_text, max_categories=2, userid=None):
     included_skills = {}
     
     for category in top_categories:
-        context += f"## {category}\n"
         logging.info(f"UserID {userid}: Adding category section: {category}")
-        
-        # Add job titles
-        jobs = category_jobs.get(category, [])
-        if jobs:
-            job_sample = jobs[:10]  # Limit to first 10 for brevity
-            context += "Relevant job titles: " + ", ".join(job_sample)
-            if len(jobs) > 10:
-                context += f", and {len(jobs)-10} more"
-            context += "\n"
+        section, job_sample, skill_sample = get_category_section(category)
+        context += section
+        if job_sample:
             included_jobs[category] = job_sample
-        
-        # Add skills
-        skills = category_skills.get(category, [])
-        if skills:
-            skill_sample = skills[:20]  # Limit to first 20 for brevity
-            context += "Skills in this category: " + ", ".join(skill_sample)
-            if len(skills) > 20:
-                context += f", and {len(skills)-20} more"
-            context += "\n"
+        if skill_sample:
             included_skills[category] = skill_sample
-        
-        context += "\n"
     
     # Log a summary of what was included
     if categories_with_scores:
@@ -0,0 +1,121 @@
+"""
+Tests for splitting multi-resume answers into per-resume results
+"""
+
+import os
+import sys
+import json
+import logging
+
+# Import the processor from this directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from one_step_processor import (
+    split_multi_resume_content,
+    split_multi_resume_json,
+    process_unified_results
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def batch_result(custom_id, content=None, error=None):
+    """Build a batch API result record the way the output file holds it"""
+    if error:
+        return {"custom_id": custom_id, "error": error}
+    return {
+        "custom_id": custom_id,
+        "response": {"body": {"choices": [{"message": {"content": content}}]}}
+    }
+
+def test_marker_split():
+    """Each ===RESUME_n=== block goes to the n-th packed userid"""
+    content = "===RESUME_1===\nFirst Name: Ann\n===RESUME_2===\nFirst Name: Bo\n"
+
+    blocks = split_multi_resume_content(content, [11, 22])
+
+    assert blocks == {11: "First Name: Ann", 22: "First Name: Bo"}
+
+def test_out_of_range_markers():
+    """Markers numbered outside the packed resumes are ignored, not mapped to a userid"""
+    content = (
+        "===RESUME_0===\nFirst Name: Zero\n"
+        "===RESUME_1===\nFirst Name: Ann\n"
+        "===RESUME_3===\nFirst Name: Extra\n"
+    )
+
+    blocks = split_multi_resume_content(content, [11, 22])
+
+    assert blocks == {11: "First Name: Ann"}
+
+def test_missing_and_empty_blocks():
+    """Userids whose block is missing or empty are left out"""
+    content = "===RESUME_1===\n\n===RESUME_3===\nFirst Name: Cy\n"
+
+    blocks = split_multi_resume_content(content, [11, 22, 33])
+
+    assert blocks == {33: "First Name: Cy"}
+
+def test_missing_blocks_are_collected_for_resend():
+    """Missing blocks and failed multi-resume requests end up in missing_userids"""
+    results = [
+        batch_result("multi_11_22", "===RESUME_1===\nFirst Name: Ann\nLast Name: Lee\n"),
+        batch_result("multi_33_44", error={"message": "server error"}),
+        batch_result("multi_55_66", ""),
+    ]
+    missing_userids = []
+
+    processed = process_unified_results(results, {}, debug_mode=False, missing_userids=missing_userids)
+
+    assert list(processed) == [11]
+    assert missing_userids == [22, 33, 44, 55, 66]
+
+def test_structured_results():
+    """Entries of the JSON results array are matched to userids by their resume number"""
+    content = json.dumps({"results": [
+        {"resume": 2, "PrimaryTitle": "QA Engineer"},
+        {"resume": 1, "PrimaryTitle": "Python Developer"},
+        {"resume": 5, "PrimaryTitle": "Out of range"},
+        "not an object",
+    ]})
+
+    results = split_multi_resume_json(content, [11, 22])
+
+    assert sorted(results) == [11, 22]
+    assert results[11]["PrimaryTitle"] == "Python Developer"
+    assert results[22]["PrimaryTitle"] == "QA Engineer"
+
+def test_structured_results_missing_entry():
+    """A resume without an entry in the results array is left out and collected for resend"""
+    content = json.dumps({"results": [{"resume": 1, "PrimaryTitle": "Python Developer"}]})
+    missing_userids = []
+
+    assert sorted(split_multi_resume_json(content, [11, 22])) == [11]
+
+    processed = process_unified_results([batch_result("multi_11_22", content)], {}, debug_mode=False,
+                                        missing_userids=missing_userids)
+
+    assert list(processed) == [11]
+    assert missing_userids == [22]
+
+def test_not_a_results_object():
+    """Answers that are not a results object are left to the marker split"""
+    assert split_multi_resume_json("===RESUME_1===\nFirst Name: Ann\n", [11]) is None
+    assert split_multi_resume_json('{"PrimaryTitle": "Python Developer"}', [11, 22]) is None
+    assert split_multi_resume_json('{"results": [', [11, 22]) is None
+
+if __name__ == "__main__":
+    print("=== MULTI-RESUME SPLIT TEST SCRIPT ===")
+
+    test_marker_split()
+    test_out_of_range_markers()
+    test_missing_and_empty_blocks()
+    test_missing_blocks_are_collected_for_resend()
+    test_structured_results()
+    test_structured_results_missing_entry()
+    test_not_a_results_object()
+
+    print("\nAll tests completed.")
\ No newline at end of file